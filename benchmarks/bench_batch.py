@@ -0,0 +1,63 @@
+r"""
+Batched Grover Benchmark
+========================
+Compares running :math:`k` Grover searches on the same register size one `Circuit`
+at a time with running them together through `Circuit.grover_batch`.
+
+Run from the repository root with ``python -m benchmarks.bench_batch``.
+"""
+
+import argparse
+from contextlib import redirect_stdout
+from io import StringIO
+from timeit import default_timer
+
+import numpy
+
+from qc import Circuit
+
+
+def one_at_a_time(size: int, targets: numpy.ndarray):
+    r"""
+    Runs one `Circuit` per target, silencing the progress messages.
+    """
+    with redirect_stdout(StringIO()):
+        for target in targets:
+            circuit = Circuit(size)
+            circuit.h()
+            circuit.grover(int(target))
+
+
+def batched(size: int, targets: numpy.ndarray):
+    r"""
+    Runs every target in a single batch.
+    """
+    circuit = Circuit(size)
+    circuit.h()
+    return circuit.grover_batch(targets)
+
+
+def timed(function, *args) -> float:
+    r"""
+    Returns the wall clock time of one call in seconds.
+    """
+    start = default_timer()
+    function(*args)
+    return default_timer() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched Grover benchmark")
+    parser.add_argument("--qubits", type=int, default=10, help="Register size")
+    parser.add_argument(
+        "--batches", type=int, nargs="+", default=[1, 10, 100, 500], help="Batch sizes"
+    )
+    args = parser.parse_args()
+
+    generator = numpy.random.default_rng(0)
+    print("%8s %14s %14s %12s %10s" % ("targets", "single (s)", "batch (s)", "searches/s", "speedup"))
+    for k in args.batches:
+        targets = generator.integers(0, 2**args.qubits, size=k)
+        single = timed(one_at_a_time, args.qubits, targets)
+        batch = timed(batched, args.qubits, targets)
+        print("%8i %14.4f %14.4f %12.0f %10.1f" % (k, single, batch, k / batch, single / batch))
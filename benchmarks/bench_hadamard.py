@@ -0,0 +1,55 @@
+r"""
+Hadamard Benchmark
+==================
+Compares two ways of applying a Hadamard gate to every qubit of a register which
+starts in the state :math:`|0\rangle^{\otimes n}`:
+
+    1. Building :math:`H^{\otimes n}` from repeated `Operator.tensor` calls and
+       applying it with `Vector.apply`.
+    2. The in-place fast Walsh-Hadamard transform used by `Circuit.h`.
+
+Run from the repository root with ``python -m benchmarks.bench_hadamard``.
+"""
+
+import argparse
+from timeit import repeat
+
+from gates import Gate
+from utils.kernels import walshHadamard
+from utils.state_vector import makeStateVector
+
+
+def kronecker(size: int):
+    r"""
+    Applies :math:`H^{\otimes n}` built from tensor products to :math:`|0\rangle`.
+    """
+    return makeStateVector(0, size).apply(Gate(size).h() ** size)
+
+
+def walsh(size: int):
+    r"""
+    Applies the fast Walsh-Hadamard transform to :math:`|0\rangle`.
+    """
+    amplitudes = makeStateVector(0, size).amplitudes().astype(float)
+    return walshHadamard(amplitudes)
+
+
+def best(function, size: int, repeats: int) -> float:
+    r"""
+    Returns the best of `repeats` wall clock timings of `function(size)` in seconds.
+    """
+    return min(repeat(lambda: function(size), number=1, repeat=repeats))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hadamard layer benchmark")
+    parser.add_argument("--min", type=int, default=2, help="Smallest register size")
+    parser.add_argument("--max", type=int, default=12, help="Largest register size")
+    parser.add_argument("--repeats", type=int, default=3, help="Timings per size")
+    args = parser.parse_args()
+
+    print("%6s %14s %14s %10s" % ("qubits", "kronecker (s)", "walsh (s)", "speedup"))
+    for size in range(args.min, args.max + 1):
+        slow = best(kronecker, size, args.repeats)
+        fast = best(walsh, size, args.repeats)
+        print("%6i %14.6f %14.6f %10.1f" % (size, slow, fast, slow / fast))
@@ -0,0 +1,92 @@
+r"""
+In-Place Apply Benchmark
+========================
+Compares `Vector.apply`, which returns a new vector for every product, with
+`Vector.applyInPlace`, which writes into a second buffer kept by the vector, when
+the oracle and reflection of Grover's algorithm are applied over and over.
+
+Allocations are counted with `tracemalloc`, which `numpy` reports its arrays to. For
+each loop the report gives the time per product and the largest number of bytes held
+above what was held before the loop, after a warm-up pass. A loop which allocates no
+arrays per product holds only a few hundred bytes of Python objects.
+
+Run from the repository root with ``python -m benchmarks.bench_inplace``.
+"""
+
+import argparse
+import tracemalloc
+from timeit import default_timer
+
+import numpy
+
+from gates import Gate
+from utils.tensor import Vector
+
+
+def allocating(vector: Vector, operators: list, repeats: int) -> Vector:
+    r"""
+    Applies the operators in turn with `Vector.apply`.
+    """
+    for _ in range(repeats):
+        for operator in operators:
+            vector = vector.apply(operator)
+    return vector
+
+
+def in_place(vector: Vector, operators: list, repeats: int) -> Vector:
+    r"""
+    Applies the operators in turn with `Vector.applyInPlace`.
+    """
+    for _ in range(repeats):
+        for operator in operators:
+            vector.applyInPlace(operator)
+    return vector
+
+
+def measured(function, vector: Vector, operators: list, repeats: int) -> tuple:
+    r"""
+    Returns the seconds per product and the peak bytes held above the start of
+    the loop, after one warm-up pass.
+    """
+    vector = function(vector, operators, 1)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    start = default_timer()
+    function(vector, operators, repeats)
+    seconds = default_timer() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return seconds / (repeats * len(operators)), peak - before
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="In-place apply benchmark")
+    parser.add_argument(
+        "--qubits", type=int, nargs="+", default=[10, 14, 18], help="Register sizes"
+    )
+    parser.add_argument("--repeats", type=int, default=20, help="Passes per loop")
+    args = parser.parse_args()
+
+    print(
+        "%6s %12s %14s %14s %14s %14s"
+        % ("qubits", "register", "apply (s)", "apply bytes", "in place (s)",
+           "in place bytes")
+    )
+    for size in args.qubits:
+        gates = Gate(size, backend="dense")
+        operators = [gates.oracle(1), gates.reflection()]
+        start = numpy.full(2**size, 2 ** (-size / 2))
+
+        apply_time, apply_bytes = measured(
+            allocating, Vector(start.copy(), "dense"), operators, args.repeats
+        )
+        place_time, place_bytes = measured(
+            in_place, Vector(start.copy(), "dense"), operators, args.repeats
+        )
+        print(
+            "%6i %12i %14.2e %14i %14.2e %14i"
+            % (size, start.nbytes, apply_time, apply_bytes, place_time, place_bytes)
+        )
@@ -0,0 +1,75 @@
+r"""
+Precision Accuracy Report
+=========================
+Runs Grover's algorithm with each precision of `utils.tensor.precisions` and compares
+the recorded projections and the final probability with the closed form of
+`utils.analytic`, which is computed in double precision.
+
+For each precision the report gives the bytes per amplitude and of the whole register,
+the machine epsilon, whether phases are representable (only the complex precisions can
+hold them), and the largest error of the path and of the final probability.
+
+Run from the repository root with ``python -m benchmarks.bench_precision``.
+"""
+
+import argparse
+from contextlib import redirect_stdout
+from io import StringIO
+
+import numpy
+
+from qc import Circuit
+from utils import analytic
+from utils.tensor import precisions
+
+
+def report(size: int, target: int, dtype: str, engine: str = "matrix-free") -> dict:
+    r"""
+    Returns the accuracy of one search held in the given precision.
+    """
+    with redirect_stdout(StringIO()):
+        circuit = Circuit(size, dtype=dtype)
+        circuit.h()
+        projections = circuit.grover(target, engine=engine, record=True)
+
+    exact = analytic.trajectory(size, target)
+    found = float(abs(circuit.register.amplitudes()[target])) ** 2
+    amplitudes = circuit.register.amplitudes()
+    dtype = numpy.dtype(precisions[dtype])
+    return {
+        "precision": dtype.name,
+        "bytes": dtype.itemsize,
+        "register": dtype.itemsize * 2**size,
+        "epsilon": float(numpy.finfo(dtype).eps),
+        "phases": dtype.kind == "c",
+        "path": float(numpy.abs(projections - exact).max()),
+        "probability": abs(found - analytic.probability(size)),
+        "norm": float(abs(numpy.vdot(amplitudes, amplitudes).real - 1)),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precision accuracy report")
+    parser.add_argument(
+        "--qubits", type=int, nargs="+", default=[6, 10, 14], help="Register sizes"
+    )
+    parser.add_argument("--target", type=int, default=1, help="Target state")
+    parser.add_argument(
+        "--engine", choices=["matrix-free", "operator"], default="matrix-free", help="Engine"
+    )
+    args = parser.parse_args()
+
+    print(
+        "%6s %11s %6s %12s %10s %7s %11s %11s %11s"
+        % ("qubits", "precision", "bytes", "register", "epsilon", "phases", "path err",
+           "P(t) err", "norm err")
+    )
+    for size in args.qubits:
+        for dtype in precisions:
+            row = report(size, args.target, dtype, args.engine)
+            print(
+                "%6i %11s %6i %12i %10.1e %7s %11.2e %11.2e %11.2e"
+                % (size, row["precision"], row["bytes"], row["register"], row["epsilon"],
+                   "yes" if row["phases"] else "no", row["path"], row["probability"],
+                   row["norm"])
+            )
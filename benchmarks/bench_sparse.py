@@ -0,0 +1,60 @@
+r"""
+Sparse Backend Benchmark
+========================
+Compares the dense and sparse backends on the diagonal Grover operators. Each run
+builds the oracle and the reflection the way ``Gate(n, diagonal=False)`` does, from
+a tensor power of the identity patched with `Operator.update`, and then applies
+both to the uniform superposition a number of times.
+
+Run from the repository root with ``python -m benchmarks.bench_sparse``.
+"""
+
+import argparse
+from timeit import repeat
+
+import numpy
+
+from utils.denseMatrix import denseMatrix
+from utils.sparseMatrix import sparseMatrix
+from utils.tensor import Operator, Vector
+
+
+def grover_operators(backend: type, size: int, applications: int):
+    r"""
+    Builds the oracle and reflection with the given `matrixInterface` backend and
+    applies them `applications` times each.
+    """
+    oracle = (Operator(2, backend(2, [1, 0, 0, 1])) ** size).update(1, 1, -1)
+    reflection = (Operator(2, backend(2, [1, 0, 0, 1])) ** size).negate().update(0, 0, 1)
+
+    amplitudes = numpy.full(2**size, 2 ** (-size / 2))
+    register = Vector(backend(2**size, amplitudes, True))
+    for _ in range(applications):
+        register = register.apply(oracle).apply(reflection)
+    return register
+
+
+def best(backend: type, size: int, applications: int, repeats: int) -> float:
+    r"""
+    Returns the best of `repeats` wall clock timings in seconds.
+    """
+    return min(
+        repeat(
+            lambda: grover_operators(backend, size, applications), number=1, repeat=repeats
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sparse backend benchmark")
+    parser.add_argument("--min", type=int, default=2, help="Smallest register size")
+    parser.add_argument("--max", type=int, default=12, help="Largest register size")
+    parser.add_argument("--applications", type=int, default=10, help="Applications per run")
+    parser.add_argument("--repeats", type=int, default=3, help="Timings per size")
+    args = parser.parse_args()
+
+    print("%6s %12s %12s %10s" % ("qubits", "dense (s)", "sparse (s)", "speedup"))
+    for size in range(args.min, args.max + 1):
+        dense = best(denseMatrix, size, args.applications, args.repeats)
+        sparse = best(sparseMatrix, size, args.applications, args.repeats)
+        print("%6i %12.6f %12.6f %10.1f" % (size, dense, sparse, dense / sparse))
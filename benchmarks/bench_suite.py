@@ -0,0 +1,277 @@
+r"""
+Benchmark Suite
+===============
+Times the building blocks of the simulator and the whole Grover pipeline over a range
+of register sizes with the dense and the sparse backend, and tracks them against a
+stored baseline.
+
+The benchmarks are:
+
+* ``tensor``: `Operator.tensor` of an :math:`n - 1` qubit operator with a Hadamard gate.
+* ``pow``: `Operator.__pow__`, raising a Hadamard gate to the power :math:`n`.
+* ``mul``: `Operator.__mul__` of the oracle and the reflection built in full.
+* ``apply``: `Vector.apply` of the oracle, built in full, to the uniform superposition.
+* ``makeStateVector``: `utils.state_vector.makeStateVector` of the last basis state.
+* ``grover`` and ``grover-operator``: `Circuit.h` followed by `Circuit.grover` with
+  the matrix-free and the operator engine.
+
+Each benchmark is run enough times in a row to last at least ``--min-time`` seconds,
+and the best time per call of ``--repeats`` such runs is kept. The results are written
+as JSON together with the environment they were measured in.
+
+Run from the repository root with, for example::
+
+    python -m benchmarks.bench_suite run --output benchmarks/baseline.json
+    python -m benchmarks.bench_suite run --output current.json
+    python -m benchmarks.bench_suite compare benchmarks/baseline.json current.json
+
+``compare`` prints the ratio of every time to its baseline and exits with status 1 if
+any benchmark is slower than the baseline by more than ``--threshold``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from io import StringIO
+from timeit import default_timer
+
+import matplotlib
+import numpy
+import scipy
+
+from gates import Gate
+from qc import Circuit
+from utils.state_vector import makeStateVector
+from utils.tensor import Operator, Vector
+
+
+def tensor(backend: str, size: int):
+    r"""
+    Returns a call of `Operator.tensor` on a shared copy of an :math:`n - 1` qubit
+    operator, so that every call starts from the same operator.
+    """
+    left = Operator(
+        2 ** (size - 1), (Gate(1).h() ** (size - 1)).matrix.materialize(), backend
+    )
+    h = Gate(1, backend=backend).h()
+    return lambda: left.share().tensor(h)
+
+
+def power(backend: str, size: int):
+    r"""
+    Returns a call of `Operator.__pow__` on a Hadamard gate.
+    """
+    h = Gate(1, backend=backend).h()
+    return lambda: h**size
+
+
+def multiply(backend: str, size: int):
+    r"""
+    Returns a call of `Operator.__mul__` on the oracle and the reflection.
+    """
+    gates = Gate(size, diagonal=False, backend=backend)
+    oracle, reflection = gates.oracle(1), gates.reflection()
+    return lambda: oracle * reflection
+
+
+def apply(backend: str, size: int):
+    r"""
+    Returns a call of `Vector.apply` of the oracle to the uniform superposition.
+    """
+    oracle = Gate(size, diagonal=False, backend=backend).oracle(1)
+    vector = Vector(numpy.full(2**size, 2 ** (-size / 2)), backend)
+    return lambda: vector.apply(oracle)
+
+
+def stateVector(backend: str, size: int):
+    r"""
+    Returns a call of `makeStateVector`.
+    """
+    return lambda: makeStateVector(2**size - 1, size, backend)
+
+
+def grover(engine: str):
+    r"""
+    Returns the setup of a whole search with the given engine, silencing its
+    progress messages.
+    """
+
+    def setup(backend: str, size: int):
+        def run():
+            with redirect_stdout(StringIO()):
+                circuit = Circuit(size, backend)
+                circuit.h()
+                circuit.grover(1, engine=engine)
+
+        return run
+
+    return setup
+
+
+benchmarks = {
+    "tensor": tensor,
+    "pow": power,
+    "mul": multiply,
+    "apply": apply,
+    "makeStateVector": stateVector,
+    "grover": grover("matrix-free"),
+    "grover-operator": grover("operator"),
+}
+
+
+def timed(function, repeats: int = 5, minimum: float = 0.05) -> dict:
+    r"""
+    Returns the best and median time per call of `function`, over `repeats` runs
+    of as many calls as last at least `minimum` seconds.
+    """
+
+    number = 1
+    while True:
+        start = default_timer()
+        for _ in range(number):
+            function()
+        elapsed = default_timer() - start
+        if elapsed >= minimum:
+            break
+        number = number * 2
+
+    times = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = default_timer()
+        for _ in range(number):
+            function()
+        times.append((default_timer() - start) / number)
+    return {"seconds": min(times), "median": float(numpy.median(times)), "number": number}
+
+
+def environment() -> dict:
+    r"""
+    Returns the machine, interpreter, library versions and commit the results are
+    measured with.
+    """
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "scipy": scipy.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(names: list, backends: list, sizes: list, repeats: int, minimum: float) -> dict:
+    r"""
+    Runs the named benchmarks for every backend and register size.
+
+    Returns:
+        dict: The ``environment`` and one entry of ``results`` per benchmark,
+        backend and register size.
+    """
+
+    results = []
+    for name in names:
+        for backend in backends:
+            for size in sizes:
+                result = timed(benchmarks[name](backend, size), repeats, minimum)
+                result.update({"benchmark": name, "backend": backend, "qubits": size})
+                results.append(result)
+                print(
+                    "%16s %7s %6i %14.3e"
+                    % (name, backend, size, result["seconds"]),
+                    file=sys.stderr,
+                )
+    return {"environment": environment(), "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    r"""
+    Returns one row per benchmark measured in both runs, with the ratio of the
+    current time to the baseline and whether it regressed by more than
+    `threshold`, a fraction of the baseline.
+    """
+
+    def key(result):
+        return (result["benchmark"], result["backend"], result["qubits"])
+
+    before = {key(result): result["seconds"] for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        if key(result) in before:
+            ratio = result["seconds"] / before[key(result)]
+            rows.append(key(result) + (ratio, ratio > 1 + threshold))
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    measure = commands.add_parser("run", help="Run the benchmarks")
+    measure.add_argument(
+        "--benchmarks", nargs="+", choices=list(benchmarks), default=list(benchmarks),
+        help="Benchmarks to run",
+    )
+    measure.add_argument(
+        "--backends", nargs="+", choices=["dense", "sparse"], default=["dense", "sparse"],
+        help="Backends to run with",
+    )
+    measure.add_argument(
+        "--qubits", type=int, nargs="+", default=[4, 6, 8, 10], help="Register sizes"
+    )
+    measure.add_argument("--repeats", type=int, default=5, help="Timings per benchmark")
+    measure.add_argument(
+        "--min-time", type=float, default=0.05, help="Seconds per timing, at least"
+    )
+    measure.add_argument("--output", default="benchmarks.json", help="JSON file to write")
+
+    check = commands.add_parser("compare", help="Compare results with a baseline")
+    check.add_argument("baseline", help="JSON file of the baseline")
+    check.add_argument("current", help="JSON file of the results to check")
+    check.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Slowdown flagged as a regression, as a fraction of the baseline",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run(
+            args.benchmarks, args.backends, args.qubits, args.repeats, args.min_time
+        )
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print("Wrote " + str(len(results["results"])) + " results to " + args.output)
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+
+        rows = compare(baseline, current, args.threshold)
+        print("%16s %7s %6s %8s" % ("benchmark", "backend", "qubits", "ratio"))
+        for name, backend, size, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print("%16s %7s %6i %8.2f%s" % (name, backend, size, ratio, flag))
+
+        regressions = sum(1 for row in rows if row[-1])
+        print(
+            str(regressions) + " of " + str(len(rows)) + " benchmarks regressed by more than "
+            + str(round(100 * args.threshold)) + "%."
+        )
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,104 @@
+r"""
+Thread Scaling Benchmark
+========================
+Times the threaded kernels of `utils.threaded` on large registers with 1 to
+``--threads`` threads, each kernel on a fresh copy of the same random state:
+
+* ``walsh``: a Hadamard gate on every qubit, as `Circuit.h` applies it.
+* ``low`` and ``high``: a Hadamard gate on qubit 0 and on the top qubit, which pair
+  amplitudes within a chunk and across chunks.
+* ``diagonal``: the oracle of a search, as a full diagonal.
+
+The speedup of each is its time with one thread over its time with more. The kernels
+are bound by memory bandwidth, so the speedup levels off once the threads saturate it.
+
+Run from the repository root with, for example::
+
+    python -m benchmarks.bench_threads --qubits 20 24 28 --threads 8
+
+A register of 28 qubits holds 2 GiB of amplitudes, and its copy as much again.
+"""
+
+import argparse
+import os
+from math import sqrt
+from timeit import default_timer
+
+import numpy
+
+from utils import threaded
+
+h = numpy.array([[1, 1], [1, -1]]) / sqrt(2)
+
+kernels = {
+    "walsh": lambda amplitudes, threads, size: threaded.walshHadamard(amplitudes, threads),
+    "low": lambda amplitudes, threads, size: threaded.applySingle(amplitudes, h, 0, threads),
+    "high": lambda amplitudes, threads, size: threaded.applySingle(
+        amplitudes, h, size - 1, threads
+    ),
+    "diagonal": lambda amplitudes, threads, size: threaded.applyDiagonal(
+        amplitudes, oracle(size), threads=threads
+    ),
+}
+
+_oracles = {}
+
+
+def oracle(size: int) -> numpy.ndarray:
+    r"""
+    Returns the diagonal of the oracle which marks state 1, built once per size.
+    """
+    if size not in _oracles:
+        _oracles[size] = numpy.ones(2**size)
+        _oracles[size][1] = -1
+    return _oracles[size]
+
+
+def best(kernel, state: numpy.ndarray, threads: int, size: int, repeats: int) -> float:
+    r"""
+    Returns the best of `repeats` timings of the kernel on a copy of `state`,
+    leaving the copy out of the time.
+    """
+    times = []
+    amplitudes = numpy.empty_like(state)
+    for _ in range(repeats):
+        amplitudes[:] = state
+        start = default_timer()
+        kernel(amplitudes, threads, size)
+        times.append(default_timer() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Thread scaling benchmark")
+    parser.add_argument(
+        "--qubits", type=int, nargs="+", default=[20, 22, 24], help="Register sizes"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=os.cpu_count(), help="Largest number of threads"
+    )
+    parser.add_argument(
+        "--kernels", nargs="+", choices=list(kernels), default=list(kernels),
+        help="Kernels to time",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Timings per point")
+    parser.add_argument(
+        "--cache", type=int, default=threaded.cacheBytes // 2**10,
+        help="KiB of L2 cache per core, which sets the chunk size",
+    )
+    args = parser.parse_args()
+    threaded.cacheBytes = args.cache * 2**10
+
+    print("%8s %6s %7s %12s %8s" % ("kernel", "qubits", "threads", "time (s)", "speedup"))
+    for size in args.qubits:
+        state = numpy.random.default_rng(size).normal(size=2**size)
+        state /= numpy.linalg.norm(state)
+        for name in args.kernels:
+            single = None
+            for count in range(1, args.threads + 1):
+                seconds = best(kernels[name], state, count, size, args.repeats)
+                single = single or seconds
+                print(
+                    "%8s %6i %7i %12.6f %8.2f"
+                    % (name, size, count, seconds, single / seconds)
+                )
@@ -5,11 +5,125 @@ This module provides the implementation of quantum gates used in Grover's algori
 The `Gate` class contains methods for creating the Hadamard gate, oracle gate,
 reflection gate, and identity gate.
 
+Built gates are kept in a process-wide `GateCache` shared by every `Gate`, so that
+running many searches on the same register size builds each gate once.
+
 """
 
+from collections import OrderedDict
 from math import sqrt
+from threading import Lock
+from typing import Union
+
+from numpy import asarray, ones
+
+from utils.diagonalMatrix import diagonalMatrix
+from utils.tensor import Operator, nbytes, precision, sparsity
+
+
+class GateCache(object):
+    r"""
+    A least recently used cache of built gate operators.
+
+    Entries are keyed by the gate name, register size, target, backend,
+    whether diagonal gates are used and precision. The memory held by the cached operators is
+    kept within `budget` bytes by evicting the least recently used entries; a
+    gate larger than the whole budget is built but not cached.
+
+    Every lookup returns `Operator.share` of the cached operator, so callers may
+    change what they are given in place without changing the cache.
+
+    Counters of hits, misses and evictions are kept for reporting.
+    """
+
+    def __init__(self, budget: int = 256 * 2**20):
+        """
+        Params:
+            budget (int): The maximum number of bytes of cached operators.
+        """
+        self.budget = int(budget)
+        self.entries = OrderedDict()
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+
+    def get(self, key: tuple, build) -> Operator:
+        r"""
+        Returns the cached operator for `key`, building and caching it with
+        `build()` if it is not cached.
+
+        Params:
+            key (tuple): The key of the gate.
+            build (callable): Builds the operator when it is not cached.
+
+        Returns:
+            Operator: A shared copy of the cached operator.
+        """
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits = self.hits + 1
+                return self.entries[key][0].share()
+            self.misses = self.misses + 1
+
+        operator = build()
+        size = nbytes(operator.matrix)
+
+        with self._lock:
+            if size <= self.budget and key not in self.entries:
+                self.entries[key] = (operator, size)
+                self.used = self.used + size
+                self._evict()
+        return operator.share()
+
+    def resize(self, budget: int):
+        r"""
+        Changes the memory budget, evicting entries until the cache fits.
+
+        Params:
+            budget (int): The maximum number of bytes of cached operators.
+        """
+        with self._lock:
+            self.budget = int(budget)
+            self._evict()
 
-from utils.tensor import Operator
+    def clear(self):
+        r"""
+        Removes every entry and resets the counters.
+        """
+        with self._lock:
+            self.entries.clear()
+            self.used = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        r"""
+        Returns the counters and the memory in use.
+
+        Returns:
+            dict: The hits, misses, evictions, entries, bytes used and budget.
+
+        ----
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "used": self.used,
+                "budget": self.budget,
+            }
+
+    def _evict(self):
+        while self.used > self.budget and self.entries:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.used = self.used - size
+            self.evictions = self.evictions + 1
 
 
 class Gate(object):
@@ -24,13 +138,31 @@ class Gate(object):
     The Hadamard gate is scaled (using tensor products) at the point
     of implementation to make the application more obvious.
 
+    The oracle and reflection gates are diagonal, so by default they are
+    stored as a `diagonalMatrix` holding only the :math:`2^n` diagonal
+    elements. Passing ``diagonal=False`` builds them with the tensor
+    module's dense or sparse backend instead.
+
+    Every gate is built with the given backend, ``"dense"``, ``"sparse"``
+    or ``"auto"``, and precision (see `utils.tensor`).
+
+    Gates are looked up in the class attribute `cache`, a `GateCache` shared by
+    the whole process, before they are built.
+
     """
 
-    def __init__(self, dimension: int):
+    cache = GateCache()
+
+    def __init__(
+        self, dimension: int, diagonal: bool = True, backend: str = sparsity, dtype=None
+    ):
         """
         Comments here wont make it into the docs.
         """
         self.dimension = int(dimension)
+        self.diagonal = diagonal
+        self.backend = backend
+        self.dtype = precision(dtype)
         pass
 
     def h(self):
@@ -53,15 +185,18 @@ class Gate(object):
         """
 
         array = [1 / sqrt(2) * x for x in [1, 1, 1, -1]]
-        return Operator(2, array)
+        return self._cached(
+            "h", None, lambda: Operator(2, array, self.backend, self.dtype)
+        )
 
-    def oracle(self, target: int):
+    def oracle(self, target: Union[int, list[int]]):
         r"""
         Oracle gate for Grover's algorithm.
 
         The oracle gate marks the target state by flipping its phase. It is a
         diagonal matrix with all elements on the diagonal equal to 1, except for
-        the element corresponding to the target state, which is -1.
+        the element corresponding to the target state, which is -1. Several
+        targets are marked at once in one matrix, cached under the sorted targets.
 
         **Matrix Representation when targeting the second state:**
 
@@ -74,14 +209,27 @@ class Gate(object):
                 \end{pmatrix}
 
         Params:
-            target (int): The target state to be marked by the oracle in little endian convention.
+            target (Union[int, list[int]]): The target state, or states, to be marked
+                by the oracle in little endian convention.
 
         Returns:
             Operator: The oracle gate as an `Operator` object.
 
         """
-        target = int(target)
-        return (Operator(2, [1, 0, 0, 1]) ** self.dimension).update(target, target, -1)
+        targets = tuple(sorted({int(t) for t in asarray(target).reshape(-1)}))
+        if len(targets) == 1:
+            target = targets[0]
+            return self._cached(
+                "oracle", target, lambda: self._identity().update(target, target, -1)
+            )
+
+        def build():
+            oracle = self._identity()
+            for t in targets:
+                oracle.update(t, t, -1)
+            return oracle
+
+        return self._cached("oracle", targets, build)
 
     def reflection(self):
         r"""
@@ -105,7 +253,9 @@ class Gate(object):
         Returns:
             Operator: The reflection gate as an `Operator` object
         """
-        return (Operator(2, [1, 0, 0, 1]) ** self.dimension).negate().update(0, 0, 1)
+        return self._cached(
+            "reflection", None, lambda: self._identity().negate().update(0, 0, 1)
+        )
 
     def i(self):
         r"""
@@ -130,7 +280,30 @@ class Gate(object):
 
         ----
         """
-        return Operator(2, [1, 0, 0, 1]) ** self.dimension
+        return self._cached(
+            "i",
+            None,
+            lambda: Operator(2, [1, 0, 0, 1], self.backend, self.dtype) ** self.dimension,
+        )
+
+    def _cached(self, name: str, target, build) -> Operator:
+        """
+        Looks a gate up in the shared cache, building it if needed.
+        """
+        key = (name, self.dimension, target, self.backend, self.diagonal, str(self.dtype))
+        return Gate.cache.get(key, build)
+
+    def _identity(self):
+        """
+        The identity on the whole register, as a starting point for the
+        diagonal gates.
+        """
+        if self.diagonal:
+            size = 2**self.dimension
+            return Operator(
+                size, diagonalMatrix(size, ones(size)), self.backend, self.dtype
+            )
+        return Operator(2, [1, 0, 0, 1], self.backend, self.dtype) ** self.dimension
 
 
 #
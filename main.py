@@ -10,6 +10,9 @@ Grover's algorithm to find the target state, and measures the result.
 import argparse
 
 from qc import Circuit
+from utils import analytic, mapped, sharded
+from utils.profiling import Profiler
+from utils.tensor import precisions
 
 parser = argparse.ArgumentParser(description="Quantum Computer Simulator")
 
@@ -35,12 +38,126 @@ parser.add_argument(
     default="1",
 )
 
+r"""
+The 'backend' option chooses how the register and gates are stored.
+"""
+parser.add_argument(
+    "--backend",
+    help="How to store the register and gates: dense, sparse, auto, memmap or sharded",
+    choices=["dense", "sparse", "auto", "memmap", "sharded"],
+    default="dense",
+)
+
+r"""
+The 'dtype' option sets the precision of the register and gates.
+"""
+parser.add_argument(
+    "--dtype",
+    help="Precision of the register and gates, inferred by numpy if not given",
+    choices=list(precisions),
+    default=None,
+)
+
+r"""
+The 'budget' option sets how many MiB of a memory mapped register are held in memory.
+"""
+parser.add_argument(
+    "--budget",
+    help="MiB of amplitudes to hold in memory with the memmap backend",
+    type=int,
+    default=mapped.ramBudget // 2**20,
+)
+
+r"""
+The 'workers' option sets how many processes a sharded register is split across.
+"""
+parser.add_argument(
+    "--workers",
+    help="Worker processes of the sharded backend, one per core by default",
+    type=int,
+    default=None,
+)
+
+r"""
+The 'threads' option sets how many threads apply the Hadamard layers and diagonal gates.
+"""
+parser.add_argument(
+    "--threads",
+    help="Threads applying Hadamard layers and diagonal gates to the register",
+    type=int,
+    default=1,
+)
+
+r"""
+The 'symmetric' option stores one amplitude per class of basis states rather than
+the whole register.
+"""
+parser.add_argument(
+    "--symmetric",
+    help="Store the register as one amplitude per class of basis states",
+    action="store_true",
+)
+
+r"""
+The 'analytic' option computes the search in closed form instead of simulating it,
+which works for registers far too large to hold in memory.
+"""
+parser.add_argument(
+    "--analytic",
+    help="Compute the iterations and probability in closed form, without a state vector",
+    action="store_true",
+)
+
+r"""
+The 'shots' option measures the register that many times after the search and
+prints the most frequent outcomes, as real hardware would report them.
+"""
+parser.add_argument(
+    "--shots",
+    help="Number of measurements to sample after the search",
+    type=int,
+    default=0,
+)
+
+r"""
+The 'seed' option seeds the sampled measurements so that their counts can be reproduced.
+"""
+parser.add_argument(
+    "--seed",
+    help="Seed of the sampled measurements",
+    type=int,
+    default=None,
+)
+
+r"""
+The 'save' option writes the projections of each iteration to a file, ``.npz`` or
+``.csv``, so that they can be plotted again without rerunning the search.
+"""
+parser.add_argument(
+    "--save",
+    help="File to save the trajectory of the search to, .npz or .csv",
+    default=None,
+)
+
+r"""
+The 'profile' option records the time, memory and operations of each gate and search
+call, writes them as a Chrome trace to the given file and prints a summary.
+"""
+parser.add_argument(
+    "--profile",
+    help="File to write a Chrome trace of the run to, viewable in chrome://tracing",
+    default=None,
+)
+
 
 # Uncomment this block to enable the arguments
 args = vars(parser.parse_args())
 
 register_size = args["Register Size"]
 target = args["Target State"]
+backend = args["backend"]
+mapped.ramBudget = args["budget"] * 2**20
+sharded.workers = args["workers"]
 #
 # print("This is currently not taking inputs so the documentation can be generated")
 # register_size = "5"
@@ -61,11 +178,28 @@ print(
     + " states (haystack)"
 )
 
+if args["analytic"]:
+    analytic.checkTarget(register_size, int(target))
+    print(
+        "I've calculated that I need to use "
+        + str(analytic.iterations(register_size))
+        + " iterations to be likely to succeed."
+    )
+    print("P(" + str(target) + ") = " + str(analytic.probability(register_size)))
+    raise SystemExit
+
+r"""
+This starts recording the calls of the run, if asked to.
+"""
+profiler = Profiler().start() if args["profile"] else None
+
 r"""
 This creates a quantum circuit with the specified register size.
 """
 
-circuit = Circuit(register_size)
+circuit = Circuit(
+    register_size, backend, args["symmetric"], args["dtype"], args["threads"]
+)
 
 r"""
 This applies the hadamard to all states initially.
@@ -77,9 +211,33 @@ This loops over the grover cycle (oracle -> h -> reflect -> h)
 number of times specified.
 """
 circuit.grover(target, True)
+if args["save"]:
+    print("Saved the trajectory to " + circuit.trajectory.save(args["save"]))
 
 
 r"""
 This measures the quantum circuit to retrieve the result of Grover's algorithm.
 """
 circuit.measure(target)
+
+r"""
+This samples the register, printing the outcomes found most often.
+"""
+if args["shots"] > 0:
+    counts = circuit.sample(args["shots"], args["seed"])
+    print("Counts of the most frequent of " + str(args["shots"]) + " shots:")
+    for outcome, count in sorted(counts.items(), key=lambda item: -item[1])[:5]:
+        print("  " + outcome + ": " + str(count))
+
+r"""
+This waits for the figure, which is drawn in the background while the result is measured.
+"""
+print("Saved the figure to " + circuit.rendering.result() + ".png")
+
+r"""
+This writes the trace of the run and prints where its time went.
+"""
+if profiler is not None:
+    profiler.stop()
+    print("Saved the trace to " + profiler.trace(args["profile"]))
+    print(profiler.summary())
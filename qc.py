@@ -7,13 +7,51 @@ provides methods for applying quantum gates and running Grover's algorithm.
 """
 
 import numpy
-from numpy.lib import math
 from gates import Gate
 
+from utils.gate import Gate as LocalGate
+from utils import analytic, distribution, optimizer, sampling, threaded
+from utils.diagonalMatrix import diagonalMatrix
+from utils.kernels import groverIteration
 from utils.state_vector import makeStateVector
+from utils.mapped import MappedVector
+from utils.program import Instruction, Program
+from utils.sharded import ShardedVector
+from utils.symmetric import SymmetricVector
+from utils.tensor import Vector
+from utils.trajectory import Trajectory
 
-import matplotlib.pyplot as plt
-from utils.tensor import sparsity
+from utils.tensor import precision, sparsity
+
+# Registers which run the steps of Grover's algorithm themselves, rather than
+# through a flat array of amplitudes.
+structured = (SymmetricVector, MappedVector, ShardedVector)
+
+# Registers whose amplitudes live outside the process memory of a `Vector`, which
+# apply gates and project themselves in place.
+external = (MappedVector, ShardedVector)
+
+
+def plotProjections(register_size: int, iterations: int, projections, name=None) -> str:
+    r"""
+    Plots the projection of the register onto the initial and oracle states
+    after each Grover iteration, as recorded by `Circuit.grover`, and saves the
+    figure, by default as ``<register_size>qubits_<iterations>iterations.png``
+    (see `utils.trajectory.Trajectory.render`).
+
+    Params:
+        register_size (int): The number of qubits in the quantum register.
+        iterations (int): The number of Grover iterations.
+        projections: One (initial, target) projection pair per iteration.
+        name (str): The path to save the figure under, without the extension.
+
+    Returns:
+        str: The name the figure was saved under, without the extension.
+    """
+
+    if name is None:
+        name = str(register_size) + "qubits_" + str(iterations) + "iterations"
+    return Trajectory.fromProjections(register_size, (), projections).render(name)
 
 
 class Circuit:
@@ -23,58 +61,350 @@ class Circuit:
     running Grover's algorithm, and measuring the result.
     """
 
-    def __init__(self, register_size: int):
+    def __init__(
+        self,
+        register_size: int,
+        backend: str = sparsity,
+        symmetric=False,
+        dtype=None,
+        threads: int = 1,
+        deferred: bool = False,
+    ):
         r"""
         Initializes a new quantum circuit with the given register size.
 
         Params:
             register_size (int): The number of qubits in the quantum register.
+            backend (str): How the register and gates are stored, ``"dense"``,
+                ``"sparse"`` or ``"auto"`` to pick per operator from its size and
+                density (see `utils.tensor`). With ``"memmap"`` the register is a
+                `utils.mapped.MappedVector` held in a file on disk, and with
+                ``"sharded"`` it is a `utils.sharded.ShardedVector` split across
+                worker processes in shared memory.
+            symmetric (bool): Whether to hold the register as a
+                `utils.symmetric.SymmetricVector`, one amplitude per class of basis
+                states, until an operation breaks the symmetry. This lets searches
+                run on registers too large to hold in full.
+            dtype: The precision of the register and gates, ``"complex128"``,
+                ``"complex64"``, ``"float64"`` or ``"float32"``, or `None` to let
+                `numpy` infer it (see `utils.tensor.precision`). Single precision
+                halves the memory and bandwidth of the register.
+            threads (int): The number of threads which apply Hadamard layers,
+                gates on one qubit and diagonal gates to a register held as a
+                `numpy` array, a cache sized chunk of amplitudes at a time (see
+                `utils.threaded`).
+            deferred (bool): Whether to record the gates and searches asked for
+                in `program` and run them only when a result is asked for, or
+                when `run` is called, rather than one by one as they are asked for.
         """
+        if backend not in ["dense", "sparse", "auto", "memmap", "sharded"]:
+            raise ValueError(
+                "Unknown backend '" + str(backend) +
+                "', expected 'dense', 'sparse', 'auto', 'memmap' or 'sharded'."
+            )
+
         self.register_size = int(register_size)
-        self.initial = makeStateVector(0, register_size)
+        self.backend = backend
+        self.dtype = precision(dtype)
+        self.threads = int(threads)
+        self.deferred = deferred
+        self.program = Program(register_size)
+        self.trajectory = None
+        self.rendering = None
+        if backend == "memmap":
+            self.initial = SymmetricVector.basis(register_size, 0)
+            self.register = MappedVector(register_size, dtype=self.dtype or numpy.float64)
+            self.gates = Gate(register_size, dtype=self.dtype)
+            return
+        if backend == "sharded":
+            self.initial = SymmetricVector.basis(register_size, 0)
+            self.register = ShardedVector(register_size, dtype=self.dtype or numpy.float64)
+            self.gates = Gate(register_size, dtype=self.dtype)
+            return
+
+        if symmetric:
+            self.initial = SymmetricVector.basis(register_size, 0, backend)
+        else:
+            self.initial = makeStateVector(0, register_size, backend, self.dtype)
         self.register = self.initial
-        self.gates = Gate(register_size)
+        self.gates = Gate(register_size, backend=backend, dtype=self.dtype)
 
         pass
 
     def __repr__(self):
-        return "%s(%s)" % (self.__class__.__qualname__, self.register_size)
+        symmetric = ""
+        if isinstance(self.register, SymmetricVector) and self.backend not in [
+            "memmap", "sharded"
+        ]:
+            symmetric = ", symmetric=True"
+        if self.dtype is not None:
+            symmetric = symmetric + ", dtype=%r" % str(self.dtype)
+        if self.threads != 1:
+            symmetric = symmetric + ", threads=%i" % self.threads
+        return "%s(%s, backend=%r%s)" % (
+            self.__class__.__qualname__, self.register_size, self.backend, symmetric
+        )
 
     def h(self):
         r"""
         Applies the Hadamard gate to all qubits in the quantum register.
 
-        This method retrieves the Hadamard gate matrix from the `gates` object,
-        raises it to the power of the register size to create a tensor product,
-        and then applies the resulting operator to the quantum register.
+        Rather than raising the Hadamard gate from the `gates` object to the power
+        of the register size, which builds a :math:`2^n \times 2^n` operator, this
+        method applies the fast Walsh-Hadamard transform to the amplitudes in
+        :math:`O(n 2^n)` time. Both give the same state.
 
         The quantum register is updated with the new state after applying the
         Hadamard gate.
+
+        A symmetric register applies the gates to its classes when it can (see
+        `utils.symmetric.SymmetricVector.h`), a memory mapped register streams
+        the transform through its file (see `utils.mapped.MappedVector.h`), and a
+        sharded register transforms each shard on its own and then pairs of shards
+        (see `utils.sharded.ShardedVector.h`). With more than one of `threads`, the
+        transform runs on a pool of threads, a cache sized chunk at a time (see
+        `utils.threaded.walshHadamard`).
+
+        A deferred circuit records the gates as an ``"h"`` instruction and applies
+        them when it runs.
+        """
+        return self._record(Instruction("h", range(self.register_size)))
+
+    def _h(self):
+        r"""
+        Applies the Hadamard gate to all qubits now, as `h` describes.
         """
-        h = self.gates.h()
-        product = h ** int(self.register_size)
-        self.register = self.register.apply(product)
+        if isinstance(self.register, structured):
+            self.register = self.register.h()
+        else:
+            self.register = self._walsh(self.register)
         return
 
-    def grover(self, target: int, plot=False):
+    def _walsh(self, register: Vector) -> Vector:
+        r"""
+        Returns a new register with a Hadamard gate applied to every qubit of the
+        given register, leaving the given register untouched.
+        """
+        amplitudes = register.amplitudes()
+        amplitudes = amplitudes.astype(numpy.result_type(amplitudes, 1.0))
+        return Vector(
+            threaded.walshHadamard(amplitudes, self.threads), self.backend, self.dtype
+        )
+
+    def _walshInPlace(self, register: Vector) -> Vector:
+        r"""
+        Applies a Hadamard gate to every qubit of a register the circuit owns,
+        writing into its amplitudes when they are a floating `numpy` array and
+        returning a new register as `_walsh` does otherwise.
+        """
+        amplitudes = register.amplitudes()
+        if isinstance(register.vector.matrix, numpy.ndarray) and (
+            amplitudes.dtype.kind in "fc"
+        ):
+            threaded.walshHadamard(amplitudes, self.threads)
+            return register
+        return self._walsh(register)
+
+    def apply(self, *gates: LocalGate):
+        r"""
+        Applies a sequence of gates, each acting on some of the qubits, to the
+        quantum register in the order given.
+
+        Each gate is a `utils.gate.Gate`, which applies its small matrix to the
+        chosen qubits without building the full register operator, for example
+
+        .. code-block:: python
+
+            circuit.apply(LocalGate(x, [0]), LocalGate(cnot, [0, 2]))
+
+        A memory mapped register applies each gate in place, a few chunks of
+        its file at a time, and a sharded register applies each gate in place on
+        its workers. With more than one of `threads`, gates on one qubit and
+        diagonal gates are applied in place by the threaded kernels of
+        `utils.threaded`.
+
+        A deferred circuit records each gate as a ``"gate"`` instruction and
+        applies them when it runs.
+
+        Params:
+            gates (LocalGate): The gates to apply.
+        """
+        return self._record(
+            *[Instruction("gate", gate.qubitPosition, matrix=gate.matrix) for gate in gates]
+        )
+
+    def _apply(self, *gates: LocalGate):
+        r"""
+        Applies a sequence of gates now, as `apply` describes.
+        """
+        if isinstance(self.register, external):
+            for gate in gates:
+                self.register.apply(gate)
+            return
+
+        amplitudes = self.register.amplitudes()
+        if self.threads > 1:
+            dtype = numpy.result_type(amplitudes, *[gate.matrix for gate in gates], 1.0)
+            amplitudes = amplitudes.astype(dtype)
+            for gate in gates:
+                threaded.applyGate(amplitudes, gate, self.threads)
+        else:
+            for gate in gates:
+                amplitudes = gate.apply(amplitudes)
+        self.register = Vector(amplitudes, self.backend, self.dtype)
+        return
+
+    def _record(self, *instructions: Instruction):
+        r"""
+        Appends instructions to `program`, and runs it unless the circuit is
+        deferred.
+
+        Returns:
+            What the last instruction returned when it ran, otherwise `None`.
+        """
+        for instruction in instructions:
+            self.program.append(instruction)
+        if not self.deferred:
+            return self.run()
+
+    def run(self):
+        r"""
+        Runs the recorded instructions of `program` in order and empties it.
+
+        Consecutive ``"gate"`` instructions are applied together, as one call of
+        `apply` applies its gates. A circuit which is not deferred runs every
+        operation as it is asked for, so its program is always empty here.
+
+        Returns:
+            What the last instruction returned, the projections of a recorded
+            search, or `None`.
+        """
+        program, self.program = self.program, Program(self.register_size)
+        result = None
+        i = 0
+        while i < len(program):
+            instruction = program[i]
+            if instruction.name == "gate":
+                gates = []
+                while i < len(program) and program[i].name == "gate":
+                    gates.append(LocalGate(program[i].params["matrix"], program[i].qubits))
+                    i = i + 1
+                result = self._apply(*gates)
+                continue
+            if instruction.name == "h":
+                result = self._h()
+            else:
+                result = self._grover(**instruction.params)
+            i = i + 1
+        return result
+
+    def optimize(self) -> dict:
+        r"""
+        Fuses and cancels the recorded instructions of a deferred circuit before
+        they run, merging gates on the same qubit, folding adjacent diagonal gates,
+        dropping gates which cancel and fusing the diffusion of a search (see
+        `utils.optimizer`).
+
+        Returns:
+            dict: The kernel launches, operations and instructions saved, with the
+            estimates before and after (see `utils.optimizer.optimize`).
+        """
+        self.program, report = optimizer.optimize(self.program)
+        return report
+
+    def iterations(self, marked: int = 1) -> int:
+        r"""
+        Returns the number of Grover iterations which makes finding one of the
+        marked states most likely, :math:`\lfloor \pi / 4\theta \rfloor` with
+        :math:`\sin\theta = \sqrt{M/N}` for :math:`M` marked states.
+
+        Params:
+            marked (int): The number of marked states.
+        """
+        return analytic.iterations(self.register_size, marked)
+
+    def grover(self, target: int, plot=False, engine="matrix-free", record=False):
         r"""
         Runs Grover's algorithm on the quantum circuit to find the target state.
 
         This method calculates the number of iterations required for Grover's
-        algorithm based on the register size and the target state. It then
-        constructs the Grover operator by combining the oracle, Hadamard gates,
-        and reflection operator.
-
-        The Grover operator is applied to the quantum register for the calculated
-        number of iterations to amplify the amplitude of the target state.
+        algorithm based on the register size and the target state, and then
+        applies the Grover iteration to the quantum register that many times to
+        amplify the amplitude of the target state. Several target states may be
+        marked at once, in which case their uniform superposition is amplified.
+
+        Two engines are available. The default ``"matrix-free"`` engine never
+        builds an operator; it flips the sign of the target amplitude in place
+        and then reflects every amplitude about the mean (see `utils.kernels`),
+        so each iteration costs :math:`O(2^n)`. The ``"operator"`` engine
+        follows the circuit gate by gate and is kept as a reference for
+        cross-checking. It applies the oracle and reflection operators to the
+        register, with the Hadamard layers between them applied by the fast
+        Walsh-Hadamard transform. Both engines update a private copy of the
+        register in place, so a dense register allocates nothing per iteration
+        (see `utils.tensor.Vector.applyInPlace`). With more than one of `threads`,
+        the diagonal operators and Hadamard layers of the operator engine run on a
+        pool of threads.
+
+        A symmetric register runs the same steps on its classes, so each
+        iteration of the matrix-free engine costs :math:`O(M)` for :math:`M`
+        targets. The Hadamard layers of the operator engine break the symmetry,
+        so it carries on with a full register after the first one. A memory
+        mapped register runs the same steps in place, streaming through its file,
+        and a sharded register runs them in place on its workers.
 
         Params:
-            target (int): The target state to find using Grover's algorithm.
+            target (Union[int, list[int]]): The target state, or states, to find
+                using Grover's algorithm.
+            plot (bool): Whether to draw the recorded projections once the search
+                is over. The figure is drawn on a background thread without an
+                interactive backend, and `rendering` holds its future.
+            engine (str): Either ``"matrix-free"`` or ``"operator"``.
+            record (bool): Whether to return the projections of the register onto
+                the initial and target states after each iteration. They are also
+                kept as the `utils.trajectory.Trajectory` `trajectory`, which can
+                be saved as ``.npz`` or CSV.
+
+        A deferred circuit records the search as a ``"grover"`` instruction and
+        runs it when it runs, after which the projections are kept as
+        `trajectory`.
+
+        Returns:
+            numpy.ndarray: With `record` or `plot`, one row of (initial, target)
+            projections per iteration, otherwise `None`. A deferred circuit
+            returns `None`.
         """
 
-        N = 2**self.register_size
-        theta = numpy.arcsin(numpy.sqrt(1 / N))
-        iterations = math.floor(numpy.pi / (4 * theta))
+        if engine not in ["matrix-free", "operator"]:
+            raise ValueError(
+                "Unknown Grover engine '" + str(engine) +
+                "', expected 'matrix-free' or 'operator'."
+            )
+
+        marked = numpy.unique(numpy.asarray(target, dtype=int).reshape(-1))
+        return self._record(
+            Instruction(
+                "grover",
+                range(self.register_size),
+                target=target,
+                plot=plot,
+                engine=engine,
+                record=record,
+                iterations=self.iterations(marked.shape[0]),
+            )
+        )
+
+    def _grover(
+        self, target, plot=False, engine="matrix-free", record=False, iterations=None
+    ):
+        r"""
+        Runs Grover's algorithm now, as `grover` describes, making the recorded
+        number of `iterations`, or `Circuit.iterations` if none were recorded.
+        """
+
+        marked = numpy.unique(numpy.asarray(target, dtype=int).reshape(-1))
+        if iterations is None:
+            iterations = self.iterations(marked.shape[0])
 
         print(
             "I've calculated that I need to use "
@@ -82,82 +412,149 @@ class Circuit:
             + " iterations to be likely to succeed."
         )
 
-        if plot:
-
-            plt.figure(figsize=(12, 12))
-            plt.title(
-                "Projection of "
-                + str(self.register_size)
-                + " qubit Quantum Register State with Initial and Oracle State Over "
-                + str(iterations)
-                + " iterations"
-            )
-            # Manually adjust these to find the best axis
-            plt.ylim((-0.1, 1))
-            plt.axis("off")
-
-            plt.quiver(
-                [1, 0, 1],
-                [0, 0, 0],
-                angles="xy",
-                scale_units="xy",
-                scale=1,
-                label="Initial State",
-                color="b",
-                alpha=0.1,
-            )
-            plt.quiver(
-                [0, 0, 0],
-                [1, 0, 1],
-                angles="xy",
-                scale_units="xy",
-                scale=1,
-                label="Oracle State",
-                color="g",
-                alpha=0.1,
-            )
-
-            target_state = makeStateVector(int(target), self.register_size)
+        record = record or plot
+        if record:
+            target_state = self._state(marked)
+            self.trajectory = Trajectory(self.register_size, marked, iterations)
 
         i = 0
 
-        G = (
-            self.gates.oracle(target)
-            * self.gates.h() ** int(self.register_size)
-            * self.gates.reflection()
-            * self.gates.h() ** int(self.register_size)
-        )
+        oracle = None
+        reflection = None
+        if not isinstance(self.register, structured):
+            # Work on a private copy so the initial state is never overwritten,
+            # then update it in place. A dense register is a view onto the
+            # amplitudes, so only a sparse one needs rebuilding from them.
+            amplitudes = self.register.amplitudes()
+            amplitudes = amplitudes.astype(numpy.result_type(amplitudes, 1.0))
+            self.register = Vector(amplitudes, self.backend, self.dtype)
+            amplitudes = self.register.amplitudes()
+            view = isinstance(self.register.vector.matrix, numpy.ndarray)
 
-        x = []
         while i < int(iterations):
-            self.register = self.register.apply(G)
+            if isinstance(self.register, structured):
+                self.register = self.register.phaseFlip(marked)
+                if engine == "operator":
+                    self._h()
+                else:
+                    self.register = self.register.invertAboutMean()
+            elif engine == "operator":
+                if oracle is None:
+                    oracle = self._oracle(marked)
+                self.register = self._walshInPlace(self._applyInPlace(oracle))
+            else:
+                groverIteration(amplitudes, marked)
+                if not view and (record or i + 1 == int(iterations)):
+                    self.register = Vector(amplitudes, self.backend, self.dtype)
+
+            if engine == "operator":
+                if isinstance(self.register, structured):
+                    self.register = self.register.reflect()
+                    self._h()
+                else:
+                    # Built only now, since a structured register reflects itself.
+                    if reflection is None:
+                        reflection = self.gates.reflection()
+                    self.register = self._walshInPlace(self._applyInPlace(reflection))
 
             i = i + 1
 
-            if plot:
-                target_projection = self.register.measure(target_state)
-                initial_projection = self.register.measure(self.initial)
-                x.append(initial_projection)
-                plt.quiver(
-                    [initial_projection, 0, initial_projection],
-                    [target_projection, 0, target_projection],
-                    angles="xy",
-                    scale_units="xy",
-                    scale=1,
-                    alpha=target_projection,
-                    label="Iteration " + str(i),
+            if record:
+                self.trajectory.record(
+                    self._project(self.initial), self._project(target_state)
                 )
 
         if plot:
-            plt.legend()
-            plt.xlim(min(x) - 0.01, 1.2 * max(x))
-            plt.xticks(x)
-            plt.savefig(
-                str(self.register_size) + "qubits_" +
-                str(iterations) + "iterations",
-                dpi=400,
+            self.rendering = self.trajectory.renderInBackground()
+
+        if record:
+            return self.trajectory.projections
+
+    def _applyInPlace(self, operator) -> Vector:
+        r"""
+        Applies an operator to a register the circuit owns, in place. A diagonal
+        operator is applied to a `numpy` array of amplitudes by the threaded kernel
+        when there is more than one of `threads`, and anything else by
+        `utils.tensor.Vector.applyInPlace`.
+        """
+        amplitudes = self.register.amplitudes()
+        if (
+            self.threads > 1
+            and isinstance(operator.matrix, diagonalMatrix)
+            and isinstance(self.register.vector.matrix, numpy.ndarray)
+            and numpy.can_cast(
+                numpy.result_type(operator.matrix.diagonal, amplitudes), amplitudes.dtype
+            )
+        ):
+            threaded.applyDiagonal(amplitudes, operator.matrix.diagonal, threads=self.threads)
+            self.register.state = None
+            return self.register
+        return self.register.applyInPlace(operator)
+
+    def _oracle(self, marked: numpy.ndarray):
+        r"""
+        Returns the oracle operator which marks every state in `marked`.
+        """
+        return self.gates.oracle(marked)
+
+    def _state(self, states):
+        r"""
+        Returns the uniform superposition of some basis states, held in the same
+        way as the register.
+        """
+        states = numpy.unique(numpy.asarray(states, dtype=int).reshape(-1))
+        if isinstance(self.register, structured):
+            return SymmetricVector.basis(self.register_size, states, self.register.backend)
+        if states.shape[0] == 1:
+            return makeStateVector(
+                int(states[0]), self.register_size, self.backend, self.dtype
             )
-            plt.show()
+        return SymmetricVector.basis(self.register_size, states, self.backend).toVector()
+
+    def _project(self, state):
+        r"""
+        Returns the projection of the register onto a state, either of which may
+        be symmetric.
+        """
+        if isinstance(self.register, external):
+            return self.register.measure(state)
+        if isinstance(state, SymmetricVector):
+            return state.measure(self.register)
+        return self.register.measure(state)
+
+    def grover_batch(self, targets: list[int]) -> numpy.ndarray:
+        r"""
+        Runs Grover's algorithm for many targets at once and returns the
+        probability of finding each target.
+
+        Every search starts from the current state of the quantum register.
+        The :math:`k` states are held together as the columns of one
+        :math:`2^n \times k` array, so each iteration is a single vectorised
+        phase flip and a single reflection about the column means for the
+        whole batch (see `utils.kernels`). The register itself is left as it is.
+
+        Params:
+            targets (list[int]): The target state of each search.
+
+        Returns:
+            numpy.ndarray: The probability of measuring each target after its search.
+        """
+        self.run()
+        targets = numpy.asarray(targets, dtype=int).reshape(-1)
+
+        amplitudes = self.register.amplitudes()
+        dtype = numpy.result_type(amplitudes, 1.0)
+        states = numpy.empty((amplitudes.shape[0], targets.shape[0]), dtype=dtype)
+        states[:] = amplitudes[:, None]
+
+        iterations = self.iterations()
+        i = 0
+        while i < iterations:
+            groverIteration(states, targets)
+            i = i + 1
+
+        found = states[targets, numpy.arange(targets.shape[0])]
+        return numpy.abs(found) ** 2
 
     def measure(self, target: int):
         r"""
@@ -166,20 +563,102 @@ class Circuit:
         This method performs a measurement on the quantum circuit to determine the
         probability of observing the target state. It calculates the inner product
         between the target state vector and the current state vector of the quantum
-        register.
+        register. The instructions a deferred circuit has recorded are run first, as
+        they are by every method which reads the register.
 
         Params:
             target (int): The target state to measure the probability for.
 
         ----
         """
-        target_state = makeStateVector(int(target), self.register_size)
+        self.run()
+        target_state = self._state(int(target))
 
         print("I think I've found it!")
         print(
             "P("
             + str(target)
             + ") = "
-            + str((self.register.measure(target_state)) ** 2)
+            + str(abs(self._project(target_state)) ** 2)
         )
         return
+
+    def probabilities(self) -> numpy.ndarray:
+        r"""
+        Returns the probability of measuring each basis state, :math:`|a_i|^2` for
+        every amplitude :math:`a_i`, in one vectorised pass over the register.
+
+        The amplitudes are read a chunk at a time (see `utils.distribution`), so a
+        memory mapped register is never held in memory in full; only the result is.
+
+        Returns:
+            numpy.ndarray: The probability of each basis state.
+        """
+        self.run()
+        return distribution.probabilities(self.register.amplitudes(), self._chunk())
+
+    def top_k(self, k: int, keys: str = "bitstring") -> dict:
+        r"""
+        Returns the most likely outcomes of measuring the register and their
+        probabilities, without projecting it onto each basis state in turn.
+
+        Each chunk of the register contributes only its :math:`k` most likely
+        outcomes, found by partial selection, and only those are sorted (see
+        `utils.distribution.topK`). A symmetric register needs only its classes.
+
+        Params:
+            k (int): The number of outcomes.
+            keys (str): How to key the outcomes, as in `sample`.
+
+        Returns:
+            dict: The probability of each of the :math:`k` most likely outcomes, most
+            likely first, with ties broken by the lower state.
+        """
+        self.run()
+        if isinstance(self.register, SymmetricVector):
+            states, found = self.register.top(k)
+        else:
+            chunks = distribution.pieces(self.register.amplitudes(), self._chunk())
+            states, found = distribution.topK(chunks, k)
+        labels = sampling.labels(states, self.register_size, keys)
+        return dict(zip(labels, found.tolist()))
+
+    def _chunk(self) -> int:
+        r"""
+        Returns how many amplitudes of the register to read at once.
+        """
+        if isinstance(self.register, MappedVector):
+            return 1 << self.register.chunkBits()
+        return distribution.chunkSize
+
+    def sample(self, shots: int, seed=None, keys: str = "bitstring") -> dict:
+        r"""
+        Measures the register in the computational basis a number of times and
+        returns how often each outcome was found, as real hardware does.
+
+        The shots are drawn together from a table of cumulative probabilities
+        built once for the current state (see `utils.sampling`), so a million
+        shots take milliseconds. Symmetric, memory mapped and sharded registers
+        draw their shots without listing or reading the whole register at once.
+        The register itself is left unchanged.
+
+        Params:
+            shots (int): The number of measurements.
+            seed: An int, `numpy.random.SeedSequence` or `numpy.random.Generator`
+                to draw with, for reproducible counts. Parallel workers should each
+                use one of the independent streams of `utils.sampling.generators`.
+            keys (str): ``"bitstring"`` to key the counts by the bits of each
+                outcome, with qubit 0 last, or ``"int"`` to key them by the basis
+                state.
+
+        Returns:
+            dict: The number of shots of each outcome found at least once.
+        """
+        self.run()
+        random = sampling.generator(seed)
+        if isinstance(self.register, structured):
+            outcomes = self.register.sample(shots, random)
+        else:
+            probabilities = numpy.abs(self.register.amplitudes()) ** 2
+            outcomes = sampling.draw(probabilities, shots, random)
+        return sampling.counts(outcomes, self.register_size, keys)
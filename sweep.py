@@ -0,0 +1,162 @@
+r"""
+Register Size Sweep
+===================
+This module regenerates the ``<N>qubits_<M>iterations.png`` figures, and a summary of
+how long each search took and how likely it was to succeed, for a range of register
+sizes and targets.
+
+Every (register size, target) search runs `Circuit.grover` in its own worker process,
+recording the projections of each iteration as data rather than plotting them. The
+figures are then rendered from that data in separate worker processes without an
+interactive backend (see `utils.trajectory`), so a full regeneration scales with the number of cores.
+
+Run from the repository root, for example ``python sweep.py --min 2 --max 12``.
+"""
+
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from timeit import default_timer
+
+from qc import Circuit
+from utils.state_vector import makeStateVector
+from utils.trajectory import Trajectory
+
+
+def simulate(register_size: int, target: int, backend: str = "dense") -> dict:
+    r"""
+    Runs one Grover search and returns its timing, success probability and
+    per-iteration projections.
+
+    Params:
+        register_size (int): The number of qubits in the quantum register.
+        target (int): The target state of the search.
+        backend (str): The backend of the circuit.
+
+    Returns:
+        dict: The register size, target, iterations, seconds, probability and
+        projections of the search.
+    """
+
+    start = default_timer()
+    with redirect_stdout(StringIO()):
+        circuit = Circuit(register_size, backend)
+        circuit.h()
+        projections = circuit.grover(target, record=True)
+    seconds = default_timer() - start
+
+    target_state = makeStateVector(target, register_size, backend)
+    return {
+        "qubits": register_size,
+        "target": target,
+        "iterations": circuit.iterations(),
+        "seconds": seconds,
+        "probability": float(circuit.register.measure(target_state) ** 2),
+        "projections": projections,
+    }
+
+
+def render(result: dict, name: str) -> str:
+    r"""
+    Renders the figure of one search without an interactive backend.
+
+    Params:
+        result (dict): The search, as returned by `simulate`.
+        name (str): The path to save the figure under, without the extension.
+
+    Returns:
+        str: The path the figure was saved under.
+    """
+
+    trajectory = Trajectory.fromProjections(
+        result["qubits"], result["target"], result["projections"]
+    )
+    return trajectory.render(name)
+
+
+def sweep(
+    sizes: list[int],
+    targets: list[int],
+    directory: str = ".",
+    workers: int = None,
+    backend: str = "dense",
+) -> list[dict]:
+    r"""
+    Runs every (register size, target) search and renders its figure in a
+    process pool, then writes ``summary.csv`` to `directory`.
+
+    A target which does not fit in a register size is skipped for that size.
+    With a single target the figures keep the ``<N>qubits_<M>iterations`` name,
+    otherwise ``_target<T>`` is appended.
+
+    Params:
+        sizes (list[int]): The register sizes.
+        targets (list[int]): The targets to search for at every size.
+        directory (str): Where to write the figures and summary.
+        workers (int): The number of worker processes, by default one per core.
+        backend (str): The backend of the circuits.
+
+    Returns:
+        list[dict]: The searches, as returned by `simulate`, in order.
+
+    ----
+    """
+
+    os.makedirs(directory, exist_ok=True)
+    jobs = [(n, t) for n in sizes for t in targets if t < 2**n]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        searches = [pool.submit(simulate, n, t, backend) for n, t in jobs]
+        results = [search.result() for search in searches]
+
+        figures = []
+        for result in results:
+            name = str(result["qubits"]) + "qubits_" + str(result["iterations"]) + "iterations"
+            if len(targets) > 1:
+                name = name + "_target" + str(result["target"])
+            figures.append(pool.submit(render, result, os.path.join(directory, name)))
+        for figure, result in zip(figures, results):
+            result["figure"] = figure.result() + ".png"
+
+    with open(os.path.join(directory, "summary.csv"), "w", newline="") as summary:
+        columns = ["qubits", "target", "iterations", "seconds", "probability", "figure"]
+        writer = csv.DictWriter(summary, columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grover register size sweep")
+    parser.add_argument("--min", type=int, default=2, help="Smallest register size")
+    parser.add_argument("--max", type=int, default=12, help="Largest register size")
+    parser.add_argument(
+        "--targets", type=int, nargs="+", default=[1], help="Target states to search for"
+    )
+    parser.add_argument("--output", default=".", help="Directory for figures and summary")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument(
+        "--backend", choices=["dense", "sparse", "auto"], default="dense", help="Backend"
+    )
+    args = parser.parse_args()
+
+    results = sweep(
+        range(args.min, args.max + 1), args.targets, args.output, args.workers, args.backend
+    )
+
+    print("%6s %8s %10s %12s %12s" % ("qubits", "target", "iterations", "seconds", "P(target)"))
+    for result in results:
+        print(
+            "%6i %8i %10i %12.6f %12.6f"
+            % (
+                result["qubits"],
+                result["target"],
+                result["iterations"],
+                result["seconds"],
+                result["probability"],
+            )
+        )
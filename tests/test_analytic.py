@@ -0,0 +1,67 @@
+"""
+Analytic Trajectory Test Suite
+##############################
+
+This module tests the closed form Grover trajectory in the analytic module.
+"""
+
+import unittest
+import numpy
+from qc import Circuit
+from utils import analytic
+from utils.state_vector import makeStateVector
+
+
+class TestAnalytic(unittest.TestCase):
+    r"""
+    This class checks the closed form against the simulated searches.
+    """
+
+    def test_validate(self):
+        r"""
+        This test checks that the closed form agrees with the kernels for
+        small registers.
+        """
+        self.assertLess(analytic.validate(), 1e-9)
+
+    def test_matches_circuit(self):
+        r"""
+        This test checks the trajectory and probability against the projections
+        recorded by `Circuit.grover` and the final measurement.
+        """
+        for target in [0, 11]:
+            circuit = Circuit(6)
+            circuit.h()
+            projections = circuit.grover(target, record=True)
+            self.assertTrue(
+                numpy.allclose(projections, analytic.trajectory(6, target))
+            )
+            self.assertAlmostEqual(
+                analytic.probability(6),
+                circuit.register.measure(makeStateVector(target, 6)) ** 2,
+            )
+
+    def test_large_register(self):
+        r"""
+        This test checks that a 40 qubit search needs no state vector and
+        ends close to certain.
+        """
+        projections = analytic.trajectory(40, 3)
+        self.assertEqual(projections.shape, (analytic.iterations(40), 2))
+        self.assertGreater(analytic.probability(40), 0.999)
+
+    def test_iterations(self):
+        r"""
+        This test checks the iteration counts, which circuits share.
+        """
+        self.assertEqual(analytic.iterations(2), 1)
+        self.assertEqual(analytic.iterations(10), 25)
+        self.assertEqual(analytic.iterations(10, 4), 12)
+        self.assertEqual(Circuit(6).iterations(3), analytic.iterations(6, 3))
+
+    def test_target_out_of_range(self):
+        r"""
+        This test checks that a target which does not fit in the register is rejected.
+        """
+        with self.assertRaises(ValueError):
+            analytic.trajectory(3, 8)
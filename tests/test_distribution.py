@@ -0,0 +1,95 @@
+"""
+Distribution Test Suite
+##############################
+
+This module tests the distribution module and `Circuit.probabilities` and
+`Circuit.top_k`.
+"""
+
+import unittest
+import numpy
+from qc import Circuit
+from utils import distribution, mapped
+from utils.state_vector import makeStateVector
+
+
+class TestDistribution(unittest.TestCase):
+    r"""
+    This class checks the probabilities and partial selection of the
+    distribution module on chunks smaller than the register.
+    """
+
+    def test_probabilities(self):
+        r"""
+        This test checks the probabilities of complex amplitudes read in
+        chunks, and that integer amplitudes give real probabilities.
+        """
+        amplitudes = numpy.exp(1j * numpy.arange(16)) * numpy.arange(16) / 35
+        found = distribution.probabilities(amplitudes, chunk=3)
+        self.assertTrue(numpy.allclose(found, numpy.abs(amplitudes) ** 2))
+        self.assertEqual(found.dtype, numpy.float64)
+        self.assertEqual(distribution.probabilities(numpy.arange(4)).dtype.kind, "f")
+
+    def test_top_k(self):
+        r"""
+        This test checks the most likely outcomes against a full sort, with
+        ties between chunks broken by the lower state.
+        """
+        generator = numpy.random.default_rng(2)
+        probabilities = numpy.round(generator.random(1000), 2)
+        states, found = distribution.topK(
+            distribution.pieces(numpy.sqrt(probabilities), chunk=64), 25
+        )
+        expected = numpy.lexsort((numpy.arange(1000), -probabilities))[:25]
+        self.assertTrue((states == expected).all())
+        self.assertTrue(numpy.allclose(found, probabilities[expected]))
+        with self.assertRaises(ValueError):
+            distribution.topK(distribution.pieces(probabilities), 0)
+
+
+class TestCircuitDistribution(unittest.TestCase):
+    r"""
+    This class checks `Circuit.probabilities` and `Circuit.top_k` against one
+    projection per basis state, however the register is held.
+    """
+
+    def test_registers_agree(self):
+        r"""
+        This test checks full, symmetric and memory mapped registers after a
+        search for several states.
+        """
+        marked = [3, 40, 41]
+        budget = mapped.ramBudget
+        mapped.ramBudget = 2 * 8 * 8
+        try:
+            for options in [{}, {"symmetric": True}, {"backend": "memmap"}]:
+                circuit = Circuit(6, **options)
+                circuit.h()
+                circuit.grover(marked)
+
+                reference = Circuit(6)
+                reference.h()
+                reference.grover(marked)
+                expected = numpy.array(
+                    [abs(reference.register.measure(makeStateVector(i, 6))) ** 2
+                     for i in range(64)]
+                )
+
+                self.assertTrue(numpy.allclose(circuit.probabilities(), expected))
+                top = circuit.top_k(4, keys="int")
+                self.assertEqual(list(top), [3, 40, 41, 0])
+                self.assertTrue(numpy.allclose(list(top.values()), expected[list(top)]))
+                if options.get("backend") == "memmap":
+                    circuit.register.close()
+        finally:
+            mapped.ramBudget = budget
+
+    def test_bitstring_keys(self):
+        r"""
+        This test checks that the most likely outcome of a search is keyed by
+        its bits.
+        """
+        circuit = Circuit(5)
+        circuit.h()
+        circuit.grover(6)
+        self.assertEqual(list(circuit.top_k(1)), ["00110"])
@@ -0,0 +1,73 @@
+"""
+Gate Module Test Suite
+##############################
+
+This module tests the `Gate` class included in the utils.gate module.
+"""
+
+import unittest
+
+import numpy
+
+from utils.gate import Gate
+
+
+class TestLocalGate(unittest.TestCase):
+    r"""
+    This class checks that a gate acting on chosen qubits is applied
+    correctly to a larger register.
+    """
+
+    def test_gather_scatter_round_trip(self):
+        r"""
+        This test checks that scattering the gathered bits of an index
+        recovers exactly the bits at the gate's qubit positions.
+        """
+        gate = Gate(numpy.eye(8), [4, 0, 2])
+        for i in range(32):
+            self.assertEqual(gate.scatter(gate.gather(i)), i & 0b10101)
+        self.assertEqual(gate.gather(0b10001), 0b011)
+
+    def test_apply_matches_index_loop(self):
+        r"""
+        This test checks the vectorised `apply` against the element by element
+        definition :math:`w_i = \sum_c U_{r c} v_{i_0 | scatter(c)}`, for a random
+        two qubit gate on non-adjacent qubits given out of order.
+        """
+        generator = numpy.random.default_rng(3)
+        matrix = generator.normal(size=(4, 4))
+        v = generator.normal(size=32)
+        gate = Gate(matrix, [3, 1])
+
+        expected = numpy.zeros(32)
+        for i in range(32):
+            r = gate.gather(i)
+            i0 = i & ~gate.scatter(r)
+            for c in range(4):
+                expected[i] += matrix[r, c] * v[i0 | gate.scatter(c)]
+
+        self.assertTrue(numpy.allclose(gate.apply(v), expected))
+
+    def test_apply_rejects_missing_qubit(self):
+        r"""
+        This test checks that a gate on a qubit the register does not have
+        is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Gate([0, 1, 1, 0], [3]).apply(numpy.ones(4))
+
+    def test_rejects_bad_positions(self):
+        r"""
+        This test checks that empty, negative and repeated qubit positions, and
+        positions which do not match the size of the matrix, are rejected.
+        """
+        x = [0, 1, 1, 0]
+        for matrix, positions in [
+            ([1], []),
+            (x, [-1]),
+            (numpy.eye(4), [2, 2]),
+            (x, [0, 1]),
+            (numpy.eye(4), [0]),
+        ]:
+            with self.assertRaises(ValueError):
+                Gate(matrix, positions)
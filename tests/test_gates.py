@@ -0,0 +1,151 @@
+"""
+Gates Module Test Suite
+##############################
+
+This module tests the `Gate` class included in the gates module.
+"""
+
+import unittest
+
+from gates import Gate
+from utils.diagonalMatrix import diagonalMatrix
+from utils.state_vector import makeStateVector
+
+
+class TestDiagonalGates(unittest.TestCase):
+    r"""
+    This class checks that the oracle and reflection gates are stored as
+    diagonals and behave exactly as the dense gates they replace.
+
+    The purpose of each test and the method by which it
+    is validated is outlined below.
+    """
+
+    def test_gates_are_diagonal(self):
+        r"""
+        This test checks that the oracle and reflection are emitted as a
+        `diagonalMatrix` and equal the dense gates built from the identity.
+        """
+        diagonal = Gate(3)
+        dense = Gate(3, diagonal=False)
+
+        self.assertIsInstance(diagonal.oracle(5).matrix, diagonalMatrix)
+        self.assertIsInstance(diagonal.reflection().matrix, diagonalMatrix)
+        self.assertTrue(diagonal.oracle(5).equal(dense.oracle(5)))
+        self.assertTrue(diagonal.reflection().equal(dense.reflection()))
+
+    def test_oracle_flips_target(self):
+        r"""
+        This test checks that applying the oracle to the target state only
+        flips its sign.
+        """
+        target = makeStateVector(6, 3)
+        result = target.apply(Gate(3).oracle(6))
+        self.assertTrue(result.equal(makeStateVector(6, 3).scale(-1)))
+
+    def test_products_with_diagonal(self):
+        r"""
+        This test checks diagonal-diagonal and diagonal-dense products, in
+        both orders, against the same products of the dense gates.
+        """
+        diagonal = Gate(3)
+        dense = Gate(3, diagonal=False)
+        h = diagonal.h() ** 3
+
+        self.assertIsInstance(
+            (diagonal.oracle(2) * diagonal.reflection()).matrix, diagonalMatrix
+        )
+        self.assertTrue(
+            (diagonal.oracle(2) * diagonal.reflection()).equal(
+                dense.oracle(2) * dense.reflection()
+            )
+        )
+        self.assertTrue(
+            (h * diagonal.reflection() * h).equal(h * dense.reflection() * h)
+        )
+        self.assertTrue(
+            (diagonal.oracle(1) * h).equal(dense.oracle(1) * h)
+        )
+
+
+class TestGateCache(unittest.TestCase):
+    r"""
+    This class checks the process-wide cache of built gates.
+    """
+
+    def setUp(self):
+        Gate.cache.clear()
+
+    def tearDown(self):
+        Gate.cache.resize(256 * 2**20)
+        Gate.cache.clear()
+
+    def test_hits_and_misses(self):
+        r"""
+        This test checks that a gate is built once per key and shared
+        between `Gate` instances of the same register size and backend.
+        """
+        Gate(4).oracle(3)
+        Gate(4).oracle(3)
+        Gate(4).oracle(2)
+        Gate(4, backend="sparse").oracle(3)
+
+        stats = Gate.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["entries"], 3)
+
+    def test_several_targets_are_one_entry(self):
+        r"""
+        This test checks that an oracle for several targets is one cached
+        entry, whatever the order of the targets, and equals the product of the
+        oracles for each target.
+        """
+        oracle = Gate(4).oracle([9, 2, 5])
+        self.assertTrue(Gate(4).oracle([5, 9, 2]).equal(oracle))
+        stats = Gate.cache.stats()
+        self.assertEqual((stats["entries"], stats["hits"]), (1, 1))
+
+        expected = Gate(4, diagonal=False).oracle(2)
+        for target in [5, 9]:
+            expected = expected * Gate(4, diagonal=False).oracle(target)
+        self.assertTrue(Gate(4, diagonal=False).oracle([2, 5, 9]).equal(expected))
+
+    def test_cached_gate_is_protected(self):
+        r"""
+        This test checks that changing a gate in place, as `Operator.update`,
+        `Operator.negate` and ``+`` do, does not change the cached gate.
+        """
+        changed = Gate(3).reflection()
+        changed.negate().update(4, 4, 7)
+        changed + Gate(3).oracle(1)
+
+        fresh = Gate(3).reflection()
+        self.assertTrue(fresh.equal(Gate(3, diagonal=False).reflection()))
+        self.assertFalse(fresh.equal(changed))
+
+    def test_eviction(self):
+        r"""
+        This test checks that the least recently used gates are evicted to
+        stay within the memory budget, and that a budget of zero disables
+        caching.
+        """
+        Gate.cache.resize(3 * 2**6 * 8)
+        for target in range(4):
+            Gate(6).oracle(target)
+        # Using the oracle for 1 again makes the oracle for 2 the least recent.
+        Gate(6).oracle(1)
+        Gate(6).oracle(0)
+        Gate(6).oracle(1)
+
+        stats = Gate.cache.stats()
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(stats["entries"], 3)
+        self.assertLessEqual(stats["used"], stats["budget"])
+        self.assertEqual(stats["misses"], 5)
+        self.assertEqual(stats["hits"], 2)
+
+        Gate.cache.resize(0)
+        self.assertEqual(Gate.cache.stats()["entries"], 0)
+        Gate(6).oracle(1)
+        self.assertEqual(Gate.cache.stats()["entries"], 0)
@@ -0,0 +1,58 @@
+"""
+Kernel Module Test Suite
+##############################
+
+This module tests the matrix-free kernels included in the kernels module.
+"""
+
+import unittest
+
+import numpy
+
+from gates import Gate
+from utils.kernels import invertAboutMean, walshHadamard
+from utils.tensor import Vector
+
+
+class TestKernels(unittest.TestCase):
+    r"""
+    This class checks each kernel against the operator it replaces.
+
+    The purpose of each test and the method by which it
+    is validated is outlined below.
+    """
+
+    def test_walsh_hadamard_matches_operator(self):
+        r"""
+        This test checks that the fast Walsh-Hadamard transform agrees with
+        applying :math:`H^{\otimes n}` built from tensor products, on a random
+        state.
+        """
+        generator = numpy.random.default_rng(5)
+        for size in range(1, 7):
+            amplitudes = generator.normal(size=2**size)
+            expected = Vector(amplitudes.copy()).apply(Gate(1).h() ** size)
+            result = Vector(walshHadamard(amplitudes))
+            self.assertTrue(result.equal(expected))
+
+    def test_walsh_hadamard_rejects_bad_length(self):
+        r"""
+        This test checks that an array whose length is not a power of two
+        is rejected.
+        """
+        with self.assertRaises(ValueError):
+            walshHadamard(numpy.ones(6))
+
+    def test_diffusion_matches_operator(self):
+        r"""
+        This test checks that reflecting about the mean agrees with
+        :math:`H^{\otimes n} R H^{\otimes n}` built from the gates.
+        """
+        size = 4
+        gates = Gate(size)
+        amplitudes = numpy.random.default_rng(7).normal(size=2**size)
+        expected = Vector(amplitudes.copy()).apply(
+            gates.h() ** size * gates.reflection() * gates.h() ** size
+        )
+        result = Vector(invertAboutMean(amplitudes))
+        self.assertTrue(result.equal(expected))
@@ -0,0 +1,144 @@
+"""
+Mapped Vector Test Suite
+##############################
+
+This module tests the `MappedVector` class included in the mapped module.
+"""
+
+import os
+import unittest
+import numpy
+from qc import Circuit
+from utils import mapped
+from utils.gate import Gate
+from utils.kernels import invertAboutMean, phaseFlip, walshHadamard
+from utils.mapped import MappedVector
+
+
+class TestMappedVector(unittest.TestCase):
+    r"""
+    This class checks each operation on a `MappedVector`, with a budget small
+    enough that the register is split into many chunks, against the same
+    operation on an array in memory.
+    """
+
+    def setUp(self):
+        # 8 amplitudes of 8 bytes per buffer, so chunks of at most 8 amplitudes.
+        self.register = MappedVector(8, budget=2 * 8 * 8)
+        self.expected = numpy.zeros(2**8)
+        self.expected[0] = 1
+
+    def tearDown(self):
+        self.register.close()
+
+    def test_chunks(self):
+        r"""
+        This test checks that the chunks shrink to keep a group of paired
+        chunks within the budget.
+        """
+        self.assertEqual(self.register.chunkBits(), 3)
+        self.assertEqual(self.register.chunkBits([7]), 2)
+        self.assertEqual(self.register.chunkBits([0, 6, 7]), 1)
+
+    def test_grover_steps(self):
+        r"""
+        This test checks the Hadamard layer, oracle, diffusion and reflection.
+        """
+        self.register.h()
+        walshHadamard(self.expected)
+        self.assertTrue(numpy.allclose(self.register.data, self.expected))
+
+        self.register.phaseFlip([3, 200]).invertAboutMean()
+        invertAboutMean(phaseFlip(self.expected, [3, 200]))
+        self.assertTrue(numpy.allclose(self.register.data, self.expected))
+
+        self.register.reflect()
+        self.expected[1:] *= -1
+        self.assertTrue(numpy.allclose(self.register.data, self.expected))
+
+    def test_gates_on_high_qubits(self):
+        r"""
+        This test checks gates on qubits within a chunk, across chunks and
+        on both.
+        """
+        self.register.h()
+        walshHadamard(self.expected)
+        self.register.phaseFlip(77)
+        phaseFlip(self.expected, 77)
+
+        cnot = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0]
+        for qubits in [[0, 1], [0, 7], [7, 2], [6, 5]]:
+            gate = Gate(cnot, qubits)
+            self.register.apply(gate)
+            self.expected = gate.apply(self.expected)
+            self.assertTrue(numpy.allclose(self.register.data, self.expected))
+
+    def test_phase_needs_complex(self):
+        r"""
+        This test checks that a phase gate is rejected by a real register rather
+        than losing its phase, and matches the array in memory on a complex one.
+        """
+        s = [[1, 0], [0, 1j]]
+        self.register.h()
+        with self.assertRaises(ValueError):
+            self.register.apply(Gate(s, [7]))
+
+        register = MappedVector(8, budget=2 * 8 * 16, dtype=numpy.complex128)
+        register.h().apply(Gate(s, [7])).apply(Gate(s, [1]))
+        expected = walshHadamard(self.expected.astype(complex))
+        expected = Gate(s, [1]).apply(Gate(s, [7]).apply(expected))
+        self.assertTrue(numpy.allclose(register.data, expected))
+        register.close()
+
+    def test_temporary_file(self):
+        r"""
+        This test checks that the temporary file is removed on closing.
+        """
+        register = MappedVector(3)
+        path = register.path
+        self.assertTrue(os.path.exists(path))
+        register.close()
+        self.assertFalse(os.path.exists(path))
+
+
+class TestMappedCircuit(unittest.TestCase):
+    r"""
+    This class checks that a `Circuit` with the memory mapped backend gives the
+    same search as one held in memory.
+    """
+
+    def setUp(self):
+        self.budget = mapped.ramBudget
+        mapped.ramBudget = 2 * 16 * 8
+
+    def tearDown(self):
+        mapped.ramBudget = self.budget
+
+    def test_matches_dense(self):
+        r"""
+        This test checks the final state, recorded projections and measurement
+        with both engines.
+        """
+        for engine in ["matrix-free", "operator"]:
+            reference = Circuit(7)
+            reference.h()
+            expected = reference.grover(100, engine=engine, record=True)
+
+            circuit = Circuit(7, backend="memmap")
+            circuit.h()
+            projections = circuit.grover(100, engine=engine, record=True)
+
+            self.assertTrue(circuit.register.equal(reference.register))
+            self.assertTrue(numpy.allclose(projections, expected))
+            circuit.register.close()
+
+    def test_operator_engine_builds_no_reflection(self):
+        r"""
+        This test checks that the operator engine reflects a mapped register
+        without building the full reflection operator.
+        """
+        circuit = Circuit(7, backend="memmap")
+        circuit.gates.reflection = lambda: self.fail("The reflection was built.")
+        circuit.h()
+        circuit.grover(100, engine="operator")
+        circuit.register.close()
@@ -0,0 +1,94 @@
+"""
+Optimizer Test Suite
+##############################
+
+This module tests the fusion and cancellation pass included in the optimizer module.
+"""
+
+import unittest
+import numpy
+from contextlib import redirect_stdout
+from io import StringIO
+from qc import Circuit
+from utils.gate import Gate
+from utils.optimizer import optimize
+from utils.program import Instruction, Program
+
+x = [[0, 1], [1, 0]]
+t = numpy.diag([1, numpy.exp(1j * numpy.pi / 4)])
+cz = numpy.diag([1, 1, 1, -1])
+
+
+class TestOptimize(unittest.TestCase):
+    r"""
+    This class checks each rewrite of the pass on a short program.
+    """
+
+    def gate(self, matrix, qubits):
+        return Instruction("gate", qubits, matrix=numpy.asarray(matrix))
+
+    def test_merge(self):
+        r"""
+        This test checks that gates on one qubit merge past gates on other qubits,
+        but not past a gate on the same qubit.
+        """
+        program = Program(3, [
+            self.gate(t, [1]), self.gate(x, [0]), self.gate(t, [1]),
+            self.gate(x, [2]), self.gate(cz, [1, 2]), self.gate(x, [1]),
+        ])
+        optimized, report = optimize(program)
+        self.assertEqual([i.qubits for i in optimized], [(1,), (0,), (2,), (1, 2), (1,)])
+        self.assertTrue(numpy.allclose(optimized[0].params["matrix"], t @ t))
+        self.assertEqual(report["launches"], 1)
+        self.assertEqual(report["instructions"], 1)
+
+    def test_cancel(self):
+        r"""
+        This test checks that gates which cancel are dropped, and that a
+        cancellation can uncover another.
+        """
+        h = Instruction("h", range(2))
+        program = Program(2, [
+            self.gate(x, [0]), self.gate(cz, [0, 1]), self.gate(cz, [0, 1]),
+            h, h, self.gate(x, [0]),
+        ])
+        optimized, report = optimize(program)
+        self.assertEqual(len(optimized), 0)
+        self.assertEqual(report["after"], {"launches": 0, "flops": 0})
+        self.assertEqual(report["flops"], program.flops())
+
+    def test_fold(self):
+        r"""
+        This test checks that adjacent diagonal gates fold into one on the
+        qubits of both, up to the limit on its size.
+        """
+        z = numpy.diag([1, -1])
+        program = Program(3, [self.gate(z, [2]), self.gate(cz, [0, 1])])
+        optimized, report = optimize(program)
+        self.assertEqual(optimized[0].qubits, (2, 0, 1))
+        expected = Gate(cz, [0, 1]).apply(Gate(z, [2]).apply(numpy.arange(8.0)))
+        folded = Gate(optimized[0].params["matrix"], optimized[0].qubits)
+        self.assertTrue(numpy.allclose(folded.apply(numpy.arange(8.0)), expected))
+        self.assertEqual(report["launches"], 1)
+
+    def test_search(self):
+        r"""
+        This test checks that a search with the operator engine is rewritten to
+        fuse its diffusion, and that an optimized circuit ends in the same state.
+        """
+        circuits = [Circuit(5, "dense", deferred=True) for _ in range(2)]
+        for circuit in circuits:
+            circuit.apply(Gate(x, [0]), Gate(t, [1]), Gate(t, [1]), Gate(x, [0]))
+            circuit.h()
+            circuit.grover(9, engine="operator")
+
+        report = circuits[1].optimize()
+        iterations = circuits[1].iterations()
+        self.assertEqual(circuits[1].program[-1].params["engine"], "matrix-free")
+        self.assertEqual(report["launches"], 3 + 3 * iterations)
+        self.assertGreater(report["flops"], 0)
+
+        with redirect_stdout(StringIO()):
+            for circuit in circuits:
+                circuit.run()
+        self.assertTrue(circuits[1].register.equal(circuits[0].register))
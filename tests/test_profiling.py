@@ -0,0 +1,104 @@
+"""
+Profiling Test Suite
+##############################
+
+This module tests the opt-in instrumentation included in the profiling module.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from qc import Circuit
+from gates import Gate
+from utils.profiling import Profiler
+from utils.tensor import Operator, Vector
+
+
+class TestProfiler(unittest.TestCase):
+    r"""
+    This class checks that a profiler records the instrumented calls while it
+    runs and leaves the methods untouched otherwise.
+    """
+
+    def test_restores_methods(self):
+        r"""
+        This test checks that every method is replaced only while the profiler
+        runs, and that only one profiler may run at a time.
+        """
+        originals = (Circuit.h, Circuit.grover, Operator.tensor, Operator.__mul__, Vector.apply)
+        with Profiler():
+            self.assertIsNot(Vector.apply, originals[-1])
+            with self.assertRaises(RuntimeError):
+                Profiler().start()
+        self.assertEqual(
+            (Circuit.h, Circuit.grover, Operator.tensor, Operator.__mul__, Vector.apply),
+            originals,
+        )
+
+    def test_records_calls(self):
+        r"""
+        This test checks the name, shapes and operations recorded for each call,
+        and that the results of the calls are unchanged.
+        """
+        h = Gate(1, backend="dense").h()
+        with Profiler() as profiler:
+            product = h * h
+            vector = Vector([1, 0]).apply(product)
+            h.tensor(h)
+        self.assertTrue(vector.equal(Vector([1, 0])))
+
+        names = [event["name"] for event in profiler.events]
+        self.assertEqual(names, ["Operator.__mul__", "Vector.apply", "Operator.tensor"])
+        self.assertEqual(profiler.events[0]["flops"], 2 * 4 * 2)
+        self.assertEqual(profiler.events[1]["shapes"], [[2], [2, 2]])
+        self.assertEqual(profiler.totals()["Vector.apply"]["calls"], 1)
+
+    def test_memory_of_other_threads(self):
+        r"""
+        This test checks that bytes are counted only for calls on the thread
+        which started the profiler, and that the total of a method is the most
+        any one call allocated.
+        """
+        h = Gate(6, diagonal=False, backend="dense").h() ** 6
+        with Profiler() as profiler:
+            worker = threading.Thread(target=lambda: Vector([1] + [0] * 63).apply(h))
+            worker.start()
+            worker.join()
+            Vector([1] + [0] * 63).apply(h)
+            Vector([1, 0]).apply(Gate(1).h())
+
+        applied = [event for event in profiler.events if event["name"] == "Vector.apply"]
+        self.assertEqual(applied[0]["bytes"], 0)
+        self.assertGreater(applied[1]["bytes"], 0)
+        self.assertEqual(
+            profiler.totals()["Vector.apply"]["bytes"],
+            max(event["bytes"] for event in applied),
+        )
+
+    def test_trace(self):
+        r"""
+        This test checks that a search is written as complete trace events, with
+        the calls made within the search nested inside it.
+        """
+        with Profiler(memory=False) as profiler, redirect_stdout(StringIO()):
+            circuit = Circuit(4, "dense")
+            circuit.h()
+            circuit.grover(3, engine="operator")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = profiler.trace(os.path.join(directory, "trace.json"))
+            with open(path) as file:
+                events = json.load(file)["traceEvents"]
+
+        search = next(event for event in events if event["name"] == "Circuit.grover")
+        inner = [event for event in events if event["name"] == "Vector.applyInPlace"]
+        self.assertEqual(search["ph"], "X")
+        self.assertTrue(inner)
+        for event in inner:
+            self.assertGreaterEqual(event["ts"], search["ts"])
+            self.assertLessEqual(event["ts"] + event["dur"], search["ts"] + search["dur"])
+        self.assertIn("Circuit.grover", profiler.summary())
@@ -0,0 +1,257 @@
+"""
+Circuit Test Suite
+##############################
+
+This module tests the `Circuit` class included in the qc module.
+"""
+
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+import numpy
+from gates import Gate
+from qc import Circuit
+from utils.gate import Gate as LocalGate
+from utils.program import Instruction
+from utils.state_vector import makeStateVector
+
+
+class TestGrover(unittest.TestCase):
+    r"""
+    This class aims to provide end to end testing of Grover's
+    algorithm as run by the `Circuit` class.
+
+    The purpose of each test and the method by which it
+    is validated is outlined below.
+    """
+
+    def test_matrix_free_matches_operator(self):
+        r"""
+        This test checks that the matrix-free engine leaves the register in
+        the same state as the reference engine which builds the full Grover
+        operator, for a range of register sizes and targets.
+        """
+        for size in range(1, 7):
+            for target in [0, 2**size - 1, (2**size) // 3]:
+                reference = Circuit(size)
+                reference.h()
+                reference.grover(target, engine="operator")
+
+                circuit = Circuit(size)
+                circuit.h()
+                circuit.grover(target)
+
+                self.assertTrue(circuit.register.equal(reference.register))
+
+    def test_matrix_free_preserves_initial_state(self):
+        r"""
+        This test checks that the matrix-free engine does not overwrite the
+        initial state of the circuit when it updates the register in place.
+        """
+        circuit = Circuit(3)
+        before = circuit.initial.amplitudes().copy()
+        circuit.grover(5)
+        self.assertTrue((circuit.initial.amplitudes() == before).all())
+
+    def test_record_projections(self):
+        r"""
+        This test checks that recording returns one row of projections per
+        iteration, ending with the amplitude of the target.
+        """
+        circuit = Circuit(4)
+        circuit.h()
+        projections = circuit.grover(6, record=True)
+        self.assertEqual(projections.shape, (circuit.iterations(), 2))
+        self.assertAlmostEqual(
+            projections[-1, 1], circuit.register.measure(makeStateVector(6, 4))
+        )
+
+    def test_unknown_engine(self):
+        r"""
+        This test checks that an unknown engine is rejected.
+        """
+        circuit = Circuit(2)
+        with self.assertRaises(ValueError):
+            circuit.grover(1, engine="quantum")
+
+
+class TestGateSequence(unittest.TestCase):
+    r"""
+    This class checks that `Circuit.apply` runs a sequence of gates acting on
+    chosen qubits.
+    """
+
+    def test_sequence_matches_hadamard(self):
+        r"""
+        This test checks that a Hadamard on each qubit in turn gives the same
+        state as `Circuit.h`.
+        """
+        reference = Circuit(4)
+        reference.h()
+
+        circuit = Circuit(4)
+        h = Gate(1).h()
+        circuit.apply(*[LocalGate(h, [q]) for q in range(4)])
+
+        self.assertTrue(circuit.register.equal(reference.register))
+
+    def test_controlled_not(self):
+        r"""
+        This test checks that flipping qubit 2 and then applying a controlled
+        not from qubit 2 onto qubit 0 gives the state :math:`|101\rangle`.
+        """
+        circuit = Circuit(3)
+        x = [0, 1, 1, 0]
+        cnot = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0]
+        circuit.apply(LocalGate(x, [2]), LocalGate(cnot, [0, 2]))
+        self.assertTrue(circuit.register.equal(makeStateVector(5, 3)))
+
+
+class TestBackend(unittest.TestCase):
+    r"""
+    This class checks that a `Circuit` runs with each backend.
+    """
+
+    def test_backends_agree(self):
+        r"""
+        This test checks that the dense, sparse and automatic backends leave
+        the register in the same state with both Grover engines, so that the
+        backends can be compared side by side in one process.
+        """
+        reference = Circuit(5, backend="dense")
+        reference.h()
+        reference.grover(7)
+
+        for backend in ["dense", "sparse", "auto"]:
+            for engine in ["matrix-free", "operator"]:
+                circuit = Circuit(5, backend=backend)
+                circuit.h()
+                circuit.grover(7, engine=engine)
+                self.assertEqual(circuit.register.backend, backend)
+                self.assertTrue(circuit.register.equal(reference.register))
+
+    def test_unknown_backend(self):
+        r"""
+        This test checks that an unknown backend is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Circuit(2, backend="quantum")
+
+    def test_precision(self):
+        r"""
+        This test checks that the register keeps the precision of the circuit
+        through both engines and still finds the target.
+        """
+        for dtype in ["complex64", "float32"]:
+            for engine in ["matrix-free", "operator"]:
+                circuit = Circuit(5, dtype=dtype)
+                circuit.h()
+                circuit.grover(7, engine=engine)
+                self.assertEqual(circuit.register.amplitudes().dtype, dtype)
+                self.assertGreater(abs(circuit.register.amplitudes()[7]) ** 2, 0.99)
+
+
+class TestGroverBatch(unittest.TestCase):
+    r"""
+    This class checks that many searches run together give the same result as
+    running them one at a time.
+    """
+
+    def test_batch_matches_single_searches(self):
+        r"""
+        This test checks the probability returned for each target, including
+        repeated targets, against `Circuit.grover` followed by a projection.
+        """
+        targets = [0, 5, 31, 5, 17]
+        batch = Circuit(5)
+        batch.h()
+        probabilities = batch.grover_batch(targets)
+
+        self.assertEqual(probabilities.shape, (5,))
+        for target, probability in zip(targets, probabilities):
+            circuit = Circuit(5)
+            circuit.h()
+            circuit.grover(target)
+            expected = circuit.register.measure(makeStateVector(target, 5)) ** 2
+            self.assertAlmostEqual(probability, expected)
+
+    def test_batch_leaves_register(self):
+        r"""
+        This test checks that the register is not changed by a batch.
+        """
+        circuit = Circuit(4)
+        circuit.h()
+        before = circuit.register.amplitudes().copy()
+        circuit.grover_batch(range(16))
+        self.assertTrue((circuit.register.amplitudes() == before).all())
+
+
+class TestDeferred(unittest.TestCase):
+    r"""
+    This class checks that a deferred circuit records its operations and runs
+    them only when a result is asked for.
+    """
+
+    def test_records_until_run(self):
+        r"""
+        This test checks that the register is untouched until the program runs,
+        and that it then ends in the same state as a circuit run eagerly.
+        """
+        x = [[0, 1], [1, 0]]
+        circuits = [Circuit(4, "dense"), Circuit(4, "dense", deferred=True)]
+        for circuit in circuits:
+            circuit.apply(LocalGate(x, [3]), LocalGate(x, [0]))
+            circuit.h()
+            with redirect_stdout(StringIO()):
+                circuit.grover(6, record=True)
+
+        eager, deferred = circuits
+        self.assertEqual(len(eager.program), 0)
+        self.assertEqual(
+            [instruction.name for instruction in deferred.program],
+            ["gate", "gate", "h", "grover"],
+        )
+        self.assertTrue(deferred.register.equal(deferred.initial))
+
+        with redirect_stdout(StringIO()):
+            probabilities = deferred.probabilities()
+        self.assertEqual(len(deferred.program), 0)
+        self.assertTrue(deferred.register.equal(eager.register))
+        self.assertTrue(numpy.allclose(probabilities, eager.probabilities()))
+        self.assertTrue(
+            numpy.allclose(deferred.trajectory.projections, eager.trajectory.projections)
+        )
+
+    def test_recorded_iterations(self):
+        r"""
+        This test checks that a search runs the number of iterations its
+        instruction records.
+        """
+        circuit = Circuit(4, deferred=True)
+        circuit.h()
+        circuit.program.append(
+            Instruction(
+                "grover", range(4), target=3, plot=False, engine="matrix-free",
+                record=True, iterations=1,
+            )
+        )
+        with redirect_stdout(StringIO()):
+            projections = circuit.run()
+        self.assertEqual(projections.shape, (1, 2))
+
+    def test_estimates(self):
+        r"""
+        This test checks the kernel launches and operations estimated for a
+        program before it runs.
+        """
+        circuit = Circuit(4, deferred=True)
+        circuit.h()
+        circuit.apply(LocalGate([1, 0, 0, -1], [2]))
+        circuit.grover(3, engine="operator")
+        iterations = circuit.iterations()
+        self.assertEqual(circuit.program.launches(), 2 + 4 * iterations)
+        self.assertEqual(circuit.program[1].flops(4), 16)
+        self.assertEqual(
+            circuit.program.flops(),
+            (1 + 2 * iterations) * (3 * 4 * 16 // 2 + 16) + 16 + iterations * 2 * 16,
+        )
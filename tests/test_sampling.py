@@ -0,0 +1,109 @@
+"""
+Sampling Test Suite
+##############################
+
+This module tests the sampling module and `Circuit.sample`.
+"""
+
+import unittest
+import numpy
+from qc import Circuit
+from utils import mapped, sampling
+from utils.symmetric import SymmetricVector
+
+
+class TestSampling(unittest.TestCase):
+    r"""
+    This class checks the draws, counts and random streams of the sampling
+    module.
+    """
+
+    def test_draw_frequencies(self):
+        r"""
+        This test checks that the frequency of each outcome is close to its
+        probability, and that outcomes of no probability are never drawn.
+        """
+        probabilities = numpy.array([0.5, 0, 0.25, 0.125, 0.125, 0])
+        outcomes = sampling.draw(probabilities, 100000, sampling.generator(1))
+        frequencies = numpy.bincount(outcomes, minlength=6) / 100000
+        self.assertTrue(numpy.allclose(frequencies, probabilities, atol=0.01))
+        self.assertEqual(frequencies[1], 0)
+        self.assertEqual(frequencies[5], 0)
+
+    def test_streams(self):
+        r"""
+        This test checks that a seed gives the same counts every time and that
+        streams spawned from one seed differ.
+        """
+        probabilities = numpy.full(64, 1 / 64)
+        first, second = sampling.generators(7, 2)
+        again, _ = sampling.generators(7, 2)
+
+        outcomes = sampling.draw(probabilities, 1000, first)
+        self.assertTrue((outcomes == sampling.draw(probabilities, 1000, again)).all())
+        self.assertFalse((outcomes == sampling.draw(probabilities, 1000, second)).all())
+
+    def test_keys(self):
+        r"""
+        This test checks counts keyed by bit strings, with qubit 0 last, and by
+        integers.
+        """
+        outcomes = numpy.array([5, 1, 5])
+        self.assertEqual(sampling.counts(outcomes, 3), {"001": 1, "101": 2})
+        self.assertEqual(sampling.counts(outcomes, 3, "int"), {1: 1, 5: 2})
+        with self.assertRaises(ValueError):
+            sampling.counts(outcomes, 3, "hex")
+
+
+class TestCircuitSample(unittest.TestCase):
+    r"""
+    This class checks that `Circuit.sample` follows the probabilities of the
+    register, however the register is held.
+    """
+
+    def test_registers_agree(self):
+        r"""
+        This test checks the counts of full, symmetric and memory mapped
+        registers against the probabilities of their amplitudes.
+        """
+        budget = mapped.ramBudget
+        mapped.ramBudget = 2 * 8 * 8
+        try:
+            for options in [{}, {"symmetric": True}, {"backend": "memmap"}]:
+                circuit = Circuit(6, **options)
+                circuit.h()
+                circuit.grover(list(range(0, 64, 3)))
+
+                expected = numpy.abs(circuit.register.amplitudes()) ** 2
+                counts = circuit.sample(200000, seed=3, keys="int")
+                found = numpy.zeros(64)
+                found[list(counts)] = list(counts.values())
+                self.assertEqual(found.sum(), 200000)
+                self.assertTrue(numpy.allclose(found / 200000, expected, atol=0.01))
+                if options.get("backend") == "memmap":
+                    circuit.register.close()
+        finally:
+            mapped.ramBudget = budget
+
+    def test_seeded_grover(self):
+        r"""
+        This test checks that a search measured with a seed gives the same
+        counts twice, nearly all on the target.
+        """
+        circuit = Circuit(6)
+        circuit.h()
+        circuit.grover(9)
+        counts = circuit.sample(1000, seed=11)
+        self.assertEqual(counts, circuit.sample(1000, seed=11))
+        self.assertGreater(counts["001001"], 980)
+
+    def test_unlisted_states(self):
+        r"""
+        This test checks that a symmetric register draws states in no class,
+        skipping those which are listed.
+        """
+        state = SymmetricVector(4, [[0, 3, 4, 15]], [0], 1 / numpy.sqrt(12))
+        outcomes = state.sample(50000, sampling.generator(5))
+        frequencies = numpy.bincount(outcomes, minlength=16) / 50000
+        expected = numpy.abs(state.amplitudes()) ** 2
+        self.assertTrue(numpy.allclose(frequencies, expected, atol=0.01))
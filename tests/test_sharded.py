@@ -0,0 +1,127 @@
+"""
+Sharded Vector Test Suite
+##############################
+
+This module tests the `ShardedVector` class included in the sharded module.
+"""
+
+import unittest
+import numpy
+from qc import Circuit
+from utils import sharded
+from utils.gate import Gate
+from utils.kernels import invertAboutMean, phaseFlip, walshHadamard
+from utils.sharded import ShardedVector
+from utils.tensor import Vector
+
+
+class TestShardedVector(unittest.TestCase):
+    r"""
+    This class checks each operation on a `ShardedVector`, split into eight
+    shards of 32 amplitudes between two workers, against the same operation on
+    an array in memory.
+    """
+
+    def setUp(self):
+        self.register = ShardedVector(8, shards=8, processes=2)
+        self.expected = numpy.zeros(2**8)
+        self.expected[0] = 1
+
+    def tearDown(self):
+        self.register.close()
+
+    def test_shards(self):
+        r"""
+        This test checks the size of the shards and that their number must be a
+        power of two.
+        """
+        self.assertEqual(self.register.shardBits, 5)
+        self.assertEqual(len(self.register.shards), 8)
+        with self.assertRaises(ValueError):
+            ShardedVector(3, shards=3, processes=1)
+
+    def test_grover_steps(self):
+        r"""
+        This test checks the Hadamard layer, oracle, diffusion and reflection.
+        """
+        self.register.h()
+        walshHadamard(self.expected)
+        self.assertTrue(numpy.allclose(self.register.amplitudes(), self.expected))
+
+        self.register.phaseFlip([3, 200]).invertAboutMean()
+        invertAboutMean(phaseFlip(self.expected, [3, 200]))
+        self.assertTrue(numpy.allclose(self.register.amplitudes(), self.expected))
+
+        self.register.reflect()
+        self.expected[1:] *= -1
+        self.assertTrue(self.register.equal(Vector(self.expected)))
+        self.assertTrue(numpy.allclose(self.register.at([0, 200]), self.expected[[0, 200]]))
+
+    def test_gates_on_high_qubits(self):
+        r"""
+        This test checks gates within a shard, between shards and on both.
+        """
+        self.register.h()
+        walshHadamard(self.expected)
+        self.register.phaseFlip(77)
+        phaseFlip(self.expected, 77)
+
+        cnot = [1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0]
+        for qubits in [[0, 1], [0, 7], [7, 2], [6, 5]]:
+            gate = Gate(cnot, qubits)
+            self.register.apply(gate)
+            self.expected = gate.apply(self.expected)
+            self.assertTrue(numpy.allclose(self.register.amplitudes(), self.expected))
+
+    def test_phase_needs_complex(self):
+        r"""
+        This test checks that a phase gate is rejected by a real register rather
+        than losing its phase, and matches the dense backend on a complex one.
+        """
+        s = [[1, 0], [0, 1j]]
+        with self.assertRaises(ValueError):
+            self.register.apply(Gate(s, [7]))
+
+        reference = Circuit(8, "dense")
+        circuit = Circuit(8, "sharded", dtype="complex128")
+        for each in [reference, circuit]:
+            each.h()
+            each.apply(Gate(s, [7]), Gate(s, [2]))
+        self.assertTrue(circuit.register.equal(reference.register))
+        self.assertAlmostEqual(circuit.register.at(128)[0], 1j / 16)
+        circuit.register.close()
+
+
+class TestShardedCircuit(unittest.TestCase):
+    r"""
+    This class checks that a `Circuit` with the sharded backend gives the same
+    search as one held in memory.
+    """
+
+    def setUp(self):
+        self.workers = sharded.workers
+        sharded.workers = 4
+
+    def tearDown(self):
+        sharded.workers = self.workers
+
+    def test_matches_dense(self):
+        r"""
+        This test checks the final state, recorded projections and samples with
+        both engines.
+        """
+        for engine in ["matrix-free", "operator"]:
+            reference = Circuit(7)
+            reference.h()
+            expected = reference.grover(100, engine=engine, record=True)
+
+            circuit = Circuit(7, backend="sharded")
+            circuit.h()
+            projections = circuit.grover(100, engine=engine, record=True)
+
+            self.assertTrue(circuit.register.equal(reference.register))
+            self.assertTrue(numpy.allclose(projections, expected))
+            counts = circuit.sample(50, seed=3)
+            self.assertEqual(sum(counts.values()), 50)
+            self.assertEqual(max(counts, key=counts.get), format(100, "07b"))
+            circuit.register.close()
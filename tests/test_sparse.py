@@ -0,0 +1,80 @@
+"""
+Sparse Matrix Test Suite
+##############################
+
+This module tests the `sparseMatrix` backend against the `denseMatrix` backend.
+"""
+
+import unittest
+
+from scipy.sparse import csr_array, dia_array
+
+from utils.denseMatrix import denseMatrix
+from utils.diagonalMatrix import diagonalMatrix
+from utils.sparseMatrix import sparseMatrix
+from utils.tensor import Operator, Vector
+
+
+class TestSparseMatrix(unittest.TestCase):
+    r"""
+    This class checks that the sparse backend keeps its matrices sparse and
+    agrees with the dense backend.
+
+    The purpose of each test and the method by which it
+    is validated is outlined below.
+    """
+
+    def test_update_stays_sparse(self):
+        r"""
+        This test checks that patching the oracle into a sparse identity keeps
+        the CSR form and only the diagonal stored, and matches the dense oracle.
+        """
+        sparse = (Operator(2, sparseMatrix(2, [1, 0, 0, 1])) ** 4).update(3, 3, -1)
+        dense = (Operator(2, denseMatrix(2, [1, 0, 0, 1])) ** 4).update(3, 3, -1)
+
+        self.assertIsInstance(sparse.matrix.matrix, csr_array)
+        self.assertEqual(sparse.matrix.matrix.nnz, 16)
+        self.assertTrue(sparse.equal(dense))
+
+    def test_diagonal_update_in_place(self):
+        r"""
+        This test checks that a DIA matrix is updated on its diagonal without
+        leaving the DIA format, and converts to CSR for any other element.
+        """
+        matrix = sparseMatrix(4, dia_array(([[1, 1, 1, 1]], [0]), shape=(4, 4)))
+        matrix.update(2, 2, -1)
+        self.assertIsInstance(matrix.matrix, dia_array)
+        self.assertTrue(matrix.equal(diagonalMatrix(4, [1, 1, -1, 1])))
+
+        matrix.update(0, 3, 5)
+        self.assertIsInstance(matrix.matrix, csr_array)
+        self.assertEqual(matrix.flat()[3], 5)
+
+    def test_equal_detects_difference(self):
+        r"""
+        This test checks that the sparse comparison spots a single changed
+        element and a change of shape.
+        """
+        identity = [1.0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+        a = sparseMatrix(4, identity)
+        b = sparseMatrix(4, identity)
+        self.assertTrue(a.equal(b))
+        b.update(1, 2, 1e-3)
+        self.assertFalse(a.equal(b))
+        self.assertFalse(a.equal(sparseMatrix(2, [1, 0, 0, 1])))
+
+    def test_apply_matches_dense(self):
+        r"""
+        This test checks that applying a lazy sparse tensor product and a
+        diagonal gate to a sparse vector gives the dense result.
+        """
+        h = [2**-0.5, 2**-0.5, 2**-0.5, -(2**-0.5)]
+        oracle = Operator(8, diagonalMatrix(8, [1, 1, 1, 1, 1, -1, 1, 1]))
+
+        sparse = Vector(sparseMatrix(8, [1, 0, 0, 0, 0, 0, 0, 0], True))
+        sparse = sparse.apply(Operator(2, sparseMatrix(2, h)) ** 3).apply(oracle)
+        dense = Vector(denseMatrix(8, [1, 0, 0, 0, 0, 0, 0, 0], True))
+        dense = dense.apply(Operator(2, denseMatrix(2, h)) ** 3).apply(oracle)
+
+        self.assertIsInstance(sparse.vector, sparseMatrix)
+        self.assertTrue(sparse.vector.equal(dense.vector))
@@ -0,0 +1,84 @@
+"""
+State Vector Test Suite
+##############################
+
+This module tests the basis state constructors included in the state_vector module.
+"""
+
+import unittest
+import numpy
+from scipy.sparse import csr_array
+from utils.denseMatrix import denseMatrix
+from utils.sparseMatrix import sparseMatrix
+from utils.state_vector import basisState, basisStates, makeStateVector
+from utils.tensor import Vector
+
+
+class TestBasisState(unittest.TestCase):
+    r"""
+    This class checks that basis states built directly match the tensor
+    product of one vector per binary digit which they replace.
+    """
+
+    def test_matches_tensor_product(self):
+        r"""
+        This test checks every state of three qubits with each backend.
+        """
+        for value in range(8):
+            bits = format(value, "03b")
+            expected = Vector(int(bits[0]))
+            for bit in bits[1:]:
+                expected = expected.tensor(Vector(int(bit)))
+
+            for backend in ["dense", "sparse", "auto"]:
+                state = makeStateVector(value, 3, backend)
+                self.assertTrue(state.equal(expected))
+                self.assertEqual(state.state, value)
+
+    def test_storage(self):
+        r"""
+        This test checks that a sparse basis state stores a single element and
+        that ``"auto"`` stores a large one sparsely.
+        """
+        self.assertIsInstance(basisState(3, 4, "dense").vector, denseMatrix)
+        self.assertEqual(basisState(3, 20, "sparse").vector.matrix.nnz, 1)
+        self.assertIsInstance(basisState(3, 20, "auto").vector, sparseMatrix)
+        self.assertEqual(basisState(1, 3, dtype="complex64").amplitudes().dtype, "complex64")
+
+    def test_size(self):
+        r"""
+        This test checks that the size is inferred from the binary representation
+        of the state when it is not given, and that a state which does not fit is
+        rejected.
+        """
+        self.assertEqual(makeStateVector(6).amplitudes().shape, (8,))
+        self.assertEqual(makeStateVector(0).amplitudes().shape, (2,))
+        with self.assertRaises(ValueError):
+            makeStateVector(8, 3)
+
+    def test_batch(self):
+        r"""
+        This test checks that each column of a batch is the basis state of its
+        value, stored densely or sparsely.
+        """
+        values = [5, 0, 5, 7]
+        dense = basisStates(values, 3, "dense")
+        sparse = basisStates(values, 3, "sparse")
+        self.assertIsInstance(sparse, csr_array)
+        self.assertEqual(sparse.nnz, 4)
+        for column, value in enumerate(values):
+            expected = basisState(value, 3).amplitudes()
+            self.assertTrue((dense[:, column] == expected).all())
+            self.assertTrue((sparse.toarray()[:, column] == expected).all())
+
+    def test_projection(self):
+        r"""
+        This test checks that projecting onto a basis state reads its amplitude,
+        and that the shortcut is dropped once the basis state is changed.
+        """
+        register = Vector(numpy.arange(8) / 10, "sparse")
+        self.assertAlmostEqual(register.measure(basisState(6, 3)), 0.6)
+
+        state = basisState(6, 3).scale(2)
+        self.assertIsNone(state.state)
+        self.assertAlmostEqual(register.measure(state), 1.2)
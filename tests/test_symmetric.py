@@ -0,0 +1,104 @@
+"""
+Symmetric Vector Test Suite
+##############################
+
+This module tests the `SymmetricVector` class included in the symmetric module.
+"""
+
+import unittest
+import numpy
+from qc import Circuit
+from utils.kernels import invertAboutMean, phaseFlip, walshHadamard
+from utils.symmetric import SymmetricVector
+from utils.tensor import Vector
+
+
+class TestSymmetricVector(unittest.TestCase):
+    r"""
+    This class checks each operation on a `SymmetricVector` against the same
+    operation on the full array of amplitudes.
+    """
+
+    def test_grover_steps(self):
+        r"""
+        This test checks the Hadamard layer, oracle, diffusion and reflection
+        step by step, and that the state stays symmetric throughout.
+        """
+        marked = [1, 6, 12]
+        state = SymmetricVector.basis(4, 0)
+        full = state.amplitudes()
+
+        state = state.h()
+        full = walshHadamard(full)
+        self.assertIsInstance(state, SymmetricVector)
+        self.assertTrue(numpy.allclose(state.amplitudes(), full))
+
+        for _ in range(2):
+            state = state.phaseFlip(marked).invertAboutMean()
+            full = invertAboutMean(phaseFlip(full, marked))
+            self.assertIsInstance(state, SymmetricVector)
+            self.assertTrue(numpy.allclose(state.amplitudes(), full))
+
+        reflected = full.copy()
+        reflected[1:] *= -1
+        self.assertTrue(numpy.allclose(state.reflect().amplitudes(), reflected))
+
+    def test_broken_symmetry(self):
+        r"""
+        This test checks that a Hadamard layer which breaks the symmetry
+        returns the equivalent full `Vector`.
+        """
+        state = SymmetricVector.basis(3, 0).h().phaseFlip(5)
+        full = state.amplitudes()
+        result = state.h()
+        self.assertIsInstance(result, Vector)
+        self.assertTrue(numpy.allclose(result.amplitudes(), walshHadamard(full)))
+
+    def test_measure(self):
+        r"""
+        This test checks projections between two symmetric states and between
+        a symmetric state and a full `Vector`.
+        """
+        state = SymmetricVector.basis(5, 0).h().phaseFlip([3, 9])
+        basis = SymmetricVector.basis(5, [9, 20])
+        expected = numpy.dot(basis.amplitudes(), state.amplitudes())
+        self.assertAlmostEqual(state.measure(basis), expected)
+        self.assertAlmostEqual(state.measure(basis.toVector()), expected)
+
+
+class TestSymmetricCircuit(unittest.TestCase):
+    r"""
+    This class checks that a symmetric `Circuit` gives the same search as a
+    full one.
+    """
+
+    def test_matches_full_register(self):
+        r"""
+        This test checks the final state and recorded projections of both
+        engines, for one and for several targets.
+        """
+        for engine in ["matrix-free", "operator"]:
+            for target in [3, [0, 5, 9]]:
+                reference = Circuit(6)
+                reference.h()
+                expected = reference.grover(target, engine=engine, record=True)
+
+                circuit = Circuit(6, symmetric=True)
+                circuit.h()
+                projections = circuit.grover(target, engine=engine, record=True)
+
+                self.assertTrue(circuit.register.equal(reference.register))
+                self.assertTrue(numpy.allclose(projections, expected))
+
+    def test_large_register(self):
+        r"""
+        This test checks that a multi-marked search on a register too large to
+        hold in full finds one of the marked states.
+        """
+        marked = list(range(0, 2**16, 3))
+        circuit = Circuit(36, symmetric=True)
+        circuit.h()
+        circuit.grover(marked)
+        state = SymmetricVector.basis(36, marked)
+        self.assertIsInstance(circuit.register, SymmetricVector)
+        self.assertGreater(abs(circuit.register.measure(state)) ** 2, 0.99)
@@ -6,8 +6,12 @@ This module tests the classes included in the tensor module.
 """
 
 import unittest
+import numpy
 from gates import Gate
 from utils.state_vector import makeStateVector
+from utils.denseMatrix import denseMatrix
+from utils.kronMatrix import kronMatrix
+from utils.sparseMatrix import sparseMatrix
 from utils.tensor import Operator, Vector
 
 
@@ -63,6 +67,31 @@ class TestVector(unittest.TestCase):
         self.assertTrue(v3.equal(v1.tensor(v2)))
         # self.assertTrue(numpy.array_equal(v1.tensor(v2).vector, v3.vector))
 
+    def test_changed_basis_state(self):
+        r"""
+        This test checks that a basis state changed in place by a sum,
+        difference, tensor product or power is measured against in full rather
+        than by reading the amplitude of the state it started as.
+        """
+        register = Vector(numpy.arange(4) / 10, "dense")
+        for backend in ["dense", "sparse"]:
+            summed = makeStateVector(0, 2, backend) + makeStateVector(1, 2, backend)
+            self.assertIsNone(summed.state)
+            self.assertAlmostEqual(register.measure(summed), 0.1)
+
+            difference = makeStateVector(2, 2, backend) - makeStateVector(1, 2, backend)
+            self.assertAlmostEqual(register.measure(difference), 0.1)
+
+            tensored = makeStateVector(1, 1, backend).tensor(Vector([1, 1], backend))
+            self.assertAlmostEqual(register.measure(tensored), 0.5)
+
+            power = makeStateVector(1, 1, backend) ** 2
+            self.assertIsNone(power.state)
+            amplitudes = numpy.arange(power.amplitudes().shape[0]) / 10
+            self.assertAlmostEqual(
+                Vector(amplitudes).measure(power), numpy.dot(power.amplitudes(), amplitudes)
+            )
+
     # def test_vector_addition(self):
     #     v1 = 1 / sqrt(2) * Vector([0, 1])
     #     v2 = 1 / sqrt(2) * Vector([1, 0])
@@ -239,3 +268,160 @@ class TestOperator(unittest.TestCase):
         op.update(0, 0, -1)
         target = Operator(4, [-1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1])
         self.assertTrue(op.equal(target))
+
+    def test_power_is_lazy(self):
+        r"""
+        This test confirms that raising a gate to a power stores one factor
+        per qubit rather than the full matrix, and that applying it to a
+        `Vector` gives the same result as the materialised matrix.
+        """
+        H = Gate(1).h()
+        product = H**10
+        self.assertIsInstance(product.matrix, kronMatrix)
+        self.assertEqual(len(product.matrix.factors), 10)
+        self.assertEqual(product.matrix.size, 1024)
+
+        vector = makeStateVector(5, 10)
+        lazy = vector.apply(product)
+        dense = vector.apply(Operator(1024, product.matrix.materialize()))
+        self.assertTrue(lazy.equal(dense))
+
+    def test_lazy_product_is_independent(self):
+        r"""
+        This test confirms that negating a lazy power negates the product
+        once, and does not change the gate it was built from.
+        """
+        I = Gate(1).i()
+        product = (I**3).negate()
+        self.assertTrue(I.equal(Operator(2, [1, 0, 0, 1])))
+        self.assertTrue(product.equal(Gate(3).i().scale(-1)))
+
+    def test_apply_in_place(self):
+        r"""
+        This test confirms that applying dense, diagonal, lazy and sparse
+        operators in place gives the same vector as `apply`, and that a dense
+        vector swaps between the same two buffers.
+        """
+        gates = Gate(3, backend="dense")
+        operators = [
+            Operator(8, (Gate(1).h() ** 3).matrix.materialize(), "dense"),
+            gates.oracle(5),
+            Gate(1).h() ** 3,
+            Gate(3, diagonal=False, backend="sparse").oracle(2),
+        ]
+
+        expected = Vector([0.5, 0, 0, 0.5, 0, 0.5, 0.5, 0], "dense")
+        vector = Vector([0.5, 0, 0, 0.5, 0, 0.5, 0.5, 0], "dense")
+        for operator in operators:
+            expected = expected.apply(operator)
+            vector.applyInPlace(operator)
+            self.assertTrue(vector.equal(expected))
+
+        vector.applyInPlace(gates.oracle(1))
+        buffers = {id(vector.vector), id(vector._spare)}
+        vector.applyInPlace(gates.oracle(2)).applyInPlace(gates.oracle(3))
+        self.assertEqual({id(vector.vector), id(vector._spare)}, buffers)
+
+
+class TestBackend(unittest.TestCase):
+    r"""
+    This class checks that `Operator` and `Vector` carry their backend, that
+    the ``"auto"`` backend picks a representation per object and that dense
+    and sparse operands can be mixed.
+    """
+
+    def test_auto_backend_choice(self):
+        r"""
+        This test checks that ``"auto"`` stores a large, mostly empty matrix
+        as sparse and a small or full one as dense, including when a lazy
+        identity is built in full to be updated.
+        """
+        self.assertIsInstance(
+            Operator(2, [1, 0, 0, 1], "auto").matrix, denseMatrix
+        )
+        oracle = Gate(7, diagonal=False, backend="auto").oracle(3)
+        self.assertIsInstance(oracle.matrix, sparseMatrix)
+        self.assertIsInstance(Vector([1] * 128, "auto").vector, denseMatrix)
+        self.assertIsInstance(Vector([1] + [0] * 127, "auto").vector, sparseMatrix)
+
+    def test_mixed_backends(self):
+        r"""
+        This test checks that a sparse operator applied to a dense vector gives
+        a dense vector equal to the all dense result, and that dense and sparse
+        operators compare equal.
+        """
+        dense = Gate(3, diagonal=False, backend="dense")
+        sparse = Gate(3, diagonal=False, backend="sparse")
+
+        self.assertTrue(dense.oracle(2).equal(sparse.oracle(2)))
+
+        vector = makeStateVector(2, 3, "dense")
+        result = vector.apply(sparse.oracle(2))
+        self.assertIsInstance(result.vector, denseMatrix)
+        self.assertTrue(result.equal(makeStateVector(2, 3, "sparse").scale(-1)))
+
+    def test_unknown_backend(self):
+        r"""
+        This test checks that an unknown backend is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Operator(2, [1, 0, 0, 1], "quantum")
+
+
+class TestPrecision(unittest.TestCase):
+    r"""
+    This class checks that the precision of an `Operator` or `Vector` is kept
+    through the operations which derive new ones.
+    """
+
+    def test_precision_is_carried(self):
+        r"""
+        This test checks the dtype of tensor products, products, scaling and
+        state vectors built in each precision and backend.
+        """
+        for dtype in ["complex128", "complex64", "float64", "float32"]:
+            for backend in ["dense", "sparse"]:
+                gates = Gate(3, diagonal=False, backend=backend, dtype=dtype)
+                h = gates.h() ** 3
+                self.assertEqual(h.matrix.materialize().matrix.dtype, dtype)
+
+                vector = makeStateVector(5, 3, backend, dtype)
+                self.assertEqual(vector.vector.matrix.dtype, dtype)
+
+                result = vector.apply(gates.oracle(5) * h).scale(2)
+                self.assertEqual(result.vector.matrix.dtype, dtype)
+                expected = makeStateVector(5, 3).apply(
+                    Gate(3, diagonal=False).oracle(5) * Gate(3).h() ** 3
+                )
+                self.assertTrue(result.equal(expected.scale(2)))
+
+    def test_phase_needs_complex(self):
+        r"""
+        This test checks that a phase is kept by a complex precision and
+        rejected by a real one.
+        """
+        phase = Operator(2, [1, 0, 0, 1], dtype="complex64").update(1, 1, 1j)
+        self.assertEqual(phase.matrix.matrix[1][1], 1j)
+        with self.assertRaises(ValueError):
+            Operator(2, [1, 0, 0, 1], dtype="float32").update(1, 1, 1j)
+        with self.assertRaises(ValueError):
+            Vector([1, 0], dtype="float64").scale(1j)
+
+    def test_passed_matrix_is_not_cast(self):
+        r"""
+        This test checks that a matrix passed to an operator in another precision
+        keeps its own, and that a shared matrix is not copied.
+        """
+        for matrix in [denseMatrix(2, [1, 0, 0, -1]), sparseMatrix(2, [1, 0, 0, -1])]:
+            dtype = matrix.matrix.dtype
+            operator = Operator(2, matrix, dtype="complex64")
+            self.assertEqual(operator.matrix.matrix.dtype, numpy.complex64)
+            self.assertEqual(matrix.matrix.dtype, dtype)
+            self.assertIs(operator.share().matrix, operator.matrix)
+
+    def test_unknown_precision(self):
+        r"""
+        This test checks that an unknown precision is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Vector([1, 0], dtype="int8")
@@ -0,0 +1,77 @@
+"""
+Threaded Kernel Test Suite
+##############################
+
+This module tests the chunked kernels included in the threaded module.
+"""
+
+import unittest
+import numpy
+from contextlib import redirect_stdout
+from io import StringIO
+from qc import Circuit
+from utils import threaded
+from utils.gate import Gate
+from utils.kernels import walshHadamard
+
+
+class TestThreadedKernels(unittest.TestCase):
+    r"""
+    This class checks each threaded kernel, with chunks of 32 amplitudes split
+    between three threads, against `Gate.apply` and `utils.kernels`.
+    """
+
+    def setUp(self):
+        self.cache = threaded.cacheBytes
+        threaded.cacheBytes = 32 * 2 * 16
+        random = numpy.random.default_rng(7)
+        self.state = random.normal(size=2**9) + 1j * random.normal(size=2**9)
+        self.matrix = random.normal(size=(2, 2)) + 1j * random.normal(size=(2, 2))
+
+    def tearDown(self):
+        threaded.cacheBytes = self.cache
+
+    def test_single_qubit(self):
+        r"""
+        This test checks a gate on every qubit, within and across chunks.
+        """
+        self.assertEqual(threaded.chunkLength(self.state.itemsize), 32)
+        for qubit in range(9):
+            amplitudes = threaded.applySingle(self.state.copy(), self.matrix, qubit, 3)
+            expected = Gate(self.matrix, [qubit]).apply(self.state)
+            self.assertTrue(numpy.allclose(amplitudes, expected))
+
+    def test_diagonal(self):
+        r"""
+        This test checks a diagonal gate on some of the qubits and a full diagonal.
+        """
+        diagonal = numpy.array([1, -1, 1j, 2])
+        amplitudes = threaded.applyDiagonal(self.state.copy(), diagonal, [8, 2], 3)
+        expected = Gate(numpy.diag(diagonal), [8, 2]).apply(self.state)
+        self.assertTrue(numpy.allclose(amplitudes, expected))
+
+        full = numpy.arange(2**9)
+        amplitudes = threaded.applyDiagonal(self.state.copy(), full, threads=3)
+        self.assertTrue(numpy.allclose(amplitudes, self.state * full))
+
+    def test_walsh_hadamard(self):
+        r"""
+        This test checks the Hadamard layer against the single threaded transform.
+        """
+        amplitudes = threaded.walshHadamard(self.state.copy(), 3)
+        self.assertTrue(numpy.allclose(amplitudes, walshHadamard(self.state.copy())))
+
+    def test_circuit(self):
+        r"""
+        This test checks that a circuit with threads gives the same state as one
+        without, through its gates and both Grover engines.
+        """
+        x = [[0, 1], [1, 0]]
+        for engine in ["matrix-free", "operator"]:
+            circuits = [Circuit(9, "dense"), Circuit(9, "dense", threads=3)]
+            for circuit in circuits:
+                circuit.apply(Gate(x, [7]), Gate(numpy.diag([1, -1, -1, 1]), [0, 8]))
+                circuit.h()
+                with redirect_stdout(StringIO()):
+                    circuit.grover(5, engine=engine)
+            self.assertTrue(circuits[1].register.equal(circuits[0].register))
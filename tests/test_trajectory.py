@@ -0,0 +1,67 @@
+"""
+Trajectory Test Suite
+##############################
+
+This module tests the `Trajectory` class included in the trajectory module.
+"""
+
+import os
+import tempfile
+import unittest
+import numpy
+from qc import Circuit
+from utils.trajectory import Trajectory
+
+
+class TestTrajectory(unittest.TestCase):
+    r"""
+    This class checks that a recorded search can be saved, loaded and drawn
+    once it is over.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        circuit = Circuit(5)
+        circuit.h()
+        self.projections = circuit.grover([3, 17], record=True)
+        self.trajectory = circuit.trajectory
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_record(self):
+        r"""
+        This test checks that the circuit keeps the trajectory it returns, and
+        that recording past the room made grows the array.
+        """
+        self.assertTrue(numpy.array_equal(self.trajectory.projections, self.projections))
+        self.assertEqual(list(self.trajectory.targets), [3, 17])
+
+        trajectory = Trajectory(2, 1, 1)
+        for i in range(3):
+            trajectory.record(i, 2 * i)
+        self.assertEqual(trajectory.projections.tolist(), [[0, 0], [1, 2], [2, 4]])
+
+    def test_save_and_load(self):
+        r"""
+        This test checks that both formats give back the same trajectory, and
+        that an unknown format is rejected.
+        """
+        for extension in [".npz", ".csv"]:
+            path = os.path.join(self.directory.name, "trajectory" + extension)
+            loaded = Trajectory.load(self.trajectory.save(path))
+            self.assertEqual(loaded.register_size, 5)
+            self.assertEqual(list(loaded.targets), [3, 17])
+            self.assertTrue(numpy.array_equal(loaded.projections, self.projections))
+
+        with self.assertRaises(ValueError):
+            self.trajectory.save(os.path.join(self.directory.name, "trajectory.txt"))
+
+    def test_render_in_background(self):
+        r"""
+        This test checks that a figure drawn on the background thread is saved.
+        """
+        name = os.path.join(self.directory.name, "figure")
+        rendering = self.trajectory.renderInBackground(name, dpi=20)
+        self.assertEqual(rendering.result(timeout=60), name)
+        self.assertTrue(os.path.exists(name + ".png"))
@@ -0,0 +1,129 @@
+r"""
+Analytic Grover Trajectory
+==========================
+This module computes the path of Grover's algorithm for a single target in closed form,
+without a state vector.
+
+Starting from the uniform superposition :math:`H^{\otimes n}|0\rangle`, the register
+never leaves the plane spanned by the target state :math:`|t\rangle` and the uniform
+superposition of the other :math:`N - 1` states. With :math:`\sin\theta = 1/\sqrt{N}`,
+after :math:`k` iterations the target has amplitude :math:`\sin((2k+1)\theta)` and every
+other state has amplitude :math:`\cos((2k+1)\theta)/\sqrt{N - 1}`.
+
+So the projections which `qc.Circuit.grover` records, and the final probability which
+`qc.Circuit.measure` prints, cost :math:`O(k)` time and memory rather than
+:math:`O(k 2^n)`, which makes registers of 40 qubits and more instant. `validate` checks
+the closed form against the simulated path for small registers.
+"""
+
+import math
+
+import numpy
+
+from utils.kernels import groverIteration
+
+
+def iterations(register_size: int, marked: int = 1) -> int:
+    r"""
+    Returns the number of Grover iterations which makes finding one of the marked
+    states most likely, :math:`\lfloor \pi / 4\theta \rfloor` with
+    :math:`\sin\theta = \sqrt{M/N}` for :math:`M` marked states. This is the count
+    `qc.Circuit.iterations` gives.
+
+    Params:
+        register_size (int): The number of qubits in the quantum register.
+        marked (int): The number of marked states.
+    """
+    theta = numpy.arcsin(numpy.sqrt(marked / 2 ** int(register_size)))
+    return math.floor(numpy.pi / (4 * theta))
+
+
+def checkTarget(register_size: int, target: int):
+    r"""
+    Raises a `ValueError` if the target state does not fit in the register.
+
+    Params:
+        register_size (int): The number of qubits in the quantum register.
+        target (int): The target state of the search.
+    """
+    if not 0 <= int(target) < 2 ** int(register_size):
+        raise ValueError(
+            "Target " + str(target) + " does not fit in a register of " +
+            str(register_size) + " qubits."
+        )
+
+
+def trajectory(register_size: int, target: int, count: int = None) -> numpy.ndarray:
+    r"""
+    Returns the projections of the register onto the initial state
+    :math:`|0\rangle` and the target state after each Grover iteration, as
+    returned by ``Circuit.grover(target, record=True)`` after ``Circuit.h()``.
+
+    Params:
+        register_size (int): The number of qubits in the quantum register.
+        target (int): The target state of the search.
+        count (int): The number of iterations, by default `iterations`.
+
+    Returns:
+        numpy.ndarray: One row of (initial, target) projections per iteration.
+    """
+    checkTarget(register_size, target)
+    N = 2 ** int(register_size)
+    if count is None:
+        count = iterations(register_size)
+
+    theta = numpy.arcsin(numpy.sqrt(1 / N))
+    angles = (2 * numpy.arange(1, int(count) + 1) + 1) * theta
+
+    projections = numpy.empty((angles.shape[0], 2))
+    projections[:, 1] = numpy.sin(angles)
+    if int(target) == 0:
+        projections[:, 0] = projections[:, 1]
+    else:
+        projections[:, 0] = numpy.cos(angles) / numpy.sqrt(N - 1)
+    return projections
+
+
+def probability(register_size: int, count: int = None) -> float:
+    r"""
+    Returns the probability of measuring the target state after Grover's
+    algorithm, :math:`\sin^2((2k+1)\theta)`, which is the same for every target.
+
+    Params:
+        register_size (int): The number of qubits in the quantum register.
+        count (int): The number of iterations :math:`k`, by default `iterations`.
+    """
+    if count is None:
+        count = iterations(register_size)
+    theta = numpy.arcsin(numpy.sqrt(1 / 2 ** int(register_size)))
+    return float(numpy.sin((2 * int(count) + 1) * theta) ** 2)
+
+
+def validate(sizes=range(1, 9)) -> float:
+    r"""
+    Checks the closed form against the simulated path, running the search from
+    the uniform superposition with `utils.kernels.groverIteration` for the first,
+    last and a middle target of each register size.
+
+    Params:
+        sizes (list[int]): The register sizes to check.
+
+    Returns:
+        float: The largest difference between a simulated and an analytic projection.
+
+    ----
+    """
+    error = 0.0
+    for register_size in sizes:
+        N = 2 ** int(register_size)
+        for target in sorted({0, N // 3, N - 1}):
+            amplitudes = numpy.full(N, 1 / numpy.sqrt(N))
+            simulated = []
+            for _ in range(iterations(register_size)):
+                groverIteration(amplitudes, target)
+                simulated.append((amplitudes[0], amplitudes[target]))
+            simulated = numpy.array(simulated, dtype=float).reshape(-1, 2)
+
+            analytic = trajectory(register_size, target)
+            error = max(error, float(numpy.abs(simulated - analytic).max(initial=0)))
+    return error
@@ -14,8 +14,9 @@ from typing import Union
 
 from numpy._typing import ArrayLike, NDArray
 from utils.matrixInterface import matrixInterface
+from utils.diagonalMatrix import diagonalMatrix
 
-from numpy import array, allclose, matmul
+from numpy import asarray, allclose, kron, matmul, multiply, ndarray
 
 
 class denseMatrix(matrixInterface):
@@ -60,14 +61,15 @@ class denseMatrix(matrixInterface):
         Sets the matrix elements for the dense matrix.
 
         Args:
-            elements (Union[list, matrixInterface]): The matrix elements as a list or another matrix.
+            elements (Union[list, NDArray, matrixInterface]): The matrix elements as a list,
+                an array or another matrix.
         """
 
-        if isinstance(elements, list):
+        if isinstance(elements, (list, ndarray)):
             if self.vector:
-                matrix = array(array(elements).reshape(len(elements), 1))
+                matrix = asarray(elements).reshape(len(elements), 1)
             else:
-                matrix = array(array(elements).reshape(self.size, self.size))
+                matrix = asarray(elements).reshape(self.size, self.size)
         else:
             matrix = elements
 
@@ -85,25 +87,8 @@ class denseMatrix(matrixInterface):
             denseMatrix: The tensor product matrix.
         """
 
-        product = []
-
-        if self.vector or other.vector:
-            for i in self.matrix:
-                for j in other.matrix:
-                    product.append(i * j)
-            return denseMatrix(2, product, True)
-
-        for rows in self.matrix:
-            row = 0
-            while row < self.matrix.ndim:
-                for entry in rows:
-                    column = 0
-                    while column < self.matrix.ndim:
-                        product.append(entry * other.matrix[row, column])
-                        column += 1
-                row += 1
-
-        return denseMatrix(self.size * other.size, product)
+        product = kron(self.matrix, other.matrix)
+        return denseMatrix(self.size * other.size, product, self.vector or other.vector)
 
     def __str__(self):
         return self.matrix.__str__()
@@ -176,17 +161,44 @@ class denseMatrix(matrixInterface):
         self.matrix = factor * self.matrix
         return self
 
-    def multiply(self, other: denseMatrix) -> denseMatrix:
+    def astype(self, dtype) -> denseMatrix:
         r"""
-        Multiplies dense matrix with another dense matrix.
+        Casts the elements of the dense matrix to a dtype, without copying them
+        if they already have it.
+
+        Args:
+            dtype: The `numpy` dtype.
+
+        Returns:
+            denseMatrix: The cast matrix.
+        """
+
+        self.matrix = self.matrix.astype(dtype, copy=False)
+        return self
+
+    def multiply(self, other: denseMatrix, out: denseMatrix = None) -> denseMatrix:
+        r"""
+        Multiplies dense matrix with another dense matrix. A diagonal matrix scales
+        the columns instead of being built in full.
 
         Args:
             other (denseMatrix): The other matrix to multiply with.
+            out (denseMatrix): A dense matrix to write the product into.
 
         Returns:
-            denseMatrix: The product matrix.
+            denseMatrix: The product matrix, `out` if it was given.
         """
 
+        if isinstance(other, diagonalMatrix):
+            if out is not None:
+                multiply(self.matrix, other.diagonal, out=out.matrix)
+                return out
+            return denseMatrix(self.size, self.matrix * other.diagonal, False)
+
+        if out is not None and isinstance(other.matrix, ndarray):
+            matmul(self.matrix, other.matrix, out=out.matrix)
+            return out
+
         product = matmul(self.matrix, other.matrix)
         return denseMatrix(self.size, product, other.vector)
 
@@ -0,0 +1,286 @@
+r"""
+Diagonal Matrix Implementation
+==============================
+This module provides an implementation of the `matrixInterface` for diagonal matrices,
+such as the oracle and reflection gates of Grover's algorithm.
+
+Only the :math:`2^n` diagonal elements are stored rather than the :math:`4^n` elements of
+the full matrix. Updating a diagonal element costs :math:`O(1)`, and applying the matrix to
+a vector is an elementwise multiplication costing :math:`O(2^n)`. Products, sums and
+tensor products of two diagonal matrices stay diagonal, and the product with a dense
+matrix scales its rows without building the diagonal matrix.
+
+Operations with no diagonal form, such as updating an element off the diagonal, return
+the equivalent dense matrix.
+"""
+
+from __future__ import annotations
+from typing import Union
+
+from numpy._typing import ArrayLike, NDArray
+from numpy import allclose, asarray, diag, kron, multiply, ndarray
+from utils.matrixInterface import matrixInterface
+from utils.kronMatrix import kronMatrix
+
+
+class diagonalMatrix(matrixInterface):
+    r"""
+    This class represents a square matrix whose only nonzero elements lie on its diagonal.
+    """
+
+    def __init__(self, size: int, elements: Union[list, NDArray], vector=False):
+        r"""
+        Args:
+            size (int): The number of rows (and columns) of the matrix.
+            elements (Union[list, NDArray]): The diagonal elements.
+            vector (bool): Must be `False`, a diagonal matrix is always an operator.
+
+        Attributes:
+            size (int): The size of the matrix.
+            vector (bool): Always `False`.
+            diagonal (NDArray): The diagonal elements as a flat `numpy` array.
+        """
+
+        self.size = size
+        self.vector = False
+        self.diagonal = asarray(elements).reshape(size)
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = value
+        return
+
+    @property
+    def matrix(self) -> NDArray:
+        r"""
+        The full matrix, built on every access.
+        """
+
+        return diag(self.diagonal)
+
+    def materialize(self) -> matrixInterface:
+        r"""
+        Builds the equivalent dense matrix.
+
+        Returns:
+            denseMatrix: The full matrix.
+        """
+
+        # Imported here as `denseMatrix` multiplies by diagonal matrices itself.
+        from utils.denseMatrix import denseMatrix
+
+        return denseMatrix(self.size, self.matrix)
+
+    def __str__(self):
+        return self.matrix.__str__()
+
+    def tensor(self, other: matrixInterface) -> matrixInterface:
+        r"""
+        Computes the tensor product with another matrix, which stays diagonal if
+        the other matrix is diagonal.
+
+        Args:
+            other (matrixInterface): The other matrix to compute the tensor product with.
+
+        Returns:
+            matrixInterface: The tensor product matrix.
+        """
+
+        if isinstance(other, diagonalMatrix):
+            return diagonalMatrix(self.size * other.size, kron(self.diagonal, other.diagonal))
+        return self.materialize().tensor(other)
+
+    def reshape(self, rows: int, cols: int) -> matrixInterface:
+        r"""
+        Builds the full matrix and reshapes it to the specified dimensions.
+        """
+
+        return self.materialize().reshape(rows, cols)
+
+    def update(self, row: int, col: int, value: float) -> matrixInterface:
+        r"""
+        Updates a specific element of the matrix. An element on the diagonal is
+        updated in place, any other element turns the matrix dense.
+
+        Args:
+            row (int): The row index of the element to update.
+            col (int): The column index of the element to update.
+            value (float): The new value of the element.
+
+        Returns:
+            matrixInterface: The updated matrix.
+        """
+
+        if row != col:
+            return self.materialize().update(row, col, value)
+
+        if asarray(value).dtype.kind == "c" and self.diagonal.dtype.kind != "c":
+            self.diagonal = self.diagonal.astype(complex)
+        self.diagonal[row] = value
+        return self
+
+    def negate(self) -> diagonalMatrix:
+        r"""
+        Negates the diagonal matrix.
+
+        Returns:
+            diagonalMatrix: The negated matrix.
+        """
+
+        self.diagonal = -1 * self.diagonal
+        return self
+
+    def equal(self, other: matrixInterface) -> bool:
+        r"""
+        Checks if the diagonal matrix is equal to another matrix. Two diagonal
+        matrices are compared by their diagonals alone.
+
+        Args:
+            other (matrixInterface): The other matrix to compare with.
+
+        Returns:
+            bool: True if the matrices are equal, False otherwise.
+        """
+
+        if isinstance(other, diagonalMatrix):
+            return allclose(self.diagonal, other.diagonal)
+        return allclose(self.flat(), asarray(other.flat()))
+
+    def scale(self, factor: float) -> diagonalMatrix:
+        r"""
+        Scales the diagonal matrix by a factor.
+
+        Args:
+            factor (float): The scaling factor.
+
+        Returns:
+            diagonalMatrix: The scaled matrix.
+        """
+
+        self.diagonal = factor * self.diagonal
+        return self
+
+    def astype(self, dtype) -> diagonalMatrix:
+        r"""
+        Casts the diagonal elements to a dtype.
+
+        Args:
+            dtype: The `numpy` dtype.
+
+        Returns:
+            diagonalMatrix: The cast matrix.
+        """
+
+        self.diagonal = self.diagonal.astype(dtype, copy=False)
+        return self
+
+    def multiply(
+        self, other: matrixInterface, out: matrixInterface = None
+    ) -> matrixInterface:
+        r"""
+        Multiplies the diagonal matrix with another matrix, by scaling each row of
+        the other matrix (or each element of a vector) by the diagonal.
+
+        Args:
+            other (matrixInterface): The other matrix to multiply with.
+            out (matrixInterface): A matrix to write the product into, used when
+                both it and the other matrix are held as `numpy` arrays.
+
+        Returns:
+            matrixInterface: The product matrix, diagonal if the other matrix is,
+            and `out` if the product was written into it.
+        """
+
+        if isinstance(other, diagonalMatrix):
+            if out is not None and isinstance(out, diagonalMatrix):
+                multiply(self.diagonal, other.diagonal, out=out.diagonal)
+                return out
+            return diagonalMatrix(self.size, self.diagonal * other.diagonal)
+
+        if isinstance(other, kronMatrix):
+            other = other.materialize()
+
+        if isinstance(other.matrix, ndarray):
+            if out is not None and isinstance(getattr(out, "matrix", None), ndarray):
+                multiply(self.diagonal[:, None], other.matrix, out=out.matrix)
+                return out
+            product = self.diagonal[:, None] * other.matrix
+        else:
+            product = other.matrix.multiply(self.diagonal[:, None])
+        return type(other)(other.size, product, other.vector)
+
+    def power(self, exponent: int) -> diagonalMatrix:
+        r"""
+        Raises the diagonal matrix to a tensor power, which is also diagonal.
+
+        Args:
+            exponent (int): The exponent to raise the matrix to.
+
+        Returns:
+            diagonalMatrix: The matrix raised to the specified power.
+        """
+
+        initial = self.diagonal
+        i = 1
+        while i < exponent:
+            self.diagonal = kron(self.diagonal, initial)
+            self.size = self.size * initial.shape[0]
+            i = i + 1
+        return self
+
+    def add(self, other: matrixInterface) -> matrixInterface:
+        r"""
+        Adds another matrix to the diagonal matrix.
+
+        Args:
+            other (matrixInterface): The other matrix to add.
+
+        Returns:
+            matrixInterface: The sum of the matrices, diagonal if the other matrix is.
+        """
+
+        if isinstance(other, diagonalMatrix):
+            self.diagonal = self.diagonal + other.diagonal
+            return self
+        return self.materialize().add(other)
+
+    def subtract(self, other: matrixInterface) -> matrixInterface:
+        r"""
+        Subtracts another matrix from the diagonal matrix.
+
+        Args:
+            other (matrixInterface): The other matrix to subtract.
+
+        Returns:
+            matrixInterface: The difference matrix, diagonal if the other matrix is.
+        """
+
+        if isinstance(other, diagonalMatrix):
+            self.diagonal = self.diagonal - other.diagonal
+            return self
+        return self.materialize().subtract(other)
+
+    def toVector(self) -> matrixInterface:
+        r"""
+        Builds the full matrix and converts it to a vector.
+        """
+
+        return self.materialize().toVector()
+
+    def dimension(self) -> int:
+        r"""
+        Returns the number of rows of the matrix.
+        """
+
+        return self.size
+
+    def flat(self) -> ArrayLike:
+        r"""
+        Returns the full matrix flattened into a 1D array.
+        """
+
+        return self.matrix.flatten()
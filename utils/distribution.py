@@ -0,0 +1,129 @@
+r"""
+Distribution Module
+===================
+This module computes the probability of every outcome of measuring a register, and
+finds the most likely outcomes, directly from its amplitudes rather than by projecting
+the register onto one basis state at a time.
+
+Both work through the amplitudes in chunks of `chunkSize` so that, apart from the
+result, only one chunk is ever held in memory. This matters for a memory mapped
+register, whose amplitudes are read from disk as each chunk is reached.
+
+The most likely outcomes are found by partial selection: each chunk contributes only
+its own :math:`k` most likely outcomes, found with `numpy.partition` in linear time,
+and only those are sorted. Finding them costs :math:`O(2^n)` time plus
+:math:`O(k \log k)` per chunk, rather than the :math:`O(n 2^n)` of sorting every
+probability.
+"""
+
+from typing import Iterable
+
+import numpy
+
+chunkSize = 2**20  # The default number of amplitudes handled at once.
+
+
+def resultType(amplitudes: numpy.ndarray) -> numpy.dtype:
+    r"""
+    Returns the type of the probabilities of some amplitudes, the real type of the
+    same precision or double precision for integer amplitudes.
+    """
+
+    return numpy.result_type(amplitudes.real.dtype, numpy.float32)
+
+
+def probabilities(amplitudes: numpy.ndarray, chunk: int = None) -> numpy.ndarray:
+    r"""
+    Returns :math:`|a_i|^2` for every amplitude :math:`a_i`.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat array of amplitudes, which may be
+            memory mapped.
+        chunk (int): The number of amplitudes to read at once, by default
+            `chunkSize`.
+
+    Returns:
+        numpy.ndarray: The probability of each basis state.
+    """
+
+    chunk = int(chunkSize if chunk is None else chunk)
+    found = numpy.empty(amplitudes.shape[0], dtype=resultType(amplitudes))
+    for start in range(0, found.shape[0], chunk):
+        part = found[start : start + chunk]
+        numpy.abs(amplitudes[start : start + chunk], out=part)
+        numpy.square(part, out=part)
+    return found
+
+
+def pieces(amplitudes: numpy.ndarray, chunk: int = None) -> Iterable[tuple]:
+    r"""
+    Yields the first basis state of each chunk of amplitudes together with the
+    probabilities of the chunk.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat array of amplitudes.
+        chunk (int): The number of amplitudes to read at once, by default
+            `chunkSize`.
+    """
+
+    chunk = int(chunkSize if chunk is None else chunk)
+    for start in range(0, amplitudes.shape[0], chunk):
+        part = numpy.abs(amplitudes[start : start + chunk]).astype(
+            resultType(amplitudes), copy=False
+        )
+        yield start, numpy.square(part, out=part)
+
+
+def topK(candidates: Iterable[tuple], k: int) -> tuple:
+    r"""
+    Returns the :math:`k` most likely of some candidate outcomes.
+
+    Args:
+        candidates (Iterable[tuple]): Pairs of the basis states and their
+            probabilities. The states are either a sorted array with one state per
+            probability or the first state of a run of consecutive states.
+        k (int): The number of outcomes to keep.
+
+    Returns:
+        tuple: The states and their probabilities, most likely first, with ties
+        broken by the lower state.
+    """
+
+    k = int(k)
+    if k < 1:
+        raise ValueError("Expected k to be at least 1, not " + str(k) + ".")
+
+    states = numpy.zeros(0, dtype=numpy.int64)
+    found = numpy.zeros(0)
+    for first, chunk in candidates:
+        keep = best(chunk, k)
+        if isinstance(first, numpy.ndarray):
+            chosen = first[keep]
+        else:
+            chosen = int(first) + keep
+        states = numpy.concatenate([states, chosen])
+        found = numpy.concatenate([found, chunk[keep]])
+
+        # At most 2k outcomes are left, so sorting them in full is cheap.
+        order = numpy.lexsort((states, -found))[:k]
+        states, found = states[order], found[order]
+
+    return states, found
+
+
+def best(chunk: numpy.ndarray, k: int) -> numpy.ndarray:
+    r"""
+    Returns the indices of the :math:`k` largest probabilities of a chunk, in
+    order of index, preferring lower indices among equal probabilities.
+
+    The :math:`k`-th largest probability is found by partial selection with
+    `numpy.partition`, without sorting the chunk.
+    """
+
+    if chunk.shape[0] <= k:
+        return numpy.arange(chunk.shape[0])
+
+    threshold = numpy.partition(chunk, chunk.shape[0] - k)[chunk.shape[0] - k]
+    above = numpy.flatnonzero(chunk > threshold)
+    tied = numpy.flatnonzero(chunk == threshold)[: k - above.shape[0]]
+    return numpy.sort(numpy.concatenate([above, tied]))
@@ -6,12 +6,21 @@ This module provides utility functions and the `Gate` class for working with qua
 The `squareMatrix` function creates a square matrix from a list of elements, and the `vector`
 function creates a column vector from a list of elements.
 
-The `Gate` class represents a quantum gate and provides methods for gathering and scattering
-bits, as well as applying the gate to a vector.
+The `Gate` class represents a :math:`k` qubit gate acting on chosen qubits of a larger
+register. It provides methods for gathering and scattering bits, as well as applying
+the gate to a state vector without ever forming the full register operator.
+
+Qubit :math:`q` refers to bit :math:`q` of the basis state index, so qubit 0 is the
+least significant bit and the last factor of the tensor product built by
+`makeStateVector`.
 """
 
+from typing import Union
+
 import numpy
 
+from utils.tensor import Operator
+
 
 def squareMatrix(size: int, elements: list[int]):
     r"""
@@ -42,52 +51,90 @@ def vector(elements: list[int]):
     return numpy.array(elements).reshape(len(elements), 1)
 
 
-class Gate:  # LazyMatrix to be implemented later
+class Gate:
     r"""
-    Represents a quantum gate.
+    Represents a quantum gate acting on some of the qubits of a register.
 
-    The `Gate` class provides methods for gathering and scattering bits, as well as
-    applying the gate to a vector.
+    The gate is stored as its small :math:`2^k \times 2^k` matrix together with the
+    positions of the :math:`k` qubits it acts on. Bit :math:`k` of a row or column
+    index of the small matrix corresponds to qubit `qubitPosition[k]`.
+
+    Applying the gate to an :math:`n` qubit state costs :math:`O(2^n 2^k)` and never
+    builds the :math:`2^n \times 2^n` operator.
 
     Args:
+        matrix (Union[list, numpy.ndarray, Operator]): The :math:`2^k \times 2^k` gate,
+            as a flat or nested list, an array or an `Operator`.
         qubitPosition (list[int]): The positions of the qubits the gate acts on.
     """
 
-    def __init__(self, qubitPosition: list[int]) -> None:
-        self._smallMatrix = squareMatrix(2, [1, 2, 3, 4])
-        self._qbpos = qubitPosition
+    def __init__(
+        self, matrix: Union[list, numpy.ndarray, Operator], qubitPosition: list[int]
+    ) -> None:
+        self._qbpos = [int(q) for q in qubitPosition]
+        if not self._qbpos:
+            raise ValueError("A gate must act on at least one qubit.")
+        if min(self._qbpos) < 0:
+            raise ValueError(
+                "Qubit positions cannot be negative, not " + str(self._qbpos) + "."
+            )
+        if len(set(self._qbpos)) != len(self._qbpos):
+            raise ValueError("A gate cannot act on the same qubit twice.")
+
+        size = 2 ** len(self._qbpos)
+        if isinstance(matrix, Operator):
+            matrix = numpy.asarray(matrix.matrix.flat())
+        matrix = numpy.asarray(matrix)
+        if matrix.size != size * size:
+            raise ValueError(
+                "A gate on " + str(len(self._qbpos)) + " qubits needs a "
+                + str(size) + "x" + str(size) + " matrix, not "
+                + str(matrix.size) + " elements."
+            )
+        self._smallMatrix = matrix.reshape(size, size)
+
+    @property
+    def matrix(self) -> numpy.ndarray:
+        r"""
+        The :math:`2^k \times 2^k` matrix of the gate.
+        """
+        return self._smallMatrix
 
-    def gather(self, i: int):
+    @property
+    def qubitPosition(self) -> list[int]:
+        r"""
+        The positions of the qubits the gate acts on.
+        """
+        return list(self._qbpos)
+
+    def gather(self, i: Union[int, numpy.ndarray]):
         """
         Gathers the bits of the input integer `i` at the positions specified
         by the `qbpos` list and packs them into a new integer.
 
         Args:
-            i: The input integer.
+            i: The input integer, or an array of integers.
 
         Returns:
             An integer with the bits of `i` at the positions specified by
             `qbpos` packed together.
         """
         j = 0
-        k = 0
-        bit = 0
         for k in range(len(self._qbpos)):
             # Extract the bit at position `qbpos[k]` of `i`.
-            # cast to integers explicitly to allow bitwise manipulation
-            bit = (int(i) >> int(self._qbpos[k])) & 1
+            bit = (i >> self._qbpos[k]) & 1
             # Pack the bit into position `k` of `j`.
-        j |= bit << k
+            j |= bit << k
         return j
 
-    def scatter(self, j: int):
+    def scatter(self, j: Union[int, numpy.ndarray]):
         """
          Scatters the bits of the input integer `j` into the
          positions specified by the `qbpos` list and packs them into a new
          integer.
 
         Args:
-            j: The input integer.
+            j: The input integer, or an array of integers.
 
         Returns:
             An integer with the bits of `j` scattered into the positions
@@ -95,7 +142,6 @@ class Gate:  # LazyMatrix to be implemented later
         """
 
         i = 0
-        k = 0
         for k in range(len(self._qbpos)):
             # Extract the bit at position `k` of `j`.
             bit = (j >> k) & 1
@@ -103,27 +149,42 @@ class Gate:  # LazyMatrix to be implemented later
             i |= bit << self._qbpos[k]
         return i
 
-    def apply(self, v: list):
+    def apply(self, v: Union[list, numpy.ndarray]) -> numpy.ndarray:
         r"""
         Applies the gate to the input vector `v`.
 
-        This method gathers the bits of each element in `v`, applies the gate matrix
-        to the gathered bits, and then scatters the bits back into the original positions.
+        The :math:`2^n` amplitudes are viewed as a tensor with one axis of length 2
+        per qubit. The small matrix, viewed the same way, is contracted with the
+        axes of the qubits it acts on and the result is moved back into place.
 
         Args:
-            v (list): The input vector to apply the gate to.
+            v (Union[list, numpy.ndarray]): The flat input vector of :math:`2^n`
+                amplitudes.
 
         Returns:
-            list: The resulting vector after applying the gate.
-        
+            numpy.ndarray: The resulting flat vector after applying the gate.
+
         ----
         """
-        
-        w: list = [0] * len(v)
-        for i in range(len(w)):
-            r = self.gather(i)
-            i0 = i & ~self.scatter(r)
-            for c in range(self._smallMatrix.ndim):
-                j = i0 | self.scatter(c)
-                w[i] += self._smallMatrix[r, c] * v[j]
-        return w
+
+        v = numpy.asarray(v).reshape(-1)
+        qubits = int(v.shape[0]).bit_length() - 1
+        if 2**qubits != v.shape[0] or max(self._qbpos) >= qubits:
+            raise ValueError(
+                "The gate acts on qubits "
+                + str(self._qbpos)
+                + " which a vector of length "
+                + str(v.shape[0])
+                + " does not have."
+            )
+
+        k = len(self._qbpos)
+        # Axis 0 of the reshaped state is the most significant qubit, and axis 0
+        # of each half of the reshaped gate is its most significant local bit.
+        axes = [qubits - 1 - q for q in reversed(self._qbpos)]
+        small = self._smallMatrix.reshape((2,) * (2 * k))
+
+        product = numpy.tensordot(
+            small, v.reshape((2,) * qubits), axes=(list(range(k, 2 * k)), axes)
+        )
+        return numpy.moveaxis(product, list(range(k)), axes).reshape(-1)
@@ -0,0 +1,121 @@
+r"""
+Kernel Module
+=============
+This module provides matrix-free kernels which act directly on the amplitudes of a
+quantum register held as a flat `numpy` array. No operator is ever built, so each
+kernel costs :math:`O(2^n)` time and no extra memory for an :math:`n` qubit register.
+
+Every kernel updates the array it is given in place and returns it, so that kernels
+can be chained in the same way as the methods of `matrixInterface`.
+
+The Grover kernels also accept a batch of states held as a :math:`2^n \times k`
+array with one column per search, so that many searches run together.
+
+The Grover iteration :math:`G = H^{\otimes n} R H^{\otimes n} O` splits into two such
+kernels. The oracle :math:`O` flips the sign of the marked amplitudes, and the
+diffusion :math:`H^{\otimes n} R H^{\otimes n} = 2|s\rangle\langle s| - \mathbb{I}`
+replaces every amplitude :math:`a_i` with :math:`2\bar{a} - a_i`, where
+:math:`\bar{a}` is the mean amplitude.
+
+A layer of Hadamard gates :math:`H^{\otimes n}` is applied with the fast
+Walsh-Hadamard transform in :math:`O(n 2^n)` time rather than through the
+:math:`2^n \times 2^n` operator built by tensor products.
+"""
+
+from math import sqrt
+from typing import Union
+
+import numpy
+
+
+def phaseFlip(amplitudes: numpy.ndarray, marked: Union[int, list[int]]) -> numpy.ndarray:
+    r"""
+    Applies the oracle by negating the amplitudes of the marked basis states.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat array of amplitudes, or a batch with one
+            state per column, updated in place.
+        marked (Union[int, list[int]]): The basis state or states to mark. For a batch,
+            one basis state per column.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+    """
+
+    if amplitudes.ndim == 2:
+        amplitudes[marked, numpy.arange(amplitudes.shape[1])] *= -1
+    else:
+        amplitudes[marked] *= -1
+    return amplitudes
+
+
+def invertAboutMean(amplitudes: numpy.ndarray) -> numpy.ndarray:
+    r"""
+    Applies the diffusion operator by reflecting every amplitude about the mean.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat array of amplitudes, or a batch with one
+            state per column, updated in place.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+    """
+
+    mean = amplitudes.mean(axis=0)
+    numpy.subtract(2 * mean, amplitudes, out=amplitudes)
+    return amplitudes
+
+
+def walshHadamard(amplitudes: numpy.ndarray) -> numpy.ndarray:
+    r"""
+    Applies a Hadamard gate to every qubit with the fast Walsh-Hadamard transform.
+
+    Each qubit is handled by one vectorised butterfly: the array is viewed as pairs
+    of blocks :math:`(a, b)` which are replaced with :math:`(a + b, a - b)` without
+    any temporary array. The :math:`1/\sqrt{2}` factors are applied once at the end.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat, contiguous array of :math:`2^n`
+            amplitudes, updated in place. It must have a floating or complex dtype.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+    """
+
+    size = amplitudes.shape[0]
+    if size & (size - 1) != 0 or not amplitudes.flags.c_contiguous:
+        raise ValueError(
+            "The Walsh-Hadamard transform needs a contiguous array of 2^n amplitudes."
+        )
+
+    half = 1
+    while half < size:
+        pairs = amplitudes.reshape(-1, 2, half)
+        upper = pairs[:, 0]
+        lower = pairs[:, 1]
+        upper += lower
+        lower *= -2
+        lower += upper
+        half *= 2
+
+    amplitudes *= 1 / sqrt(size)
+    return amplitudes
+
+
+def groverIteration(amplitudes: numpy.ndarray, marked: Union[int, list[int]]) -> numpy.ndarray:
+    r"""
+    Applies one full Grover iteration, the oracle followed by the diffusion.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat array of amplitudes, or a batch with one
+            state per column, updated in place.
+        marked (Union[int, list[int]]): The basis state or states to mark. For a batch,
+            one basis state per column.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+
+    ----
+    """
+
+    return invertAboutMean(phaseFlip(amplitudes, marked))
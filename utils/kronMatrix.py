@@ -0,0 +1,264 @@
+r"""
+Kronecker Product Matrix Implementation
+=======================================
+This module provides a lazy implementation of the `matrixInterface` for matrices which
+are tensor products :math:`c \, A_1 \otimes A_2 \otimes \dots \otimes A_k` of small
+factors, such as :math:`H^{\otimes n}` or the identity on a register.
+
+Only the list of factors and the scalar coefficient :math:`c` are stored, so a tensor
+power of a single qubit gate costs :math:`O(n)` memory rather than :math:`O(4^n)`.
+Applying the product to a vector contracts one factor at a time, which costs
+:math:`O(n 2^n)` for single qubit factors.
+
+The full matrix is only built when it is asked for, through the `matrix` property or
+`materialize`, or by an operation with no lazy form such as `update` or `add`. Those
+operations return a matrix of the same backend as the factors.
+"""
+
+from __future__ import annotations
+from copy import deepcopy
+from functools import reduce
+
+from numpy._typing import ArrayLike
+from numpy import allclose, asarray, multiply, ndarray, tensordot
+from utils.matrixInterface import matrixInterface
+
+
+class kronMatrix(matrixInterface):
+    r"""
+    This class represents a tensor product of matrices without computing it.
+    """
+
+    def __init__(self, factors: list[matrixInterface], coefficient: complex = 1):
+        r"""
+        Args:
+            factors (list[matrixInterface]): The matrices to take the tensor product of,
+                in order. Factors which are themselves `kronMatrix` are flattened.
+            coefficient (complex): A scalar multiplying the whole product.
+
+        Attributes:
+            factors (list[matrixInterface]): Private copies of the factors, so that
+                later in place changes to the originals do not leak into the product.
+            coefficient (complex): The scalar multiplying the product.
+            vector (bool): Always `False`, a tensor product is used as an operator.
+        """
+
+        self.factors = []
+        self.coefficient = coefficient
+        self.vector = False
+
+        for factor in factors:
+            if isinstance(factor, kronMatrix):
+                self.factors.extend(factor.factors)
+                self.coefficient = self.coefficient * factor.coefficient
+            else:
+                self.factors.append(deepcopy(factor))
+
+    @property
+    def size(self) -> int:
+        return reduce(lambda product, factor: product * factor.size, self.factors, 1)
+
+    @property
+    def matrix(self) -> ArrayLike:
+        r"""
+        The materialised matrix, built on every access.
+        """
+
+        return self.materialize().matrix
+
+    def materialize(self) -> matrixInterface:
+        r"""
+        Computes the full tensor product with the backend of the factors.
+
+        Returns:
+            matrixInterface: The full matrix.
+        """
+
+        product = deepcopy(self.factors[0]).scale(self.coefficient)
+        for factor in self.factors[1:]:
+            product = product.tensor(factor)
+        return product
+
+    def __str__(self):
+        return self.materialize().__str__()
+
+    def tensor(self, other: matrixInterface) -> kronMatrix:
+        r"""
+        Appends another matrix to the list of factors, without computing anything.
+
+        Args:
+            other (matrixInterface): The other matrix to compute the tensor product with.
+
+        Returns:
+            kronMatrix: The lazy tensor product.
+        """
+
+        return kronMatrix([self, other])
+
+    def reshape(self, rows: int, cols: int) -> matrixInterface:
+        r"""
+        Materialises the matrix and reshapes it to the specified dimensions.
+        """
+
+        return self.materialize().reshape(rows, cols)
+
+    def update(self, row: int, col: int, value: float) -> matrixInterface:
+        r"""
+        Materialises the matrix and updates a specific element of it.
+
+        Args:
+            row (int): The row index of the element to update.
+            col (int): The column index of the element to update.
+            value (float): The new value of the element.
+
+        Returns:
+            matrixInterface: The updated, materialised matrix.
+        """
+
+        return self.materialize().update(row, col, value)
+
+    def negate(self) -> kronMatrix:
+        r"""
+        Negates the product by negating its coefficient.
+
+        Returns:
+            kronMatrix: The negated matrix.
+        """
+
+        self.coefficient = -self.coefficient
+        return self
+
+    def equal(self, other: matrixInterface) -> bool:
+        r"""
+        Checks if the product is equal to another matrix, by materialising both.
+
+        Args:
+            other (matrixInterface): The other matrix to compare with.
+
+        Returns:
+            bool: True if the matrices are equal, False otherwise.
+        """
+
+        return allclose(self.flat(), asarray(other.flat()))
+
+    def scale(self, factor: float) -> kronMatrix:
+        r"""
+        Scales the product by scaling its coefficient.
+
+        Args:
+            factor (float): The scaling factor.
+
+        Returns:
+            kronMatrix: The scaled matrix.
+        """
+
+        self.coefficient = self.coefficient * factor
+        return self
+
+    def astype(self, dtype) -> kronMatrix:
+        r"""
+        Casts the elements of every factor to a dtype.
+
+        Args:
+            dtype: The `numpy` dtype.
+
+        Returns:
+            kronMatrix: The cast matrix.
+        """
+
+        self.factors = [factor.astype(dtype) for factor in self.factors]
+        return self
+
+    def multiply(
+        self, other: matrixInterface, out: matrixInterface = None
+    ) -> matrixInterface:
+        r"""
+        Multiplies the product with another matrix.
+
+        A vector is viewed as a tensor with one axis per factor and each factor is
+        contracted with its own axis in turn. A product of two tensor products with
+        factors of matching sizes is computed factor by factor and stays lazy. Any
+        other matrix is multiplied by the materialised product.
+
+        The contractions allocate their own intermediate tensors, so `out` only
+        saves the final array of a product with a vector.
+
+        Args:
+            other (matrixInterface): The other matrix to multiply with.
+            out (matrixInterface): A vector of the type of `other` to write the
+                product with a vector into.
+
+        Returns:
+            matrixInterface: The product matrix, `out` if it was written into.
+        """
+
+        if other.vector:
+            state = asarray(other.flat()).reshape([f.size for f in self.factors])
+            for factor in self.factors:
+                # Contracting the leading axis appends the result as the last axis,
+                # so after every factor the axes are back in their original order.
+                square = asarray(factor.flat()).reshape(factor.size, factor.size)
+                state = tensordot(state, square, axes=([0], [1]))
+            if out is not None and isinstance(getattr(out, "matrix", None), ndarray):
+                multiply(self.coefficient, state.reshape(-1, 1), out=out.matrix)
+                return out
+            state = self.coefficient * state.reshape(-1, 1)
+            return type(other)(self.size, state, True)
+
+        if isinstance(other, kronMatrix) and [f.size for f in self.factors] == [
+            f.size for f in other.factors
+        ]:
+            factors = [a.multiply(b) for a, b in zip(self.factors, other.factors)]
+            return kronMatrix(factors, self.coefficient * other.coefficient)
+
+        return self.materialize().multiply(other, out)
+
+    def power(self, exponent: int) -> kronMatrix:
+        r"""
+        Raises the product to a tensor power by repeating its factors.
+
+        Args:
+            exponent (int): The exponent to raise the matrix to.
+
+        Returns:
+            kronMatrix: The matrix raised to the specified power.
+        """
+
+        self.factors = self.factors * exponent
+        self.coefficient = self.coefficient**exponent
+        return self
+
+    def add(self, other: matrixInterface) -> matrixInterface:
+        r"""
+        Materialises the product and adds another matrix to it.
+        """
+
+        return self.materialize().add(other)
+
+    def subtract(self, other: matrixInterface) -> matrixInterface:
+        r"""
+        Materialises the product and subtracts another matrix from it.
+        """
+
+        return self.materialize().subtract(other)
+
+    def toVector(self) -> matrixInterface:
+        r"""
+        Materialises the product and converts it to a vector.
+        """
+
+        return self.materialize().toVector()
+
+    def dimension(self) -> int:
+        r"""
+        Returns the number of rows of the product.
+        """
+
+        return self.size
+
+    def flat(self) -> ArrayLike:
+        r"""
+        Returns the materialised product flattened into a 1D array.
+        """
+
+        return self.materialize().flat()
@@ -0,0 +1,372 @@
+r"""
+Memory Mapped Module
+====================
+This module provides the `MappedVector` class, a quantum register whose amplitudes live
+in a file on local disk rather than in memory, for registers too large to hold in RAM.
+
+The amplitudes are a `numpy.memmap` and every operation streams through them in
+chunks of :math:`2^k` consecutive amplitudes, so that only a bounded amount of the
+register is ever in memory. A gate on qubits below :math:`k` acts on each chunk on its
+own. A gate on a qubit :math:`q \ge k` pairs every chunk with the chunk
+:math:`2^{q-k}` chunks away, whose amplitudes differ only in qubit :math:`q`, and the
+pair is stacked so that qubit :math:`q` becomes the top qubit of the stacked array. A
+gate on several high qubits stacks one chunk per combination of them in the same way.
+
+While one group of chunks is being worked on, the next is read in the background, and
+each group is written back to the file as soon as it is done. The chunk size is
+chosen so that both groups fit in the RAM budget, `ramBudget` by default.
+"""
+
+from __future__ import annotations
+import os
+import tempfile
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from math import sqrt
+from typing import Union
+
+import numpy
+
+from utils.gate import Gate
+from utils.kernels import walshHadamard
+from utils.sampling import draw
+from utils.symmetric import SymmetricVector
+from utils.tensor import Vector, representable, sparsity
+
+ramBudget = 256 * 2**20  # The default number of bytes of amplitudes held in memory.
+directory = None  # The default directory of the files, the system temporary directory.
+
+
+class MappedVector:
+    r"""
+    This class represents a quantum register stored in a memory mapped file.
+    """
+
+    def __init__(
+        self,
+        register_size: int,
+        path: str = None,
+        budget: int = None,
+        dtype=numpy.float64,
+        backend: str = sparsity,
+    ):
+        r"""
+        Creates the register in the state :math:`|0\rangle`.
+
+        Args:
+            register_size (int): The number of qubits in the register.
+            path (str): The file to store the amplitudes in. By default a temporary
+                file in `directory`, which is removed when the register is closed.
+            budget (int): The number of bytes of amplitudes to hold in memory at
+                once, by default `ramBudget`.
+            dtype: The type of the amplitudes.
+            backend (str): The backend of the `Vector` returned by `toVector`.
+
+        Attributes:
+            register_size (int): The number of qubits in the register.
+            size (int): The number of amplitudes, :math:`2^n`.
+            data (numpy.memmap): The amplitudes.
+            budget (int): The number of bytes of amplitudes held in memory at once.
+            backend (str): The backend of the `Vector` returned by `toVector`.
+        """
+
+        self.register_size = int(register_size)
+        self.size = 2**self.register_size
+        self.budget = int(ramBudget if budget is None else budget)
+        self.backend = backend
+
+        if path is None:
+            handle, path = tempfile.mkstemp(suffix=".amplitudes", dir=directory)
+            os.close(handle)
+            self._finalizer = weakref.finalize(self, _remove, path)
+        else:
+            self._finalizer = None
+        self.path = path
+
+        self.data = numpy.memmap(path, dtype=dtype, mode="w+", shape=(self.size,))
+        self.data[0] = 1
+
+    def close(self):
+        r"""
+        Releases the file, removing it if it is temporary.
+        """
+
+        self.data.flush()
+        del self.data
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def chunkBits(self, qubits: list[int] = ()) -> int:
+        r"""
+        Returns :math:`k` such that groups of chunks of :math:`2^k` amplitudes,
+        one chunk per combination of the given qubits at or above :math:`k`, fit
+        in half of the budget.
+
+        Args:
+            qubits (list[int]): The qubits the operation acts on.
+        """
+
+        available = max(self.budget // (2 * self.data.itemsize), 1)
+        bits = min(available.bit_length() - 1, self.register_size)
+        k = bits
+        while k > 0 and k + sum(1 for q in qubits if q >= k) > bits:
+            k = k - 1
+        return k
+
+    def _groups(self, k: int, high: list[int]) -> list[list[int]]:
+        r"""
+        Returns the indices of the chunks of :math:`2^k` amplitudes which are
+        stacked together for a gate on the `high` qubits, ordered so that high
+        qubit `high[i]` becomes qubit :math:`k + i` of the stack.
+        """
+
+        offsets = [0]
+        for q in high:
+            offsets = offsets + [offset + (1 << (q - k)) for offset in offsets]
+        mask = sum(1 << (q - k) for q in high)
+        return [
+            [base + offset for offset in offsets]
+            for base in range(self.size >> k)
+            if base & mask == 0
+        ]
+
+    def _stream(self, kernel, qubits: list[int] = (), write: bool = True) -> list:
+        r"""
+        Calls `kernel(stack, positions)` on every group of chunks, with the
+        positions of `qubits` in the stack, reading the next group in the
+        background and writing each result back to the file.
+
+        Returns:
+            list: What `kernel` returned for each group, when nothing is written.
+        """
+
+        k = self.chunkBits(qubits)
+        high = sorted(q for q in qubits if q >= k)
+        positions = [q if q < k else k + high.index(q) for q in qubits]
+        chunk = 1 << k
+
+        def load(group):
+            return numpy.concatenate(
+                [self.data[c * chunk : (c + 1) * chunk] for c in group]
+            )
+
+        groups = self._groups(k, high)
+        results = []
+        with ThreadPoolExecutor(max_workers=1) as prefetch:
+            pending = prefetch.submit(load, groups[0])
+            for i, group in enumerate(groups):
+                stack = pending.result()
+                if i + 1 < len(groups):
+                    pending = prefetch.submit(load, groups[i + 1])
+
+                result = kernel(stack, positions)
+                if write:
+                    for j, c in enumerate(group):
+                        part = result[j * chunk : (j + 1) * chunk]
+                        self.data[c * chunk : (c + 1) * chunk] = part
+                else:
+                    results.append(result)
+
+        if write:
+            self.data.flush()
+        return results
+
+    def apply(self, gate: Gate) -> MappedVector:
+        r"""
+        Applies a gate acting on some of the qubits, in place.
+
+        A gate with a phase raises a `ValueError` on a real register, whose file
+        cannot hold the phase (see `utils.tensor.representable`).
+
+        Args:
+            gate (Gate): The gate.
+
+        Returns:
+            MappedVector: The updated register.
+        """
+
+        representable(gate.matrix, self.data.dtype)
+        self._stream(
+            lambda stack, positions: Gate(gate.matrix, positions).apply(stack),
+            gate.qubitPosition,
+        )
+        return self
+
+    def h(self) -> MappedVector:
+        r"""
+        Applies a Hadamard gate to every qubit, in place, with one pass of the
+        fast Walsh-Hadamard transform over every chunk and one further pass per
+        qubit above the chunk.
+
+        Returns:
+            MappedVector: The updated register.
+        """
+
+        def low(stack, positions):
+            return walshHadamard(stack.astype(numpy.result_type(stack, 1.0)))
+
+        def pair(stack, positions):
+            upper, lower = numpy.split(stack, 2)
+            upper += lower
+            lower *= -2
+            lower += upper
+            stack *= 1 / sqrt(2)
+            return stack
+
+        self._stream(low)
+        for q in range(self.chunkBits(), self.register_size):
+            self._stream(pair, [q])
+        return self
+
+    def phaseFlip(self, marked: Union[int, list[int]]) -> MappedVector:
+        r"""
+        Applies the oracle in place, negating the amplitudes of the marked states.
+
+        Args:
+            marked (Union[int, list[int]]): The basis state or states to mark.
+
+        Returns:
+            MappedVector: The updated register.
+        """
+
+        marked = numpy.unique(numpy.asarray(marked, dtype=numpy.int64).reshape(-1))
+        self.data[marked] *= -1
+        return self
+
+    def reflect(self) -> MappedVector:
+        r"""
+        Applies the reflection gate in place, negating every amplitude except
+        that of :math:`|0\rangle`.
+
+        Returns:
+            MappedVector: The updated register.
+        """
+
+        self._stream(lambda stack, positions: numpy.negative(stack, out=stack))
+        self.data[0] *= -1
+        return self
+
+    def sum(self):
+        r"""
+        Returns the sum of the amplitudes.
+        """
+
+        return sum(self._stream(lambda stack, positions: stack.sum(), write=False))
+
+    def invertAboutMean(self) -> MappedVector:
+        r"""
+        Applies the diffusion operator in place, with one pass to find the mean
+        amplitude and one to reflect every amplitude about it.
+
+        Returns:
+            MappedVector: The updated register.
+        """
+
+        mean = self.sum() / self.size
+        self._stream(lambda stack, positions: numpy.subtract(2 * mean, stack, out=stack))
+        return self
+
+    def sample(self, shots: int, random: numpy.random.Generator) -> numpy.ndarray:
+        r"""
+        Draws measurement outcomes in two passes over the file.
+
+        The first pass sums the probability of every chunk, and each shot draws
+        the chunk it lands in. The second reads only the chunks which were drawn
+        and draws each of their shots from the states of that chunk.
+
+        Args:
+            shots (int): The number of outcomes to draw.
+            random (numpy.random.Generator): The generator to draw with.
+
+        Returns:
+            numpy.ndarray: The basis state found by each shot, grouped by chunk.
+        """
+
+        chunk = 1 << self.chunkBits()
+        totals = self._stream(
+            lambda stack, positions: numpy.sum(numpy.abs(stack) ** 2), write=False
+        )
+        picked = numpy.bincount(draw(totals, shots, random), minlength=len(totals))
+
+        outcomes = []
+        for c in numpy.flatnonzero(picked):
+            probabilities = numpy.abs(self.data[c * chunk : (c + 1) * chunk]) ** 2
+            outcomes.append(c * chunk + draw(probabilities, picked[c], random))
+        return numpy.concatenate(outcomes)
+
+    def at(self, states: Union[int, list[int]]) -> numpy.ndarray:
+        r"""
+        Returns the amplitudes of some basis states.
+        """
+
+        states = numpy.asarray(states, dtype=numpy.int64).reshape(-1)
+        return numpy.asarray(self.data[states])
+
+    def amplitudes(self) -> numpy.memmap:
+        r"""
+        Returns the memory mapped amplitudes themselves, without reading them.
+        """
+
+        return self.data
+
+    def toVector(self) -> Vector:
+        r"""
+        Reads the whole register into memory as a `Vector`.
+        """
+
+        return Vector(numpy.array(self.data), self.backend)
+
+    def measure(self, basis: Union[SymmetricVector, Vector]):
+        r"""
+        Measures the register with respect to a basis vector, as `Vector.measure`.
+
+        A basis state reads the one amplitude it picks out, and a symmetric basis
+        reads only the amplitudes of its listed states unless its other states have
+        an amplitude too.
+
+        Args:
+            basis (Union[SymmetricVector, Vector]): The state to measure against.
+
+        Returns:
+            float: The measurement result.
+
+        ----
+        """
+
+        if isinstance(basis, SymmetricVector):
+            sums = [self.data[members].sum() for members in basis.classes]
+            value = numpy.dot(basis.values, sums) if sums else 0
+            if basis.rest != 0:
+                value = value + basis.rest * (self.sum() - numpy.sum(sums))
+            return value
+
+        if basis.state is not None:
+            return self.data[basis.state]
+
+        other = numpy.asarray(basis.amplitudes()).reshape(-1)
+        chunk = 1 << self.chunkBits()
+        return sum(
+            numpy.dot(other[i : i + chunk], self.data[i : i + chunk])
+            for i in range(0, self.size, chunk)
+        )
+
+    def equal(self, target) -> bool:
+        r"""
+        Checks if the register is equal to another state, one chunk at a time.
+        """
+
+        other = numpy.asarray(target.amplitudes()).reshape(-1)
+        chunk = 1 << self.chunkBits()
+        return all(
+            numpy.allclose(self.data[i : i + chunk], other[i : i + chunk])
+            for i in range(0, self.size, chunk)
+        )
+
+
+def _remove(path: str):
+    r"""
+    Removes a temporary file, if it still exists.
+    """
+
+    if os.path.exists(path):
+        os.remove(path)
@@ -86,10 +86,14 @@ class matrixInterface(ABC):
         pass
 
     @abstractmethod
-    def multiply(self, other: matrixInterface) -> matrixInterface:
+    def multiply(self, other: matrixInterface, out: matrixInterface = None) -> matrixInterface:
         r"""
         Performs matrix multiplication of two matrices. The order should be provided as it would
         be written.
+
+        If `out`, a matrix of the same type and shape as the product, is given and the product
+        can be written into its storage without allocating, it is, and `out` itself is returned.
+        Otherwise a new matrix is returned and `out` is left untouched.
         """
         pass
 
@@ -137,6 +141,13 @@ class matrixInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def astype(self, dtype) -> matrixInterface:
+        r"""
+        Casts the elements of the matrix to the given `numpy` dtype, such as ``complex64``.
+        """
+        pass
+
     @abstractmethod
     def toVector(self) -> matrixInterface:
         r"""
@@ -161,17 +172,13 @@ class matrixInterface(ABC):
 
     #            CONCRETE            #
     def __mul__(self, other: matrixInterface) -> matrixInterface:
-        self.multiply(other)
-        return self
+        return self.multiply(other)
 
     def __pow__(self, exponent: int) -> matrixInterface:
-        self.power(exponent)
-        return self
+        return self.power(exponent)
 
     def __add__(self, other: matrixInterface) -> matrixInterface:
-        self.add(other)
-        return self
+        return self.add(other)
 
     def __sub__(self, other: matrixInterface) -> matrixInterface:
-        self.subtract(other)
-        return self
+        return self.subtract(other)
@@ -0,0 +1,145 @@
+r"""
+Optimizer Module
+================
+This module provides `optimize`, a pass over the recorded `utils.program.Program` of a
+circuit which fuses and cancels its instructions before they run, and reports the
+kernel launches and operations this saves (see `Program.launches` and
+`Program.flops`).
+
+The pass walks the program once, keeping the instructions it has accepted so far, and
+
+* merges a gate on one qubit into the last gate on that qubit, when nothing between
+  them acts on the qubit, as the product of their :math:`2 \times 2` matrices,
+* folds a diagonal gate into a diagonal gate just before it, as one diagonal gate on
+  the qubits of both, while that acts on at most `fusedQubits` qubits,
+* drops a gate which cancels the last gate on the same qubits, and a merged or folded
+  gate which is the identity, and
+* drops two Hadamard layers in a row, since :math:`H^{\otimes n} H^{\otimes n} = I`.
+
+Once an instruction is dropped the one before it is next in line, so a cancellation
+can uncover another, as in :math:`X H^{\otimes n} H^{\otimes n} X`.
+
+A Grover search is one instruction, whose iterations apply :math:`O`, :math:`H^{\otimes
+n}`, :math:`R` and :math:`H^{\otimes n}` in turn, so no two Hadamard layers or two
+diagonals of it are ever adjacent. What can be fused is the diffusion
+:math:`H^{\otimes n} R H^{\otimes n} = 2|s\rangle\langle s| - \mathbb{I}`, which the
+matrix-free engine applies together with the oracle as one kernel, so a search with the
+operator engine is rewritten to use the matrix-free engine. The two leave the register
+in the same state.
+"""
+
+import numpy
+
+from utils.program import Instruction, Program
+
+fusedQubits = 10  # The most qubits a folded diagonal gate may act on.
+
+
+def identity(matrix) -> bool:
+    r"""
+    Returns whether a square matrix is the identity, to rounding.
+    """
+
+    matrix = numpy.asarray(matrix)
+    return numpy.allclose(matrix, numpy.eye(matrix.shape[0]))
+
+
+def fold(earlier: Instruction, later: Instruction) -> Instruction:
+    r"""
+    Returns one diagonal gate acting as two diagonal gates, one after the other, on
+    the qubits of both.
+    """
+
+    qubits = list(earlier.qubits) + [q for q in later.qubits if q not in earlier.qubits]
+    index = numpy.arange(2 ** len(qubits))
+    diagonal = numpy.ones(index.shape[0], dtype=numpy.result_type(
+        earlier.params["matrix"], later.params["matrix"], 1.0
+    ))
+    for gate in [earlier, later]:
+        packed = numpy.zeros_like(index)
+        for j, q in enumerate(gate.qubits):
+            packed |= ((index >> qubits.index(q)) & 1) << j
+        diagonal *= numpy.diagonal(numpy.asarray(gate.params["matrix"]))[packed]
+    return Instruction("gate", qubits, matrix=numpy.diag(diagonal))
+
+
+def last(instructions: list[Instruction], qubits: tuple) -> int:
+    r"""
+    Returns the position of the last instruction acting on any of the qubits, or
+    `None` if there is none.
+    """
+
+    for i in range(len(instructions) - 1, -1, -1):
+        if set(instructions[i].qubits) & set(qubits):
+            return i
+    return None
+
+
+def optimize(program: Program) -> tuple:
+    r"""
+    Fuses and cancels the instructions of a program.
+
+    Args:
+        program (Program): The program, which is left as it is.
+
+    Returns:
+        tuple: The optimized `Program`, and a report of the ``"launches"``,
+        ``"flops"`` and ``"instructions"`` it saves, with the ``"before"`` and
+        ``"after"`` launches and operations of each program.
+    """
+
+    kept = []
+    for instruction in program:
+        if instruction.name == "h":
+            if kept and kept[-1].name == "h":
+                kept.pop()
+            else:
+                kept.append(instruction)
+            continue
+
+        if instruction.name == "grover":
+            if instruction.params["engine"] == "operator":
+                params = dict(instruction.params, engine="matrix-free")
+                instruction = Instruction("grover", instruction.qubits, **params)
+            kept.append(instruction)
+            continue
+
+        matrix = numpy.asarray(instruction.params["matrix"])
+        i = last(kept, instruction.qubits)
+        same = i is not None and kept[i].name == "gate" and kept[i].qubits == instruction.qubits
+
+        if same and len(instruction.qubits) == 1:
+            merged = matrix @ numpy.asarray(kept[i].params["matrix"])
+            if identity(merged):
+                del kept[i]
+            else:
+                kept[i] = Instruction("gate", instruction.qubits, matrix=merged)
+            continue
+
+        if same and identity(matrix @ numpy.asarray(kept[i].params["matrix"])):
+            del kept[i]
+            continue
+
+        if (
+            instruction.diagonal()
+            and kept
+            and kept[-1].diagonal()
+            and len(set(kept[-1].qubits) | set(instruction.qubits)) <= fusedQubits
+        ):
+            folded = fold(kept.pop(), instruction)
+            if not identity(folded.params["matrix"]):
+                kept.append(folded)
+            continue
+
+        kept.append(instruction)
+
+    optimized = Program(program.register_size, kept)
+    before = {"launches": program.launches(), "flops": program.flops()}
+    after = {"launches": optimized.launches(), "flops": optimized.flops()}
+    return optimized, {
+        "launches": before["launches"] - after["launches"],
+        "flops": before["flops"] - after["flops"],
+        "instructions": len(program) - len(optimized),
+        "before": before,
+        "after": after,
+    }
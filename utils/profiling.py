@@ -0,0 +1,365 @@
+r"""
+Profiling Module
+================
+This module provides the `Profiler` class, an opt-in record of where the time of a run
+goes. While a profiler is running, every call of
+
+* `qc.Circuit.h`, `qc.Circuit.grover` and `qc.Circuit.run`,
+* `utils.tensor.Operator.tensor` and `utils.tensor.Operator.__mul__`,
+* `utils.tensor.Vector.apply` and `utils.tensor.Vector.applyInPlace`, and
+* `utils.trajectory.Trajectory.render`
+
+is recorded with its wall time, the bytes it allocated at its peak, an estimate of its
+floating point operations and the shapes of its operands. Calls made from within
+another recorded call are recorded too, and nest inside it in the trace.
+
+The methods are instrumented by replacing them on their classes when the profiler
+starts and putting the originals back when it stops, so while no profiler is running
+the code is exactly as it would be without this module, with no overhead at all.
+
+The record can be written as Chrome trace event JSON, which ``chrome://tracing`` and
+Perfetto display as a timeline, or summarised as text, one line per method.
+
+Bytes are counted with `tracemalloc`, which `numpy` reports its arrays to, and which
+itself slows every allocation down; pass ``memory=False`` to time calls without it.
+The peak `tracemalloc` tracks is one for the whole process, so bytes are only counted
+for calls on the thread which started the profiler, and calls on any other thread,
+such as the figures `utils.trajectory.Trajectory.renderInBackground` draws, are
+recorded with none. What another thread allocates during a counted call is still
+counted in it.
+"""
+
+from __future__ import annotations
+import inspect
+import json
+import os
+import threading
+import tracemalloc
+from functools import wraps
+from math import prod
+from timeit import default_timer
+
+import numpy
+
+from utils.diagonalMatrix import diagonalMatrix
+from utils.kronMatrix import kronMatrix
+from utils.sparseMatrix import sparseMatrix
+
+_active = None  # The running profiler, if any.
+
+
+def nonzeros(matrix) -> int:
+    r"""
+    Returns the number of elements a product with the matrix has to visit.
+    """
+
+    if isinstance(matrix, kronMatrix):
+        return prod(nonzeros(factor) for factor in matrix.factors)
+    if isinstance(matrix, diagonalMatrix):
+        return matrix.size
+    if isinstance(matrix, sparseMatrix):
+        return matrix.matrix.nnz
+    return matrix.matrix.size
+
+
+def shape(value):
+    r"""
+    Returns the shape of an operand, or `None` for anything that is not one.
+    """
+
+    from qc import Circuit
+    from utils.tensor import Operator, Vector
+
+    if isinstance(value, Operator):
+        return [value.matrix.size, value.matrix.size]
+    if isinstance(value, Vector):
+        return [value.vector.size]
+    if isinstance(value, Circuit):
+        return [2**value.register_size]
+    return None
+
+
+def walshFlops(register_size: int) -> int:
+    r"""
+    Returns the operations of a Hadamard gate on every qubit by the fast
+    Walsh-Hadamard transform, three half-length passes per qubit and a scaling.
+    """
+
+    size = 2**register_size
+    return 3 * register_size * size // 2 + size
+
+
+def layerFlops(call: dict) -> int:
+    r"""
+    Returns the operations of `qc.Circuit.h`, none for a deferred circuit, which
+    only records the layer.
+    """
+
+    circuit = call["self"]
+    return 0 if circuit.deferred else walshFlops(circuit.register_size)
+
+
+def productFlops(call: dict) -> int:
+    r"""
+    Returns the operations of `Operator.__mul__`, two per element of the left matrix
+    for every column of the right one.
+    """
+
+    left, right = call["other"].matrix, call["self"].matrix
+    columns = 1 if isinstance(right, diagonalMatrix) else right.size
+    return 2 * nonzeros(left) * columns
+
+
+def applyFlops(call: dict) -> int:
+    r"""
+    Returns the operations of applying an operator to a vector. A lazy tensor
+    product contracts each factor with its own axis of the vector.
+    """
+
+    matrix = call["operator"].matrix
+    if isinstance(matrix, kronMatrix):
+        return sum(2 * factor.size * matrix.size for factor in matrix.factors)
+    return 2 * nonzeros(matrix)
+
+
+def groverFlops(call: dict) -> int:
+    r"""
+    Returns the operations of a Grover search: an oracle and a diffusion about the
+    mean per iteration for the matrix-free engine, and an oracle, a reflection and
+    two Hadamard layers per iteration for the operator engine. A deferred circuit
+    only records the search.
+    """
+
+    circuit = call["self"]
+    if circuit.deferred:
+        return 0
+    size = 2**circuit.register_size
+    marked = numpy.unique(numpy.asarray(call["target"]).reshape(-1)).size
+    if call["engine"] == "operator":
+        iteration = 2 * size + 2 * walshFlops(circuit.register_size)
+    else:
+        iteration = marked + 3 * size
+    return circuit.iterations(marked) * iteration
+
+
+def targets() -> list:
+    r"""
+    Returns the instrumented methods, as (class, name, cost) triples where `cost`
+    estimates the operations of a call from its bound arguments.
+    """
+
+    from qc import Circuit
+    from utils.tensor import Operator, Vector
+    from utils.trajectory import Trajectory
+
+    return [
+        (Circuit, "h", layerFlops),
+        (Circuit, "grover", groverFlops),
+        (Circuit, "run", lambda call: call["self"].program.flops()),
+        (Operator, "tensor", lambda call: 0),
+        (Operator, "__mul__", productFlops),
+        (Vector, "apply", applyFlops),
+        (Vector, "applyInPlace", applyFlops),
+        (Trajectory, "render", lambda call: 0),
+    ]
+
+
+class Profiler:
+    r"""
+    This class records the instrumented calls made while it is running.
+    """
+
+    def __init__(self, memory: bool = True):
+        r"""
+        Args:
+            memory (bool): Whether to count the bytes each call allocates.
+
+        Attributes:
+            events (list[dict]): One record per call, in the order calls finished.
+            memory (bool): Whether bytes are counted.
+        """
+
+        self.memory = memory
+        self.events = []
+        self._originals = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._origin = None
+        self._thread = None
+
+    def start(self) -> Profiler:
+        r"""
+        Instruments the methods and starts recording.
+        """
+
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another profiler is already running.")
+        _active = self
+
+        self._origin = default_timer()
+        self._thread = threading.get_ident()
+        self._tracing = self.memory and not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+
+        for owner, name, cost in targets():
+            original = owner.__dict__[name]
+            self._originals.append((owner, name, original))
+            setattr(owner, name, self._wrap(owner.__qualname__ + "." + name, original, cost))
+        return self
+
+    def stop(self) -> Profiler:
+        r"""
+        Puts the original methods back and stops recording.
+        """
+
+        global _active
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+        if self._tracing:
+            tracemalloc.stop()
+        _active = None
+        return self
+
+    def __enter__(self) -> Profiler:
+        return self.start()
+
+    def __exit__(self, *exception):
+        self.stop()
+
+    def _wrap(self, name: str, original, cost):
+        r"""
+        Returns `original` wrapped to record each call.
+        """
+
+        signature = inspect.signature(original)
+        profiler = self
+
+        @wraps(original)
+        def recorded(*args, **kwargs):
+            stack = profiler._stack()
+            counted = profiler.memory and threading.get_ident() == profiler._thread
+            if counted:
+                current, peak = tracemalloc.get_traced_memory()
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+                tracemalloc.reset_peak()
+                frame = {"base": current, "peak": current}
+            else:
+                frame = {}
+            stack.append(frame)
+
+            call = signature.bind(*args, **kwargs)
+            call.apply_defaults()
+            call = call.arguments
+            flops = int(cost(call))
+            shapes = [s for s in map(shape, call.values()) if s is not None]
+
+            start = default_timer()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                end = default_timer()
+                stack.pop()
+                allocated = 0
+                if counted:
+                    frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                    allocated = frame["peak"] - frame["base"]
+                    if stack:
+                        stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+                    tracemalloc.reset_peak()
+
+                profiler._record(
+                    {
+                        "name": name,
+                        "start": start - profiler._origin,
+                        "seconds": end - start,
+                        "bytes": int(allocated),
+                        "flops": flops,
+                        "shapes": shapes,
+                        "thread": threading.get_ident(),
+                    }
+                )
+
+        return recorded
+
+    def _stack(self) -> list:
+        r"""
+        Returns the calls in progress on the current thread.
+        """
+
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _record(self, event: dict):
+        with self._lock:
+            self.events.append(event)
+
+    def trace(self, path: str) -> str:
+        r"""
+        Writes the record as Chrome trace event JSON.
+
+        Returns:
+            str: The path the trace was written to.
+        """
+
+        events = [
+            {
+                "name": event["name"],
+                "cat": event["name"].split(".")[0],
+                "ph": "X",
+                "ts": event["start"] * 1e6,
+                "dur": event["seconds"] * 1e6,
+                "pid": os.getpid(),
+                "tid": event["thread"],
+                "args": {
+                    "bytes": event["bytes"],
+                    "flops": event["flops"],
+                    "shapes": event["shapes"],
+                },
+            }
+            for event in self.events
+        ]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        return path
+
+    def totals(self) -> dict:
+        r"""
+        Returns the calls, seconds and operations of each method, summed over its
+        calls, and the most bytes any one of its calls allocated, in order of total
+        time.
+        """
+
+        totals = {}
+        for event in self.events:
+            total = totals.setdefault(
+                event["name"], {"calls": 0, "seconds": 0.0, "bytes": 0, "flops": 0}
+            )
+            total["calls"] += 1
+            total["seconds"] += event["seconds"]
+            total["bytes"] = max(total["bytes"], event["bytes"])
+            total["flops"] += event["flops"]
+        return dict(sorted(totals.items(), key=lambda item: -item[1]["seconds"]))
+
+    def summary(self) -> str:
+        r"""
+        Returns a table of the `totals`, with the rate of operations of each method.
+        The time of a method includes the time of the recorded calls it makes.
+        """
+
+        lines = [
+            "%-28s %7s %12s %12s %14s %10s"
+            % ("method", "calls", "total (s)", "mean (s)", "peak bytes", "GFLOP/s")
+        ]
+        for name, total in self.totals().items():
+            rate = total["flops"] / total["seconds"] / 1e9 if total["seconds"] else 0.0
+            lines.append(
+                "%-28s %7i %12.6f %12.3e %14i %10.3f"
+                % (name, total["calls"], total["seconds"],
+                   total["seconds"] / total["calls"], total["bytes"], rate)
+            )
+        return "\n".join(lines)
@@ -0,0 +1,168 @@
+r"""
+Program Module
+==============
+This module provides the `Instruction` and `Program` classes, the recorded form of the
+operations of a `qc.Circuit`.
+
+An instruction is the name of an operation, the qubits it acts on and its parameters:
+
+* ``"h"``: a Hadamard gate on every qubit.
+* ``"gate"``: a `utils.gate.Gate`, with its ``matrix`` as a parameter.
+* ``"grover"``: a Grover search, with the ``target``, ``engine``, ``plot`` and
+  ``record`` arguments of `qc.Circuit.grover` and the number of ``iterations`` it
+  will make.
+
+A circuit which defers its operations appends an instruction for each and runs the
+program only when it is asked for a result, so the whole program is known before any
+work is spent on it. This is what lets a program be estimated (`Program.launches` and
+`Program.flops`) or rewritten before it runs.
+
+The estimates count one kernel launch per pass over the register: one per Hadamard
+layer and gate, one per iteration of the matrix-free engine, and four per iteration
+of the operator engine, which applies the oracle, a Hadamard layer, the reflection and
+another Hadamard layer. Operations are counted as `utils.profiling` counts them, for a
+register held in full.
+"""
+
+from __future__ import annotations
+
+import numpy
+
+from utils.profiling import walshFlops
+
+
+class Instruction:
+    r"""
+    This class represents one recorded operation of a circuit.
+    """
+
+    def __init__(self, name: str, qubits=(), **params):
+        r"""
+        Args:
+            name (str): The operation, ``"h"``, ``"gate"`` or ``"grover"``.
+            qubits: The qubits the operation acts on.
+            params: The parameters of the operation.
+
+        Attributes:
+            name (str): The operation.
+            qubits (tuple[int]): The qubits the operation acts on.
+            params (dict): The parameters of the operation.
+        """
+
+        self.name = name
+        self.qubits = tuple(int(q) for q in qubits)
+        self.params = params
+
+    def __repr__(self):
+        params = "".join(", %s=%r" % item for item in self.params.items())
+        return "Instruction(%r, %r%s)" % (self.name, self.qubits, params)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Instruction)
+            and (self.name, self.qubits) == (other.name, other.qubits)
+            and self.params.keys() == other.params.keys()
+            and all(
+                numpy.array_equal(value, other.params[key])
+                for key, value in self.params.items()
+            )
+        )
+
+    def diagonal(self) -> bool:
+        r"""
+        Returns whether the instruction is a gate whose matrix is diagonal.
+        """
+
+        if self.name != "gate":
+            return False
+        matrix = numpy.asarray(self.params["matrix"])
+        return not numpy.count_nonzero(matrix - numpy.diag(numpy.diagonal(matrix)))
+
+    def launches(self) -> int:
+        r"""
+        Returns the number of passes the instruction makes over the register.
+        """
+
+        if self.name == "grover":
+            per = 4 if self.params["engine"] == "operator" else 1
+            return per * self.params["iterations"]
+        return 1
+
+    def flops(self, register_size: int) -> int:
+        r"""
+        Returns an estimate of the floating point operations of the instruction.
+
+        Args:
+            register_size (int): The number of qubits in the register.
+        """
+
+        size = 2**register_size
+        if self.name == "h":
+            return walshFlops(register_size)
+        if self.name == "gate":
+            if self.diagonal():
+                return size
+            return 2 * 2 ** len(self.qubits) * size
+        if self.params["engine"] == "operator":
+            iteration = 2 * size + 2 * walshFlops(register_size)
+        else:
+            marked = numpy.unique(numpy.asarray(self.params["target"]).reshape(-1)).size
+            iteration = marked + 3 * size
+        return self.params["iterations"] * iteration
+
+
+class Program:
+    r"""
+    This class represents the recorded instructions of a circuit, in order.
+    """
+
+    def __init__(self, register_size: int, instructions: list[Instruction] = ()):
+        r"""
+        Args:
+            register_size (int): The number of qubits in the register.
+            instructions (list[Instruction]): The instructions.
+
+        Attributes:
+            register_size (int): The number of qubits in the register.
+            instructions (list[Instruction]): The instructions.
+        """
+
+        self.register_size = int(register_size)
+        self.instructions = list(instructions)
+
+    def __repr__(self):
+        return "Program(%r, %r)" % (self.register_size, self.instructions)
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def __iter__(self):
+        return iter(self.instructions)
+
+    def __getitem__(self, index):
+        return self.instructions[index]
+
+    def append(self, instruction: Instruction) -> Program:
+        r"""
+        Appends an instruction to the program.
+
+        Returns:
+            Program: The program.
+        """
+
+        self.instructions.append(instruction)
+        return self
+
+    def launches(self) -> int:
+        r"""
+        Returns the number of passes the program makes over the register.
+        """
+
+        return sum(instruction.launches() for instruction in self.instructions)
+
+    def flops(self) -> int:
+        r"""
+        Returns an estimate of the floating point operations of the program.
+        """
+
+        return sum(instruction.flops(self.register_size) for instruction in self.instructions)
@@ -0,0 +1,119 @@
+r"""
+Sampling Module
+===============
+This module draws measurement outcomes from the probabilities of the basis states of a
+register, as real hardware returns them after a number of shots.
+
+A table of cumulative probabilities is built once per state, and each shot is a
+uniform random number looked up in the table by binary search. All the shots are drawn
+and looked up together, so :math:`s` shots of an :math:`n` qubit register cost
+:math:`O(2^n + s n)` time with no loop over the shots in Python.
+
+Random numbers come from a `numpy.random.Generator`. `generators` spawns independent
+streams from one seed, so that parallel workers which each sample with their own
+stream are reproducible and do not share random numbers.
+"""
+
+from typing import Union
+
+import numpy
+
+
+def generator(
+    seed: Union[int, numpy.random.SeedSequence, numpy.random.Generator] = None
+) -> numpy.random.Generator:
+    r"""
+    Returns a random number generator for a seed, or the generator itself if one is
+    given. Without a seed the generator is seeded from the operating system.
+    """
+
+    return numpy.random.default_rng(seed)
+
+
+def generators(
+    seed: Union[int, numpy.random.SeedSequence], count: int
+) -> list[numpy.random.Generator]:
+    r"""
+    Returns independent random number generators spawned from one seed, one per
+    worker.
+
+    Args:
+        seed (Union[int, numpy.random.SeedSequence]): The seed of every stream.
+        count (int): The number of streams.
+
+    Returns:
+        list[numpy.random.Generator]: The generators.
+    """
+
+    if not isinstance(seed, numpy.random.SeedSequence):
+        seed = numpy.random.SeedSequence(seed)
+    return [numpy.random.default_rng(child) for child in seed.spawn(count)]
+
+
+def draw(
+    probabilities: numpy.ndarray, shots: int, random: numpy.random.Generator
+) -> numpy.ndarray:
+    r"""
+    Draws outcomes with the given probabilities, which need not be normalised.
+
+    Args:
+        probabilities (numpy.ndarray): The probability of each outcome.
+        shots (int): The number of outcomes to draw.
+        random (numpy.random.Generator): The generator to draw with.
+
+    Returns:
+        numpy.ndarray: The index of the outcome of each shot.
+    """
+
+    cumulative = numpy.cumsum(probabilities, dtype=numpy.float64)
+    if cumulative.size == 0 or not cumulative[-1] > 0:
+        raise ValueError("Cannot sample from a state with no probability.")
+
+    uniforms = random.random(int(shots))
+    uniforms *= cumulative[-1]
+    outcomes = numpy.searchsorted(cumulative, uniforms, side="right")
+    # Rounding may leave the last entries of the table just below the total.
+    return numpy.minimum(outcomes, cumulative.size - 1)
+
+
+def labels(states: numpy.ndarray, register_size: int, keys: str = "bitstring") -> list:
+    r"""
+    Returns the key of each basis state in a result.
+
+    Args:
+        states (numpy.ndarray): The basis states.
+        register_size (int): The number of qubits in the register.
+        keys (str): ``"bitstring"`` to key the states by their bits, with qubit 0
+            last, or ``"int"`` to key them by the states themselves.
+
+    Returns:
+        list: The key of each state.
+    """
+
+    if keys not in ["bitstring", "int"]:
+        raise ValueError(
+            "Unknown keys '" + str(keys) + "', expected 'bitstring' or 'int'."
+        )
+
+    if keys == "int":
+        return [int(state) for state in states]
+    width = "0" + str(int(register_size)) + "b"
+    return [format(int(state), width) for state in states]
+
+
+def counts(outcomes: numpy.ndarray, register_size: int, keys: str = "bitstring") -> dict:
+    r"""
+    Returns the number of shots which gave each outcome.
+
+    Args:
+        outcomes (numpy.ndarray): The basis state found by each shot.
+        register_size (int): The number of qubits in the register.
+        keys (str): How to key the counts, as in `labels`.
+
+    Returns:
+        dict: The number of shots of each outcome found at least once, in order of
+        the outcomes.
+    """
+
+    states, found = numpy.unique(outcomes, return_counts=True)
+    return dict(zip(labels(states, register_size, keys), found.tolist()))
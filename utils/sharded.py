@@ -0,0 +1,429 @@
+r"""
+Sharded Module
+==============
+This module provides the `ShardedVector` class, a quantum register whose amplitudes are
+split into shards held in `multiprocessing.shared_memory` segments and worked on by a
+pool of worker processes, so that a large register is simulated on every core.
+
+The register of :math:`2^n` amplitudes is split into :math:`2^s` shards of
+:math:`2^k` consecutive amplitudes, :math:`k = n - s`, so that shard :math:`j` holds
+the basis states whose top :math:`s` qubits spell :math:`j`. Each shard is a segment
+of its own, which the parent process and every worker map into memory, so no
+amplitude is ever sent between processes; only the name of the operation and the
+shards it acts on are.
+
+A gate on qubits below :math:`k` acts on each shard on its own, so the shards are
+shared out among the workers and need nothing from each other. A gate on a qubit
+:math:`q \ge k` pairs every shard with the shard :math:`2^{q-k}` shards away, whose
+amplitudes differ only in qubit :math:`q`. One worker reads both of the pair from
+shared memory, stacks them so that qubit :math:`q` becomes the top qubit of the stack,
+applies the gate and writes both back, which is the exchange between the pair. A gate
+on several high qubits stacks one shard per combination of them in the same way, as
+`utils.mapped.MappedVector` does with its chunks.
+
+The oracle touches only the marked amplitudes and is applied by the parent process.
+The number of workers is `workers` by default, one per core, and there are as many
+shards as workers, rounded up to a power of two.
+"""
+
+from __future__ import annotations
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from multiprocessing.shared_memory import SharedMemory
+from typing import Union
+
+import numpy
+
+from utils.gate import Gate
+from utils.kernels import walshHadamard
+from utils.sampling import draw
+from utils.symmetric import SymmetricVector
+from utils.tensor import Vector, representable, sparsity
+
+workers = None  # The default number of worker processes, one per core.
+
+_segments = []  # The segments of the register a worker process was started for,
+_shards = []  # and the amplitudes of each of them.
+
+
+class ShardedVector:
+    r"""
+    This class represents a quantum register split into shards in shared memory.
+    """
+
+    def __init__(
+        self,
+        register_size: int,
+        shards: int = None,
+        processes: int = None,
+        dtype=numpy.float64,
+        backend: str = sparsity,
+    ):
+        r"""
+        Creates the register in the state :math:`|0\rangle`.
+
+        Args:
+            register_size (int): The number of qubits in the register.
+            shards (int): The number of shards, a power of two no larger than the
+                register. By default the number of workers, rounded up.
+            processes (int): The number of worker processes, by default `workers`.
+            dtype: The type of the amplitudes.
+            backend (str): The backend of the `Vector` returned by `toVector`.
+
+        Attributes:
+            register_size (int): The number of qubits in the register.
+            size (int): The number of amplitudes, :math:`2^n`.
+            shardBits (int): The number of qubits within a shard, :math:`k`.
+            shards (list[numpy.ndarray]): The amplitudes of each shard.
+            backend (str): The backend of the `Vector` returned by `toVector`.
+        """
+
+        self.register_size = int(register_size)
+        self.size = 2**self.register_size
+        self.backend = backend
+
+        processes = int(processes or workers or os.cpu_count() or 1)
+        if shards is None:
+            bits = min((processes - 1).bit_length(), self.register_size)
+        else:
+            bits = (int(shards) - 1).bit_length()
+            if 2**bits != shards or bits > self.register_size:
+                raise ValueError(
+                    "The number of shards must be a power of two no larger than the "
+                    "register, not " + str(shards) + "."
+                )
+        self.shardBits = self.register_size - bits
+
+        dtype = numpy.dtype(dtype)
+        length = 1 << self.shardBits
+        segments = [
+            SharedMemory(create=True, size=length * dtype.itemsize) for _ in range(2**bits)
+        ]
+        self.shards = [
+            numpy.ndarray(length, dtype=dtype, buffer=segment.buf) for segment in segments
+        ]
+        for shard in self.shards:
+            shard[:] = 0
+        self.shards[0][0] = 1
+
+        self._pool = ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=_attach,
+            initargs=([segment.name for segment in segments], dtype.str, length),
+        )
+        self._finalizer = weakref.finalize(self, _release, self._pool, segments, self.shards)
+
+    def close(self):
+        r"""
+        Stops the workers and releases the shared memory.
+        """
+
+        self._finalizer()
+
+    def _map(self, task, *arguments) -> list:
+        r"""
+        Runs `task(shard, *arguments)` for every shard on the workers.
+
+        Returns:
+            list: What `task` returned for each shard.
+        """
+
+        count = len(self.shards)
+        return list(self._pool.map(task, range(count), *[[a] * count for a in arguments]))
+
+    def _groups(self, high: list[int]) -> list[list[int]]:
+        r"""
+        Returns the indices of the shards which are stacked together for a gate
+        on the `high` qubits, ordered so that high qubit `high[i]` becomes qubit
+        :math:`k + i` of the stack.
+        """
+
+        k = self.shardBits
+        offsets = [0]
+        for q in high:
+            offsets = offsets + [offset + (1 << (q - k)) for offset in offsets]
+        mask = sum(1 << (q - k) for q in high)
+        return [
+            [base + offset for offset in offsets]
+            for base in range(len(self.shards))
+            if base & mask == 0
+        ]
+
+    def apply(self, gate: Gate) -> ShardedVector:
+        r"""
+        Applies a gate acting on some of the qubits, in place.
+
+        A gate with a phase raises a `ValueError` on a real register, whose shards
+        cannot hold the phase (see `utils.tensor.representable`).
+
+        Args:
+            gate (Gate): The gate.
+
+        Returns:
+            ShardedVector: The updated register.
+        """
+
+        representable(gate.matrix, self.shards[0].dtype)
+        k = self.shardBits
+        qubits = gate.qubitPosition
+        high = sorted(q for q in qubits if q >= k)
+        if not high:
+            self._map(_local, gate.matrix, qubits)
+            return self
+
+        positions = [q if q < k else k + high.index(q) for q in qubits]
+        groups = self._groups(high)
+        count = len(groups)
+        list(self._pool.map(_exchange, groups, [gate.matrix] * count, [positions] * count))
+        return self
+
+    def h(self) -> ShardedVector:
+        r"""
+        Applies a Hadamard gate to every qubit, in place, with the fast
+        Walsh-Hadamard transform of every shard followed by one butterfly between
+        each pair of shards per qubit above the shards.
+
+        Returns:
+            ShardedVector: The updated register.
+        """
+
+        self._map(_walsh)
+        for q in range(self.shardBits, self.register_size):
+            list(self._pool.map(_butterfly, self._groups([q])))
+        return self
+
+    def phaseFlip(self, marked: Union[int, list[int]]) -> ShardedVector:
+        r"""
+        Applies the oracle in place, negating the amplitudes of the marked states.
+
+        Args:
+            marked (Union[int, list[int]]): The basis state or states to mark.
+
+        Returns:
+            ShardedVector: The updated register.
+        """
+
+        marked = numpy.unique(numpy.asarray(marked, dtype=numpy.int64).reshape(-1))
+        for state in marked:
+            self.shards[state >> self.shardBits][state & ((1 << self.shardBits) - 1)] *= -1
+        return self
+
+    def reflect(self) -> ShardedVector:
+        r"""
+        Applies the reflection gate in place, negating every amplitude except
+        that of :math:`|0\rangle`.
+
+        Returns:
+            ShardedVector: The updated register.
+        """
+
+        self._map(_subtract, 0)
+        self.shards[0][0] *= -1
+        return self
+
+    def sum(self):
+        r"""
+        Returns the sum of the amplitudes.
+        """
+
+        return sum(self._map(_sum))
+
+    def invertAboutMean(self) -> ShardedVector:
+        r"""
+        Applies the diffusion operator in place, with one pass of the workers to
+        find the mean amplitude and one to reflect every amplitude about it.
+
+        Returns:
+            ShardedVector: The updated register.
+        """
+
+        mean = self.sum() / self.size
+        self._map(_subtract, 2 * mean)
+        return self
+
+    def sample(self, shots: int, random: numpy.random.Generator) -> numpy.ndarray:
+        r"""
+        Draws measurement outcomes, first the shard of each shot from the
+        probability of every shard, summed by the workers, and then the states
+        of each shard which was drawn.
+
+        Args:
+            shots (int): The number of outcomes to draw.
+            random (numpy.random.Generator): The generator to draw with.
+
+        Returns:
+            numpy.ndarray: The basis state found by each shot, grouped by shard.
+        """
+
+        length = 1 << self.shardBits
+        totals = self._map(_probability)
+        picked = numpy.bincount(draw(totals, shots, random), minlength=len(totals))
+
+        outcomes = []
+        for s in numpy.flatnonzero(picked):
+            probabilities = numpy.abs(self.shards[s]) ** 2
+            outcomes.append(s * length + draw(probabilities, picked[s], random))
+        return numpy.concatenate(outcomes)
+
+    def at(self, states: Union[int, list[int]]) -> numpy.ndarray:
+        r"""
+        Returns the amplitudes of some basis states.
+        """
+
+        states = numpy.asarray(states, dtype=numpy.int64).reshape(-1)
+        shards, offsets = states >> self.shardBits, states & ((1 << self.shardBits) - 1)
+        found = numpy.empty(states.shape, dtype=self.shards[0].dtype)
+        for s in numpy.unique(shards):
+            found[shards == s] = self.shards[s][offsets[shards == s]]
+        return found
+
+    def amplitudes(self) -> numpy.ndarray:
+        r"""
+        Returns all :math:`2^n` amplitudes of the register as a new flat array.
+        """
+
+        return numpy.concatenate(self.shards)
+
+    def toVector(self) -> Vector:
+        r"""
+        Gathers the whole register into one `Vector`.
+        """
+
+        return Vector(self.amplitudes(), self.backend)
+
+    def measure(self, basis: Union[SymmetricVector, Vector]):
+        r"""
+        Measures the register with respect to a basis vector, as `Vector.measure`.
+
+        A basis state reads the one amplitude it picks out, and a symmetric basis
+        reads only the amplitudes of its listed states unless its other states have
+        an amplitude too.
+
+        Args:
+            basis (Union[SymmetricVector, Vector]): The state to measure against.
+
+        Returns:
+            float: The measurement result.
+
+        ----
+        """
+
+        if isinstance(basis, SymmetricVector):
+            sums = [self.at(members).sum() for members in basis.classes]
+            value = numpy.dot(basis.values, sums) if sums else 0
+            if basis.rest != 0:
+                value = value + basis.rest * (self.sum() - numpy.sum(sums))
+            return value
+
+        if basis.state is not None:
+            return self.at(basis.state)[0]
+
+        other = numpy.asarray(basis.amplitudes()).reshape(-1)
+        length = 1 << self.shardBits
+        return sum(
+            numpy.dot(other[s * length : (s + 1) * length], shard)
+            for s, shard in enumerate(self.shards)
+        )
+
+    def equal(self, target) -> bool:
+        r"""
+        Checks if the register is equal to another state, one shard at a time.
+        """
+
+        other = numpy.asarray(target.amplitudes()).reshape(-1)
+        length = 1 << self.shardBits
+        return all(
+            numpy.allclose(shard, other[s * length : (s + 1) * length])
+            for s, shard in enumerate(self.shards)
+        )
+
+
+def _attach(names: list[str], dtype: str, length: int):
+    r"""
+    Maps the shards of a register into a worker process as it starts.
+    """
+
+    global _segments
+    _segments = [SharedMemory(name=name) for name in names]
+    _shards[:] = [
+        numpy.ndarray(length, dtype=dtype, buffer=segment.buf) for segment in _segments
+    ]
+
+
+def _local(shard: int, matrix: numpy.ndarray, qubits: list[int]):
+    r"""
+    Applies a gate on qubits within the shards to one shard.
+    """
+
+    _shards[shard][:] = Gate(matrix, qubits).apply(_shards[shard])
+
+
+def _exchange(group: list[int], matrix: numpy.ndarray, positions: list[int]):
+    r"""
+    Applies a gate on qubits above the shards to a group of shards, stacked in
+    the order `ShardedVector._groups` gives them.
+    """
+
+    length = _shards[0].shape[0]
+    stack = Gate(matrix, positions).apply(numpy.concatenate([_shards[s] for s in group]))
+    for j, s in enumerate(group):
+        _shards[s][:] = stack[j * length : (j + 1) * length]
+
+
+def _walsh(shard: int):
+    r"""
+    Applies a Hadamard gate to every qubit within one shard.
+    """
+
+    walshHadamard(_shards[shard])
+
+
+def _butterfly(pair: list[int]):
+    r"""
+    Applies a Hadamard gate on the qubit which tells a pair of shards apart.
+    """
+
+    upper, lower = _shards[pair[0]], _shards[pair[1]]
+    upper += lower
+    lower *= -2
+    lower += upper
+    upper *= 1 / sqrt(2)
+    lower *= 1 / sqrt(2)
+
+
+def _subtract(shard: int, value):
+    r"""
+    Replaces every amplitude :math:`a` of one shard with `value` :math:`- a`.
+    """
+
+    numpy.subtract(value, _shards[shard], out=_shards[shard])
+
+
+def _sum(shard: int):
+    r"""
+    Returns the sum of the amplitudes of one shard.
+    """
+
+    return _shards[shard].sum()
+
+
+def _probability(shard: int) -> float:
+    r"""
+    Returns the probability of measuring any state of one shard.
+    """
+
+    return numpy.sum(numpy.abs(_shards[shard]) ** 2)
+
+
+def _release(pool: ProcessPoolExecutor, segments: list[SharedMemory], shards: list):
+    r"""
+    Stops the workers of a register, then unmaps and removes its segments.
+    """
+
+    pool.shutdown()
+    shards.clear()
+    for segment in segments:
+        segment.close()
+        segment.unlink()
@@ -7,16 +7,31 @@ subtraction, negation, scaling, and equality comparison.
 
 The sparse matrix can be constructed from a list of elements or another matrix.
 It also supports vector representation.
+
+Matrices are converted once, when they are set, to the compressed sparse row (CSR)
+format, or kept in the diagonal (DIA) format if they arrive in it, and every operation
+works on that cached form. Updating an element which is already stored, such as a
+diagonal element of the oracle, changes it in place without rebuilding the matrix, and
+equality is checked on the sparse difference of two matrices rather than densely.
 """
 
 from __future__ import annotations
 from typing import Union
+from warnings import catch_warnings, simplefilter
 
 from numpy._typing import ArrayLike
+from utils.diagonalMatrix import diagonalMatrix
+from utils.kronMatrix import kronMatrix
 from utils.matrixInterface import matrixInterface
 
-from scipy.sparse import coo_array, kron
-from numpy import array, allclose
+from scipy.sparse import (
+    SparseEfficiencyWarning,
+    csr_array,
+    dia_array,
+    issparse,
+    kron,
+)
+from numpy import asarray, ndarray
 
 
 class sparseMatrix(matrixInterface):
@@ -35,7 +50,8 @@ class sparseMatrix(matrixInterface):
         Attributes:
             size (int): The size of the matrix.
             vector (bool): Indicates if the matrix represents a vector.
-            matrix (coo_array): The underlying `scipy.sparse.coo_array` representing the matrix.
+            matrix (Union[csr_array, dia_array]): The underlying `scipy.sparse` array
+                representing the matrix.
         """
 
         self.size = size
@@ -52,26 +68,29 @@ class sparseMatrix(matrixInterface):
         return
 
     @property
-    def matrix(self) -> coo_array:
+    def matrix(self) -> Union[csr_array, dia_array]:
         return self._matrix
 
     @matrix.setter
     def matrix(self, elements):
         r"""
-        Sets the matrix elements for the sparse matrix.
+        Sets the matrix elements for the sparse matrix, converting them to CSR unless
+        they are already in the DIA format.
 
         Args:
-            elements (Union[list, matrixInterface]): The matrix elements as a list or another matrix.
+            elements (Union[list, NDArray, matrixInterface]): The matrix elements as a list,
+                an array or another matrix.
         """
 
-        if isinstance(elements, list):
+        if isinstance(elements, (list, ndarray)):
             if self.vector:
-                matrix = coo_array(array(elements).reshape(len(elements), 1))
+                matrix = csr_array(asarray(elements).reshape(len(elements), 1))
             else:
-                matrix = coo_array(
-                    array(elements).reshape(self.size, self.size))
-        else:
+                matrix = csr_array(asarray(elements).reshape(self.size, self.size))
+        elif isinstance(elements, dia_array):
             matrix = elements
+        else:
+            matrix = csr_array(elements)
 
         self._matrix = matrix
         return
@@ -87,9 +106,12 @@ class sparseMatrix(matrixInterface):
             sparseMatrix: The tensor product matrix.
         """
 
-        product = kron(self.matrix, other.matrix)
-        size = self.size * other.size
-        return sparseMatrix(size, product, self.vector)
+        other = toSparse(other)
+        if isinstance(self.matrix, dia_array) and isinstance(other, dia_array):
+            product = kron(self.matrix, other, format="dia")
+        else:
+            product = kron(self.matrix, other, format="csr")
+        return sparseMatrix(self.size * other.shape[0], product, self.vector)
 
     def __str__(self):
         return self.matrix.todense().__str__()
@@ -105,13 +127,17 @@ class sparseMatrix(matrixInterface):
         Returns:
             sparseMatrix: The reshaped matrix.
         """
-        self.matrix.reshape(rows, cols)
+        self.matrix = self.matrix.reshape((rows, cols))
         return self
 
     def update(self, row: int, col: int, value: float) -> sparseMatrix:
         r"""
         Updates a specific element of the sparse matrix.
 
+        An element on a diagonal already stored in the DIA format, or an element
+        already stored in the CSR format, is changed in place. Any other element is
+        inserted into the CSR form of the matrix.
+
         Args:
             row (int): The row index of the element to update.
             col (int): The column index of the element to update.
@@ -121,9 +147,16 @@ class sparseMatrix(matrixInterface):
             sparseMatrix: The updated matrix.
         """
 
-        matrix = self.matrix.todense()
-        matrix[row][col] = value
-        self.matrix = coo_array(matrix)
+        if isinstance(self.matrix, dia_array):
+            offsets = list(self.matrix.offsets)
+            if col - row in offsets:
+                self.matrix.data[offsets.index(col - row), col] = value
+                return self
+            self.matrix = self.matrix.tocsr()
+
+        with catch_warnings():
+            simplefilter("ignore", SparseEfficiencyWarning)
+            self.matrix[row, col] = value
         return self
 
     def negate(self) -> sparseMatrix:
@@ -138,7 +171,9 @@ class sparseMatrix(matrixInterface):
 
     def equal(self, other: matrixInterface) -> bool:
         r"""
-        Checks if the sparse matrix is equal to another matrix.
+        Checks if the sparse matrix is equal to another matrix, within the same
+        tolerances as `numpy.allclose`. Only the stored elements of the difference
+        are inspected.
 
         Args:
             other (matrixInterface): The other matrix to compare with.
@@ -146,7 +181,13 @@ class sparseMatrix(matrixInterface):
         Returns:
             bool: True if the matrices are equal, False otherwise.
         """
-        return allclose(self.matrix.todense(), other.matrix.todense())
+
+        other = toSparse(other)
+        if self.matrix.shape != other.shape:
+            return False
+
+        difference = (abs(self.matrix - other) - 1e-5 * abs(other)).tocsr()
+        return difference.nnz == 0 or difference.max() <= 1e-8
 
     def scale(self, factor: float) -> sparseMatrix:
         r"""
@@ -162,18 +203,36 @@ class sparseMatrix(matrixInterface):
         self.matrix = factor * self.matrix
         return self
 
-    def multiply(self, other: matrixInterface) -> sparseMatrix:
+    def astype(self, dtype) -> sparseMatrix:
+        r"""
+        Casts the stored elements of the sparse matrix to a dtype, keeping its format.
+
+        Args:
+            dtype: The `numpy` dtype.
+
+        Returns:
+            sparseMatrix: The cast matrix.
+        """
+
+        if self.matrix.dtype != dtype:
+            self.matrix = self.matrix.astype(dtype)
+        return self
+
+    def multiply(self, other: matrixInterface, out: matrixInterface = None) -> sparseMatrix:
         r"""
         Multiplies the sparse matrix with another matrix.
 
+        A sparse product always allocates its result, so `out` is not used.
+
         Args:
             other (matrixInterface): The other matrix to multiply with.
+            out (matrixInterface): Ignored.
 
         Returns:
             sparseMatrix: The product matrix.
         """
-        product = self.matrix.dot(other.matrix)
-        return sparseMatrix(1, product, other.vector)
+        product = self.matrix @ toSparse(other)
+        return sparseMatrix(self.size, product, other.vector)
 
     def power(self, exponent: int) -> sparseMatrix:
         r"""
@@ -186,10 +245,12 @@ class sparseMatrix(matrixInterface):
             sparseMatrix: The matrix raised to the specified power.
         """
 
-        initial = self
+        initial = sparseMatrix(self.size, self.matrix, self.vector)
         i = 1
         while i < exponent:
-            self.tensor(initial)
+            product = self.tensor(initial)
+            self.size = product.size
+            self.matrix = product.matrix
             i = i + 1
         return self
 
@@ -203,7 +264,7 @@ class sparseMatrix(matrixInterface):
         Returns:
             sparseMatrix: The sum of the matrices.
         """
-        self.matrix = self.matrix + other.matrix
+        self.matrix = self.matrix + toSparse(other)
         return self
 
     def subtract(self, other: matrixInterface) -> sparseMatrix:
@@ -216,7 +277,7 @@ class sparseMatrix(matrixInterface):
         Returns:
             sparseMatrix: The difference matrix.
         """
-        self.matrix = self.matrix - other.matrix
+        self.matrix = self.matrix - toSparse(other)
         return self
 
     def toVector(self) -> sparseMatrix:
@@ -226,7 +287,7 @@ class sparseMatrix(matrixInterface):
         Returns:
             sparseMatrix: The matrix as a vector.
         """
-        self.matrix = self.matrix.reshape(self.matrix.get_shape()[0], 1)
+        self.matrix = self.matrix.reshape((self.matrix.shape[0], 1))
         return self
 
     def dimension(self) -> int:
@@ -234,11 +295,35 @@ class sparseMatrix(matrixInterface):
         Returns the dimensions of the sparse matrix
         """
 
-        return self.matrix.get_shape()[0]
+        return self.matrix.shape[0]
 
     def flat(self) -> ArrayLike:
         r"""
         Returns the flattened matrix as a 1D array
         """
-        
-        return self.matrix.todense().flatten()
+
+        return self.matrix.toarray().flatten()
+
+
+def toSparse(other: matrixInterface) -> Union[csr_array, dia_array]:
+    r"""
+    Returns the `scipy.sparse` form of any `matrixInterface`, so that the sparse
+    backend can be combined with the lazy and diagonal matrices emitted by the gates.
+    A diagonal matrix becomes a DIA array without being built in full.
+
+    Args:
+        other (matrixInterface): The matrix to convert.
+
+    Returns:
+        Union[csr_array, dia_array]: The matrix in a sparse format.
+
+    ----
+    """
+
+    if isinstance(other, diagonalMatrix):
+        return dia_array((other.diagonal[None, :], [0]), shape=(other.size, other.size))
+    if isinstance(other, kronMatrix):
+        other = other.materialize()
+    if issparse(other.matrix):
+        return other.matrix
+    return csr_array(asarray(other.matrix))
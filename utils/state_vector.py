@@ -1,4 +1,8 @@
-from utils.tensor import Vector
+import numpy
+from scipy.sparse import csr_array
+
+from utils.sparseMatrix import sparseMatrix
+from utils.tensor import Vector, chooseBackend, precision, sparsity
 
 """
 CANNOT GET SPHINX TO INCLUDE THESE - POSSIBLY BECAUSE ITS NOT A CLASS?
@@ -9,45 +13,117 @@ Args:
     value (int): The integer value to create the state vector from.
     size (int): The desired size of the state vector. If not provided, the size is
                 determined by the length of the binary representation of `value`.
+    backend (str): The backend of the vector, "dense", "sparse" or "auto".
+    dtype: The precision of the vector, see `utils.tensor.precision`.
 
 Returns:
-    Vector: The state vector created as a tensor product of individual qubit state vectors.
+    Vector: The basis state vector.
 
 """
 
 
-def makeStateVector(value: int, size: int = 0):
+def registerSize(values, size: int = 0) -> int:
     r"""
-    Creates a state vector based on the given integer value.
+    Returns the number of qubits of a register holding the given basis states, which
+    is `size` if given and otherwise the length of the binary representation of the
+    largest state, raising a `ValueError` if a state does not fit.
+    """
+
+    values = numpy.asarray(values, dtype=numpy.int64).reshape(-1)
+    largest = int(values.max()) if values.size else 0
+    if not size:
+        size = max(largest.bit_length(), 1)
+
+    if values.size and (values.min() < 0 or largest >= 2 ** int(size)):
+        raise ValueError(
+            "The states " + str(values) + " do not fit in a register of " +
+            str(size) + " qubits."
+        )
+    return int(size)
+
+
+def stored(dimension: int, backend: str) -> type:
+    r"""
+    Returns the `matrixInterface` class which stores a basis state of the given
+    dimension with the given backend, judged on its single nonzero element.
+    """
 
-    The function takes an integer `value` and an optional `size` parameter. It converts
-    the integer to its binary representation and creates a tensor product of individual
-    qubit state vectors corresponding to each binary digit.
+    single = csr_array(([1], ([0], [0])), shape=(dimension, 1))
+    return chooseBackend(sparseMatrix(dimension, single, True), dimension, backend)
+
+
+def basisState(
+    value: int, size: int = 0, backend: str = sparsity, dtype=None
+) -> Vector:
+    r"""
+    Creates the basis state :math:`|value\rangle` directly, as a one-hot vector.
+
+    A dense vector is one array of :math:`2^n` zeros with a single one, and a sparse
+    vector stores the single one alone. The vector remembers which basis state it is,
+    so projecting a register onto it reads one amplitude (see `Vector.measure`).
 
     If the `size` parameter is not provided, the size of the state vector is determined
     by the length of the binary representation of the `value`.
+    """
 
+    value = int(value)
+    size = registerSize(value, size)
+    dimension = 2**size
+
+    if stored(dimension, backend) is sparseMatrix:
+        single = csr_array(([1], ([value], [0])), shape=(dimension, 1))
+        vector = Vector(sparseMatrix(dimension, single, True), backend, dtype)
+    else:
+        elements = numpy.zeros(dimension, dtype=numpy.int64)
+        elements[value] = 1
+        vector = Vector(elements, backend, dtype)
+
+    vector.state = value
+    return vector
+
+
+def basisStates(values: list[int], size: int = 0, backend: str = sparsity, dtype=None):
+    r"""
+    Creates many basis states at once, as the columns of one :math:`2^n \times k`
+    array, which is the layout of a batch in `utils.kernels`.
+
+    Args:
+        values (list[int]): The basis state of each column.
+        size (int): The number of qubits, inferred from the largest state if not given.
+        backend (str): ``"dense"`` for a `numpy` array, ``"sparse"`` for a
+            `scipy.sparse.csr_array` with one stored element per column, or ``"auto"``
+            to choose by size as for a `Vector`.
+        dtype: The precision of the states, see `utils.tensor.precision`.
+
+    Returns:
+        Union[numpy.ndarray, scipy.sparse.csr_array]: The states.
     """
 
-    length = len(f"{value: b}")
+    values = numpy.asarray(values, dtype=numpy.int64).reshape(-1)
+    dimension = 2 ** registerSize(values, size)
+    columns = numpy.arange(values.size)
+    dtype = precision(dtype) or numpy.int64
 
-    if int is None:
-        size = length
+    if stored(dimension, backend) is sparseMatrix:
+        ones = numpy.ones(values.size, dtype=dtype)
+        return csr_array((ones, (values, columns)), shape=(dimension, values.size))
 
-    binary = [*format(value, "0" + str(size) + "b")]
+    states = numpy.zeros((dimension, values.size), dtype=dtype)
+    states[values, columns] = 1
+    return states
 
-    vectors = []
-    for i in binary:
-        vectors.append(Vector(int(i)))
 
-    product = vectors[0]
-    j = 1
-    while j < len(vectors):
-        product = product.tensor(vectors[j])
-        j += 1
-    return product
+def makeStateVector(value: int, size: int = 0, backend: str = sparsity, dtype=None):
+    r"""
+    Creates a state vector based on the given integer value.
 
+    The one-hot vector is built directly by `basisState`, rather than as a tensor
+    product of one vector per binary digit of `value`, which would allocate :math:`n`
+    vectors of doubling size.
+
+    If the `size` parameter is not provided, the size of the state vector is determined
+    by the length of the binary representation of the `value`.
+
+    """
 
-# TODO write tests to verify - examples below
-# print(makeStateVector(6))
-# print(Vector([1, 0]).tensor(Vector([1, 0])).tensor(Vector([0, 1])))
+    return basisState(value, size, backend, dtype)
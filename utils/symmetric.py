@@ -0,0 +1,352 @@
+r"""
+Symmetric Subspace Module
+=========================
+This module provides the `SymmetricVector` class, a compressed quantum register for
+searches with many marked states.
+
+Grover's algorithm never tells apart two states which are both marked, or both
+unmarked, so the register only ever holds a handful of distinct amplitudes. A
+`SymmetricVector` splits the :math:`2^n` basis states into classes and stores one
+amplitude per class. Each class is a sorted array of the basis states in it, except
+for the remaining states, which share the amplitude `rest` and are never listed. So a
+search for :math:`M` marked states needs :math:`O(M)` memory however large the register.
+
+The oracle, the reflection and the diffusion work on the classes directly, as does a
+layer of Hadamard gates on the states it keeps in the span of :math:`|0\rangle` and
+the uniform superposition. Any other Hadamard layer breaks the symmetry and returns
+the equivalent full `Vector` instead.
+"""
+
+from __future__ import annotations
+from math import sqrt
+from typing import Union
+
+import numpy
+
+from utils.distribution import topK
+from utils.kernels import walshHadamard
+from utils.sampling import draw
+from utils.tensor import Vector, sparsity
+
+
+class SymmetricVector:
+    r"""
+    This class represents a quantum register by one amplitude per class of basis states.
+    """
+
+    def __init__(
+        self,
+        register_size: int,
+        classes: list = (),
+        values: Union[list, numpy.ndarray] = (),
+        rest: complex = 0.0,
+        backend: str = sparsity,
+    ):
+        r"""
+        Args:
+            register_size (int): The number of qubits in the register.
+            classes (list): Disjoint arrays of basis states which share an amplitude.
+            values (Union[list, numpy.ndarray]): The amplitude of each class.
+            rest (complex): The amplitude of every basis state in no class.
+            backend (str): The backend of the `Vector` returned when the symmetry breaks.
+
+        Attributes:
+            register_size (int): The number of qubits in the register.
+            size (int): The number of basis states, :math:`2^n`.
+            classes (list[numpy.ndarray]): The sorted basis states of each class.
+            values (numpy.ndarray): The amplitude of each class.
+            rest (complex): The amplitude of every other basis state.
+            backend (str): The backend of the `Vector` returned when the symmetry breaks.
+        """
+
+        self.register_size = int(register_size)
+        self.size = 2**self.register_size
+        self.classes = [numpy.unique(numpy.asarray(c, dtype=numpy.int64)) for c in classes]
+        self.values = numpy.asarray(values, dtype=numpy.result_type(*values, 1.0))
+        self.rest = rest
+        self.backend = backend
+
+    @classmethod
+    def basis(
+        cls, register_size: int, states: Union[int, list[int]], backend: str = sparsity
+    ) -> SymmetricVector:
+        r"""
+        Returns the uniform superposition of some basis states, which is the basis
+        state itself for a single state.
+
+        Args:
+            register_size (int): The number of qubits in the register.
+            states (Union[int, list[int]]): The basis state or states.
+            backend (str): The backend of the `Vector` returned when the symmetry breaks.
+
+        Returns:
+            SymmetricVector: The normalised state.
+        """
+
+        states = numpy.unique(numpy.asarray(states, dtype=numpy.int64).reshape(-1))
+        if states.size == 0 or states[0] < 0 or states[-1] >= 2 ** int(register_size):
+            raise ValueError(
+                "The states " + str(states) + " do not fit in a register of " +
+                str(register_size) + " qubits."
+            )
+        return cls(register_size, [states], [1 / sqrt(states.size)], 0.0, backend)
+
+    def __str__(self):
+        return self.amplitudes().reshape(-1, 1).__str__()
+
+    def _derive(self, classes: list, values: list, rest: complex) -> SymmetricVector:
+        r"""
+        Returns a new state in the same register. The class arrays are shared, not copied.
+        """
+
+        state = SymmetricVector(self.register_size, (), (), rest, self.backend)
+        state.classes = classes
+        state.values = numpy.asarray(values, dtype=numpy.result_type(*values, rest, 1.0))
+        return state
+
+    def restSize(self) -> int:
+        r"""
+        Returns the number of basis states in no class.
+        """
+
+        return self.size - sum(c.size for c in self.classes)
+
+    def at(self, states: Union[int, list[int]]) -> numpy.ndarray:
+        r"""
+        Returns the amplitudes of some basis states.
+
+        Args:
+            states (Union[int, list[int]]): The basis states.
+
+        Returns:
+            numpy.ndarray: The amplitude of each state.
+        """
+
+        states = numpy.asarray(states, dtype=numpy.int64).reshape(-1)
+        found = numpy.full(
+            states.shape, self.rest, dtype=numpy.result_type(self.values, self.rest, 1.0)
+        )
+        for members, value in zip(self.classes, self.values):
+            found[numpy.isin(states, members)] = value
+        return found
+
+    def amplitudes(self) -> numpy.ndarray:
+        r"""
+        Returns all :math:`2^n` amplitudes of the register as a new flat array.
+        """
+
+        amplitudes = numpy.full(
+            self.size, self.rest, dtype=numpy.result_type(self.values, self.rest, 1.0)
+        )
+        for members, value in zip(self.classes, self.values):
+            amplitudes[members] = value
+        return amplitudes
+
+    def toVector(self) -> Vector:
+        r"""
+        Returns the equivalent full `Vector`.
+        """
+
+        return Vector(self.amplitudes(), self.backend)
+
+    def phaseFlip(self, marked: Union[int, list[int]]) -> SymmetricVector:
+        r"""
+        Applies the oracle, negating the amplitudes of the marked basis states.
+
+        Every class is split into its marked and unmarked states, and the marked
+        states in no class become a new class.
+
+        Args:
+            marked (Union[int, list[int]]): The basis state or states to mark.
+
+        Returns:
+            SymmetricVector: The new state.
+        """
+
+        marked = numpy.asarray(marked, dtype=numpy.int64).reshape(-1)
+        for i, members in enumerate(self.classes):
+            # After the first iteration the marked states are already a class.
+            if members is marked or numpy.array_equal(members, marked):
+                values = self.values.copy()
+                values[i] = -values[i]
+                return self._derive(self.classes, values, self.rest)
+
+        marked = numpy.unique(marked)
+        classes = []
+        values = []
+        remaining = marked
+        for members, value in zip(self.classes, self.values):
+            inside = numpy.isin(members, marked, assume_unique=True)
+            if inside.all():
+                classes.append(members)
+                values.append(-value)
+            elif inside.any():
+                classes.extend([members[inside], members[~inside]])
+                values.extend([-value, value])
+            else:
+                classes.append(members)
+                values.append(value)
+            remaining = remaining[~numpy.isin(remaining, members, assume_unique=True)]
+
+        if remaining.size:
+            classes.append(remaining)
+            values.append(-self.rest)
+        return self._derive(classes, values, self.rest)
+
+    def reflect(self) -> SymmetricVector:
+        r"""
+        Applies the reflection gate, which negates every amplitude except that of
+        :math:`|0\rangle`.
+
+        Returns:
+            SymmetricVector: The new state.
+        """
+
+        flipped = self.phaseFlip(0)
+        flipped.values = -flipped.values
+        flipped.rest = -flipped.rest
+        return flipped
+
+    def invertAboutMean(self) -> SymmetricVector:
+        r"""
+        Applies the diffusion operator, replacing every amplitude :math:`a` with
+        :math:`2\bar{a} - a`.
+
+        Returns:
+            SymmetricVector: The new state.
+        """
+
+        sizes = numpy.array([c.size for c in self.classes])
+        mean = (numpy.dot(sizes, self.values) + self.rest * self.restSize()) / self.size
+        return self._derive(self.classes, 2 * mean - self.values, 2 * mean - self.rest)
+
+    def h(self) -> Union[SymmetricVector, Vector]:
+        r"""
+        Applies a Hadamard gate to every qubit.
+
+        A state :math:`a|0\rangle + r\sum_{i>0}|i\rangle` stays in that form, so the
+        result is computed from :math:`a` and :math:`r` alone. Any other state breaks
+        the symmetry and is transformed in full with `utils.kernels.walshHadamard`.
+
+        Returns:
+            Union[SymmetricVector, Vector]: The new state.
+        """
+
+        classes = [c for c in self.classes if c.size]
+        if all(c.size == 1 and c[0] == 0 for c in classes):
+            zero = self.values[0] if classes else self.rest
+            root = sqrt(self.size)
+            rest = (zero - self.rest) / root
+            zero = rest + self.rest * root
+            if numpy.isclose(zero, rest, rtol=0, atol=1e-15):
+                # The uniform superposition needs no class at all.
+                return self._derive([], [], rest)
+            return self._derive([numpy.zeros(1, dtype=numpy.int64)], [zero], rest)
+
+        return Vector(walshHadamard(self.amplitudes()), self.backend)
+
+    def measure(self, basis: Union[SymmetricVector, Vector]):
+        r"""
+        Measures the state with respect to another, as `Vector.measure`.
+
+        Two symmetric states are compared on the listed states of either one, with
+        every other state counted at once through the two `rest` amplitudes. A basis
+        state reads the one amplitude it picks out.
+
+        Args:
+            basis (Union[SymmetricVector, Vector]): The state to measure against.
+
+        Returns:
+            float: The measurement result.
+
+        ----
+        """
+
+        if not isinstance(basis, SymmetricVector):
+            if basis.state is not None:
+                return self.at(basis.state)[0]
+            return numpy.dot(basis.amplitudes(), self.amplitudes())
+
+        listed = numpy.zeros(0, dtype=numpy.int64)
+        listed = numpy.unique(numpy.concatenate([listed] + self.classes + basis.classes))
+        value = numpy.dot(basis.at(listed), self.at(listed))
+        return value + basis.rest * self.rest * (self.size - listed.size)
+
+    def sample(self, shots: int, random: numpy.random.Generator) -> numpy.ndarray:
+        r"""
+        Draws measurement outcomes without listing the whole register.
+
+        Each shot first draws a class, with the probability of all its states
+        together, and then a state of that class uniformly. A state in no class is
+        found by counting how many listed states come before it.
+
+        Args:
+            shots (int): The number of outcomes to draw.
+            random (numpy.random.Generator): The generator to draw with.
+
+        Returns:
+            numpy.ndarray: The basis state found by each shot, grouped by class.
+        """
+
+        sizes = [c.size for c in self.classes] + [self.restSize()]
+        weights = numpy.abs(numpy.append(self.values, self.rest)) ** 2 * sizes
+        picked = numpy.bincount(draw(weights, shots, random), minlength=len(sizes))
+
+        outcomes = [
+            members[random.integers(members.size, size=n)]
+            for members, n in zip(self.classes, picked)
+            if n
+        ]
+        if picked[-1]:
+            outcomes.append(self.unlisted(random.integers(sizes[-1], size=picked[-1])))
+        return numpy.concatenate(outcomes)
+
+    def unlisted(self, positions: numpy.ndarray) -> numpy.ndarray:
+        r"""
+        Returns the basis states in no class at some positions among those states,
+        counting from the lowest, without listing them.
+
+        Args:
+            positions (numpy.ndarray): Positions below `restSize`.
+
+        Returns:
+            numpy.ndarray: The basis state at each position.
+        """
+
+        listed = numpy.zeros(0, dtype=numpy.int64)
+        listed = numpy.sort(numpy.concatenate([listed] + self.classes))
+        # The unlisted states before listed state j number listed[j] - j.
+        free = listed - numpy.arange(listed.size)
+        positions = numpy.asarray(positions, dtype=numpy.int64)
+        return positions + numpy.searchsorted(free, positions, side="right")
+
+    def top(self, k: int) -> tuple:
+        r"""
+        Returns the :math:`k` most likely outcomes of measuring the state, without
+        listing the whole register.
+
+        Every state of a class is as likely as the others, so only the lowest
+        :math:`k` states of each class, and the lowest :math:`k` states in no class,
+        can be among the most likely.
+
+        Args:
+            k (int): The number of outcomes.
+
+        Returns:
+            tuple: The states and their probabilities, as `utils.distribution.topK`.
+        """
+
+        k = int(k)
+        weights = numpy.abs(numpy.append(self.values, self.rest)) ** 2
+        states = [c[:k] for c in self.classes]
+        states.append(self.unlisted(numpy.arange(min(k, self.restSize()))))
+        return topK(
+            [(s, numpy.full(s.size, w)) for s, w in zip(states, weights)], k
+        )
+
+    def equal(self, target: Union[SymmetricVector, Vector]) -> bool:
+        r"""
+        Checks if the state is equal to another, by comparing all their amplitudes.
+        """
+
+        return numpy.allclose(self.amplitudes(), target.amplitudes())
@@ -15,31 +15,267 @@ vector and checking equality between vectors.
 
 This is all achieved abstractly through the implementation of a `Matrix` property of each 
 object. See `matrixInterface` for more details on available methods. 
+
+Each `Operator` and `Vector` carries the name of its backend, ``"dense"``, ``"sparse"`` or
+``"auto"``, and passes it on to everything derived from it. With ``"auto"`` the
+representation is picked per object from its size and the fraction of nonzero elements
+(see `chooseBackend`). When a dense and a sparse matrix meet in one operation the sparse
+one is converted to dense at that point, except when an operator is applied to a vector,
+where the vector follows the operator and the result returns to the vector's backend.
+
+Each `Operator` and `Vector` may also be given a precision, ``"complex128"``,
+``"complex64"``, ``"float64"`` or ``"float32"`` (see `precisions`), which its elements
+are cast to when it is built and after every operation, and which is passed on in the
+same way as the backend. Without one the dtype is whatever `numpy` infers. A real
+precision cannot hold a phase, so setting an element or scaling by a complex number
+with a nonzero imaginary part is rejected rather than silently dropping it.
 """
 
 from __future__ import annotations
+from copy import deepcopy
 from utils.matrixInterface import matrixInterface
+from utils.denseMatrix import denseMatrix
+from utils.diagonalMatrix import diagonalMatrix
+from utils.kronMatrix import kronMatrix
+from utils.sparseMatrix import sparseMatrix
 from typing import Union
 import numpy
 
-sparsity = "dense"  # "sparse" or "dense"
+sparsity = "dense"  # The default backend, "sparse", "dense" or "auto"
+
+backends = {"dense": denseMatrix, "sparse": sparseMatrix}
+
+# With the "auto" backend, matrices with at least `autoSize` rows and at most
+# `autoDensity` of their elements nonzero are stored as sparse.
+autoSize = 64
+autoDensity = 0.05
+
+# The precisions an operator or vector may be held in.
+precisions = {
+    "complex128": numpy.complex128,
+    "complex64": numpy.complex64,
+    "float64": numpy.float64,
+    "float32": numpy.float32,
+}
+
+
+def precision(dtype) -> Union[numpy.dtype, None]:
+    r"""
+    Returns the `numpy` dtype of a precision, given by name or as a dtype.
+
+    Args:
+        dtype: A key of `precisions`, one of their dtypes, or `None` to let
+            `numpy` infer the dtype.
+
+    Returns:
+        Union[numpy.dtype, None]: The dtype, or `None`.
+    """
+
+    if dtype is None:
+        return None
+    if isinstance(dtype, str) and dtype in precisions:
+        return numpy.dtype(precisions[dtype])
+    if not isinstance(dtype, str) and numpy.dtype(dtype) in [
+        numpy.dtype(d) for d in precisions.values()
+    ]:
+        return numpy.dtype(dtype)
+    raise ValueError(
+        "Unknown precision '" + str(dtype) + "', expected one of " +
+        ", ".join(precisions) + "."
+    )
+
+
+def cast(matrix: matrixInterface, dtype) -> matrixInterface:
+    r"""
+    Returns the matrix with its elements cast to `dtype`, or unchanged if
+    `dtype` is `None`.
+    """
+
+    if dtype is None:
+        return matrix
+    return matrix.astype(dtype)
+
+
+def representable(value, dtype) -> None:
+    r"""
+    Raises a `ValueError` if `value` has a phase which a real `dtype` cannot hold.
+    """
+
+    if dtype is not None and dtype.kind != "c" and numpy.any(numpy.imag(value) != 0):
+        raise ValueError(
+            "The value " + str(value) + " has a phase, which " + str(dtype) +
+            " cannot represent; use a complex precision."
+        )
+
+
+def density(elements: Union[list, numpy.ndarray, matrixInterface]) -> float:
+    r"""
+    Returns the fraction of the elements of a matrix which are nonzero, without
+    building lazy or diagonal matrices in full.
+
+    Args:
+        elements (Union[list, numpy.ndarray, matrixInterface]): The matrix.
+
+    Returns:
+        float: The fraction of nonzero elements.
+    """
+
+    if isinstance(elements, kronMatrix):
+        return float(numpy.prod([density(factor) for factor in elements.factors]))
+    if isinstance(elements, diagonalMatrix):
+        return numpy.count_nonzero(elements.diagonal) / elements.size**2
+    if isinstance(elements, sparseMatrix):
+        return elements.matrix.nnz / numpy.prod(elements.matrix.shape)
+    if isinstance(elements, matrixInterface):
+        elements = elements.matrix
+
+    elements = numpy.asarray(elements)
+    return numpy.count_nonzero(elements) / max(elements.size, 1)
 
 
-if sparsity == "dense":
-    from utils.denseMatrix import denseMatrix as Matrix
-else:
-    from utils.sparseMatrix import sparseMatrix as Matrix
+def nbytes(matrix: matrixInterface) -> int:
+    r"""
+    Returns the number of bytes used to store the elements of a matrix.
+
+    Args:
+        matrix (matrixInterface): The matrix.
+
+    Returns:
+        int: The number of bytes.
+    """
+
+    if isinstance(matrix, kronMatrix):
+        return sum(nbytes(factor) for factor in matrix.factors)
+    if isinstance(matrix, diagonalMatrix):
+        return matrix.diagonal.nbytes
+    if isinstance(matrix, sparseMatrix):
+        stored = matrix.matrix
+        return sum(
+            getattr(stored, name).nbytes
+            for name in ["data", "indices", "indptr", "offsets"]
+            if hasattr(stored, name)
+        )
+    return numpy.asarray(matrix.matrix).nbytes
+
+
+def elementType(matrix: matrixInterface) -> numpy.dtype:
+    r"""
+    Returns the type of the elements of a matrix, without materialising it.
+
+    Args:
+        matrix (matrixInterface): The matrix.
+
+    Returns:
+        numpy.dtype: The type of the elements.
+    """
+
+    if isinstance(matrix, kronMatrix):
+        return numpy.result_type(
+            *[elementType(factor) for factor in matrix.factors], matrix.coefficient
+        )
+    if isinstance(matrix, diagonalMatrix):
+        return matrix.diagonal.dtype
+    return matrix.matrix.dtype
+
+
+def chooseBackend(
+    elements: Union[list, numpy.ndarray, matrixInterface], size: int, backend: str
+) -> type:
+    r"""
+    Returns the `matrixInterface` class to store a matrix with.
+
+    Args:
+        elements (Union[list, numpy.ndarray, matrixInterface]): The matrix.
+        size (int): The number of rows of the matrix.
+        backend (str): ``"dense"``, ``"sparse"`` or ``"auto"``.
+
+    Returns:
+        type: `denseMatrix` or `sparseMatrix`.
+    """
+
+    if backend == "auto":
+        if size >= autoSize and density(elements) <= autoDensity:
+            return sparseMatrix
+        return denseMatrix
+
+    if backend not in backends:
+        raise ValueError(
+            "Unknown backend '" + str(backend) + "', expected 'dense', 'sparse' or 'auto'."
+        )
+    return backends[backend]
+
+
+def convert(matrix: matrixInterface, target: type) -> matrixInterface:
+    r"""
+    Returns a matrix stored with the `target` class. A lazy tensor product is built
+    directly in the target backend, while dense, sparse and diagonal matrices of
+    another kind are returned unchanged if no conversion is needed.
+
+    Args:
+        matrix (matrixInterface): The matrix to convert.
+        target (type): `denseMatrix` or `sparseMatrix`.
+
+    Returns:
+        matrixInterface: The converted matrix.
+    """
+
+    if isinstance(matrix, kronMatrix):
+        factors = [convert(factor, target) for factor in matrix.factors]
+        return kronMatrix(factors, matrix.coefficient).materialize()
+    if isinstance(matrix, target) or not isinstance(matrix, (denseMatrix, sparseMatrix)):
+        return matrix
+    return target(matrix.size, numpy.asarray(matrix.flat()), matrix.vector)
+
+
+def align(a: matrixInterface, b: matrixInterface) -> tuple:
+    r"""
+    Converts a pair of dense and sparse matrices so that both are dense. Any other
+    pair is returned unchanged.
+    """
+
+    if isinstance(a, sparseMatrix) and isinstance(b, denseMatrix):
+        return convert(a, denseMatrix), b
+    if isinstance(a, denseMatrix) and isinstance(b, sparseMatrix):
+        return a, convert(b, denseMatrix)
+    return a, b
 
 
 class Operator:
     r"""
     This class represents a quantum operator as a sparse matrix.
 
-    It may take a list or `matrixInterface` in the constructor.
+    It may take a list or `matrixInterface` in the constructor. A `matrixInterface`
+    is used as the matrix directly, which lets an operator hold a lazy tensor
+    product (see `kronMatrix`) as well as a dense or sparse matrix. It is copied
+    first if it has to be cast to the `dtype`, so the caller's matrix is left as
+    it is.
+
+    The backend, ``"dense"``, ``"sparse"`` or ``"auto"``, decides how a list is
+    stored and is inherited by every operator derived from this one, as is the
+    precision `dtype` (see `precision`).
+
+    An operator returned by `share` holds the same matrix as the original and
+    copies it the first time one of the in place methods (`update`, `negate`,
+    `scale`, ``+`` and ``-``) is called, so that neither sees the other's changes.
     """
 
-    def __init__(self, size: int, elements: Union[list, matrixInterface]):
-        self.matrix = Matrix(size, elements)
+    def __init__(
+        self,
+        size: int,
+        elements: Union[list, matrixInterface],
+        backend: str = sparsity,
+        dtype=None,
+    ):
+        self.backend = backend
+        self.dtype = precision(dtype)
+        self.shared = False
+        if isinstance(elements, matrixInterface):
+            self.matrix = elements
+            if self.dtype is not None and elementType(elements) != self.dtype:
+                self.matrix = deepcopy(elements)
+        else:
+            self.matrix = chooseBackend(elements, size, backend)(size, elements)
+        self.matrix = cast(self.matrix, self.dtype)
 
     @property
     def matrix(self) -> matrixInterface:
@@ -50,10 +286,36 @@ class Operator:
         self._matrix = matrix
         return
 
+    def share(self) -> Operator:
+        r"""
+        Returns a new operator holding the same matrix, which is copied before
+        either operator changes it in place.
+
+        Returns:
+            Operator: The shared operator.
+        """
+
+        self.shared = True
+        operator = Operator(self.matrix.size, self.matrix, self.backend, self.dtype)
+        operator.shared = True
+        return operator
+
+    def _own(self):
+        r"""
+        Copies a shared matrix before it is changed in place.
+        """
+
+        if self.shared:
+            self.matrix = deepcopy(self.matrix)
+            self.shared = False
+
     def tensor(self, target: Operator):
         r"""
         Computes the tensor product of the operator with another operator.
 
+        The product is lazy: only the factors are stored, and the full matrix is
+        built if an operation needs it (see `kronMatrix`).
+
         Args:
             target (Operator): The operator to compute the tensor product with.
 
@@ -61,9 +323,8 @@ class Operator:
             Operator: The tensor product operator.
         """
 
-        matrix = self.matrix.tensor(target.matrix).matrix
-        size = self.matrix.size * target.matrix.size
-        return Operator(size, matrix)
+        matrix = kronMatrix([self.matrix, target.matrix])
+        return Operator(matrix.size, matrix, self.backend, self.dtype)
 
     def __str__(self):
         return self.matrix.__str__()
@@ -79,7 +340,9 @@ class Operator:
             Operator: The sum of the operators.
         """
 
-        self.matrix = self.matrix + target.matrix
+        self._own()
+        self.matrix, other = align(self.matrix, target.matrix)
+        self.matrix = cast(self.matrix + other, self.dtype)
         return self
 
     def __sub__(self, target):
@@ -93,12 +356,17 @@ class Operator:
             Operator: The difference of the operators.
         """
 
-        self.matrix = self.matrix - target.matrix
+        self._own()
+        self.matrix, other = align(self.matrix, target.matrix)
+        self.matrix = cast(self.matrix - other, self.dtype)
         return self
 
     def __pow__(self, n: int):
         r"""
-        Computes the n-th power of the operator.
+        Computes the n-th tensor power of the operator.
+
+        The power is lazy and stores the operator n times rather than the
+        :math:`2^n \times 2^n` product (see `kronMatrix`).
 
         Args:
             n (int): The exponent.
@@ -107,17 +375,19 @@ class Operator:
             Operator: The operator raised to the n-th power.
         """
 
-        product = self
-        i = 1
-        while i < n:
-            product = product.tensor(self)
-            i = i + 1
-        return product
+        if n <= 1:
+            return self
+        matrix = kronMatrix([self.matrix] * int(n))
+        return Operator(matrix.size, matrix, self.backend, self.dtype)
 
     def update(self, row, column, value):
         r"""
         Updates a specific element of the operator matrix.
 
+        A lazy tensor product has to be built in full to be updated. With the
+        ``"auto"`` backend it is built with the backend chosen for it at this
+        point, otherwise with the backend of its factors.
+
         Args:
             row (int): The row index of the element to update.
             column (int): The column index of the element to update.
@@ -127,7 +397,13 @@ class Operator:
             Operator: The updated operator.
         """
 
-        self.matrix = self.matrix.update(row, column, value)
+        representable(value, self.dtype)
+        self._own()
+        if isinstance(self.matrix, kronMatrix) and self.backend == "auto":
+            target = chooseBackend(self.matrix, self.matrix.size, self.backend)
+            self.matrix = convert(self.matrix, target)
+
+        self.matrix = cast(self.matrix.update(row, column, value), self.dtype)
         return self
 
     def __mul__(self, other):
@@ -141,9 +417,9 @@ class Operator:
             Operator: The product of the operators.
         """
 
-        matrix = other.matrix.multiply(self.matrix).matrix
-        size = self.matrix.size
-        return Operator(size, matrix)
+        left, right = align(other.matrix, self.matrix)
+        matrix = left.multiply(right)
+        return Operator(matrix.size, matrix, self.backend, self.dtype)
 
     def negate(self):
         r"""
@@ -153,6 +429,7 @@ class Operator:
             Operator: The negated operator.
         """
 
+        self._own()
         self.matrix = self.matrix.negate()
         return self
 
@@ -167,7 +444,8 @@ class Operator:
             bool: True if the operators are equal, False otherwise.
         """
 
-        return self.matrix.equal(target.matrix)
+        left, right = align(self.matrix, target.matrix)
+        return left.equal(right)
 
     def scale(self, value: float):
         r"""
@@ -182,7 +460,9 @@ class Operator:
         ----
         """
 
-        self.matrix = self.matrix.scale(value)
+        representable(value, self.dtype)
+        self._own()
+        self.matrix = cast(self.matrix.scale(value), self.dtype)
         return self
 
 
@@ -191,7 +471,16 @@ class Vector:
     This class represents a quantum state vector.
 
     It may take the integer 1 or 0 to create a single qubit in the given state,
-    a list or `matrixInterface` in the constructor.
+    a list, a `numpy` array of amplitudes or `matrixInterface` in the constructor.
+
+    The backend, ``"dense"``, ``"sparse"`` or ``"auto"``, decides how a list or an
+    array is stored and is inherited by the vectors produced by `apply`, as is the
+    precision `dtype` (see `precision`).
+
+    A vector built by `utils.state_vector.basisState` records the basis state it is as
+    `state`, so that `measure` can read one amplitude instead of taking a dot product.
+    The methods which change a vector in place clear it; a caller which writes to the
+    `amplitudes` of such a vector should clear it too.
     """
 
     @property
@@ -203,7 +492,16 @@ class Vector:
         self._matrix = matrix
         return
 
-    def __init__(self, elements: Union[list[int], int, matrixInterface]):
+    def __init__(
+        self,
+        elements: Union[list[int], int, numpy.ndarray, matrixInterface],
+        backend: str = sparsity,
+        dtype=None,
+    ):
+        self.backend = backend
+        self.dtype = precision(dtype)
+        self.state = None
+        self._spare = None
         if isinstance(elements, int):
             while elements not in [0, 1]:
                 raise Exception(
@@ -217,13 +515,15 @@ class Vector:
             elif elements == 1:
                 elements = [0, 1]
 
-        if isinstance(elements, list):
-            self.vector = Matrix(len(elements), elements, True)
+        if isinstance(elements, (list, numpy.ndarray)):
+            size = len(elements)
+            self.vector = chooseBackend(elements, size, backend)(size, elements, True)
+            self.vector = cast(self.vector, self.dtype)
             self.dimension = self.vector.dimension()
             return
 
         if isinstance(elements, matrixInterface):
-            self.vector = elements.toVector()
+            self.vector = cast(elements.toVector(), self.dtype)
 
     def tensor(self, target: Vector):
         r"""
@@ -235,7 +535,9 @@ class Vector:
         Returns:
             Vector: The tensor product vector.
         """
-        self.vector = self.vector.tensor(target.vector)
+        self.vector, other = align(self.vector, target.vector)
+        self.vector = cast(self.vector.tensor(other), self.dtype)
+        self.state = None
         return self
 
     def scale(self, scalar: float):
@@ -248,7 +550,9 @@ class Vector:
         Returns:
             Vector: The scaled vector.
         """
-        self.vector = self.vector.scale(scalar)
+        representable(scalar, self.dtype)
+        self.vector = cast(self.vector.scale(scalar), self.dtype)
+        self.state = None
         return self
 
     def __add__(self, other: Vector):
@@ -262,7 +566,9 @@ class Vector:
             Vector: The sum of the vectors.
         """
 
-        self.vector = self.vector + other.vector
+        self.vector, other = align(self.vector, other.vector)
+        self.vector = cast(self.vector + other, self.dtype)
+        self.state = None
         return self
 
     def __sub__(self, other):
@@ -276,7 +582,9 @@ class Vector:
             Vector: The difference of the vectors.
         """
 
-        self.vector = self.vector - other.vector
+        self.vector, other = align(self.vector, other.vector)
+        self.vector = cast(self.vector - other, self.dtype)
+        self.state = None
         return self
 
     def __pow__(self, n: int):
@@ -289,7 +597,8 @@ class Vector:
         Returns:
             Vector: The vector raised to the n-th tensor power.
         """
-        self.vector = self.vector**n
+        self.vector = cast(self.vector**n, self.dtype)
+        self.state = None
         return self
 
     def __str__(self):
@@ -299,6 +608,10 @@ class Vector:
         r"""
         Applies an operator to the vector.
 
+        If the operator is dense or sparse and the vector is not, the vector is
+        converted to the operator's backend for the product, and the result is
+        converted back to the vector's backend.
+
         Args:
             operator (Operator): The operator to apply.
 
@@ -306,8 +619,57 @@ class Vector:
             Vector: The resulting vector after applying the operator.
         """
 
-        product = operator.matrix.multiply(self.vector)
-        return Vector(product)
+        vector = self.vector
+        if isinstance(operator.matrix, (denseMatrix, sparseMatrix)):
+            vector = convert(vector, type(operator.matrix))
+
+        product = operator.matrix.multiply(vector)
+        return Vector(convert(product, type(self.vector)), self.backend, self.dtype)
+
+    def applyInPlace(self, operator: Operator):
+        r"""
+        Applies an operator to the vector in place.
+
+        A vector held as a `numpy` array keeps a second buffer of the same shape.
+        The product is written into that buffer and the two are swapped, so that
+        repeated calls allocate nothing once the buffer exists. Any other vector,
+        or a product whose type the vector cannot hold, falls back to `apply`.
+
+        Args:
+            operator (Operator): The operator to apply.
+
+        Returns:
+            Vector: The vector itself, holding the result.
+        """
+
+        vector = self.vector
+        stored = getattr(vector, "matrix", None)
+        if (
+            not isinstance(vector, denseMatrix)
+            or not isinstance(stored, numpy.ndarray)
+            or isinstance(operator.matrix, sparseMatrix)
+            or not numpy.can_cast(
+                numpy.result_type(elementType(operator.matrix), stored),
+                stored.dtype,
+                "same_kind",
+            )
+        ):
+            self.vector = self.apply(operator).vector
+            self.state = None
+            self._spare = None
+            return self
+
+        spare = self._spare
+        if spare is None or spare.matrix.shape != stored.shape or (
+            spare.matrix.dtype != stored.dtype
+        ):
+            spare = denseMatrix(vector.size, numpy.empty_like(stored), True)
+
+        product = operator.matrix.multiply(vector, out=spare)
+        self._spare = vector if product is spare else spare
+        self.vector = cast(product, self.dtype)
+        self.state = None
+        return self
 
     def equal(self, target: Vector):
         r"""
@@ -320,7 +682,24 @@ class Vector:
             bool: True if the vectors are equal, False otherwise.
         """
 
-        return self.vector.equal(target.vector)
+        left, right = align(self.vector, target.vector)
+        return left.equal(right)
+
+    def amplitudes(self) -> numpy.ndarray:
+        r"""
+        Returns the amplitudes of the vector as a flat `numpy` array.
+
+        For the dense backend this is a view onto the underlying storage, so
+        writing to it updates the vector in place. Callers which must not
+        disturb the vector should take a copy.
+
+        Returns:
+            numpy.ndarray: The amplitudes of the vector.
+        """
+
+        if isinstance(self.vector.matrix, numpy.ndarray):
+            return self.vector.matrix.reshape(-1)
+        return numpy.asarray(self.vector.flat()).reshape(-1)
 
     def measure(self, basis: Vector):
         r"""
@@ -335,9 +714,33 @@ class Vector:
         ----
         """
 
+        if basis.state is not None:
+            return self.at(basis.state)[0]
+
         value = numpy.dot(
             basis.vector.flat(),
             self.vector.flat(),
         )
 
         return value
+
+    def at(self, states: Union[int, list[int]]) -> numpy.ndarray:
+        r"""
+        Returns the amplitudes of some basis states, reading only those.
+
+        Args:
+            states (Union[int, list[int]]): The basis states.
+
+        Returns:
+            numpy.ndarray: The amplitude of each state.
+        """
+
+        states = numpy.asarray(states, dtype=numpy.int64).reshape(-1)
+        if isinstance(self.vector, denseMatrix) and isinstance(
+            self.vector.matrix, numpy.ndarray
+        ):
+            return self.vector.matrix.reshape(-1)[states]
+        if isinstance(self.vector, sparseMatrix):
+            found = self.vector.matrix[states, numpy.zeros_like(states)]
+            return numpy.asarray(found).reshape(-1)
+        return self.amplitudes()[states]
@@ -0,0 +1,196 @@
+r"""
+Threaded Kernel Module
+======================
+This module provides threaded versions of the gate kernels which act directly on a
+flat `numpy` array of amplitudes: a gate on a single qubit, a diagonal gate, and a
+Hadamard gate on every qubit.
+
+The amplitudes are split into contiguous chunks which each fit in the L2 cache of a
+core, `cacheBytes` by default, and the chunks are worked on by a pool of threads.
+Every chunk is updated with `numpy` ufuncs, which release the GIL while they run, so
+the threads run at the same time rather than one after another. Like the kernels of
+`utils.kernels`, every function updates the array it is given in place and returns it.
+
+A gate on qubit :math:`q` pairs each amplitude with the one :math:`2^q` places away.
+For a low qubit a chunk holds whole pairs of blocks; for a high qubit a chunk is a
+slice of the upper block together with the same slice of the lower block. The
+Hadamard layer transforms each chunk on its own for the qubits within it, while the
+chunk is in cache, and then makes one threaded pass per qubit above the chunk.
+
+With one thread every kernel runs in the calling thread, without the pool.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from math import sqrt
+
+import numpy
+
+from utils import kernels
+
+cacheBytes = 2**20  # The default number of bytes of the L2 cache of one core.
+
+_pools = {}  # One pool of threads for each number of threads asked for.
+
+
+def chunkLength(itemsize: int) -> int:
+    r"""
+    Returns the number of amplitudes in a chunk, the largest power of two whose
+    amplitudes and the temporary arrays of a kernel fit in `cacheBytes`.
+
+    Args:
+        itemsize (int): The number of bytes of one amplitude.
+    """
+
+    return 1 << max((cacheBytes // (2 * itemsize)).bit_length() - 1, 1)
+
+
+def run(tasks: list, threads: int):
+    r"""
+    Calls every task, on a pool of `threads` threads when there is more than one
+    of each, and waits for them all.
+    """
+
+    if threads <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            task()
+        return
+
+    if threads not in _pools:
+        _pools[threads] = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="kernel")
+    for future in [_pools[threads].submit(task) for task in tasks]:
+        future.result()
+
+
+def applySingle(
+    amplitudes: numpy.ndarray, matrix, qubit: int, threads: int = 1
+) -> numpy.ndarray:
+    r"""
+    Applies a gate on one qubit, a chunk of pairs of amplitudes per task.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat, contiguous array of :math:`2^n`
+            amplitudes, updated in place. Its dtype must hold the result.
+        matrix: The :math:`2 \times 2` gate.
+        qubit (int): The qubit the gate acts on.
+        threads (int): The number of threads.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+    """
+
+    (a, b), (c, d) = numpy.asarray(matrix).reshape(2, 2)
+    half = 1 << int(qubit)
+    pairs = amplitudes.reshape(-1, 2, half)
+    length = chunkLength(amplitudes.itemsize)
+    width = min(half, length // 2)
+    rows = max(length // (2 * half), 1)
+
+    def task(block: slice, part: slice):
+        upper, lower = pairs[block, 0, part], pairs[block, 1, part]
+        top = upper * a
+        top += lower * b
+        lower *= d
+        lower += upper * c
+        upper[...] = top
+
+    run(
+        [
+            lambda block=slice(r, r + rows), part=slice(s, s + width): task(block, part)
+            for r in range(0, pairs.shape[0], rows)
+            for s in range(0, half, width)
+        ],
+        threads,
+    )
+    return amplitudes
+
+
+def applyDiagonal(
+    amplitudes: numpy.ndarray, diagonal, qubits: list[int] = None, threads: int = 1
+) -> numpy.ndarray:
+    r"""
+    Applies a diagonal gate, multiplying each chunk by its part of the diagonal.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat array of :math:`2^n` amplitudes,
+            updated in place. Its dtype must hold the result.
+        diagonal: The diagonal of the gate, all :math:`2^n` elements of it, or the
+            :math:`2^k` elements of a gate on the given qubits.
+        qubits (list[int]): The qubits a gate on fewer than :math:`n` qubits acts
+            on, with bit :math:`j` of its diagonal index for qubit `qubits[j]`.
+        threads (int): The number of threads.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+    """
+
+    diagonal = numpy.asarray(diagonal).reshape(-1)
+    length = chunkLength(amplitudes.itemsize)
+
+    def task(start: int):
+        part = amplitudes[start : start + length]
+        if qubits is None:
+            factors = diagonal[start : start + length]
+        else:
+            index = numpy.arange(start, start + part.shape[0])
+            packed = numpy.zeros_like(index)
+            for j, q in enumerate(qubits):
+                packed |= ((index >> q) & 1) << j
+            factors = diagonal[packed]
+        numpy.multiply(part, factors, out=part)
+
+    run(
+        [lambda start=s: task(start) for s in range(0, amplitudes.shape[0], length)],
+        threads,
+    )
+    return amplitudes
+
+
+def walshHadamard(amplitudes: numpy.ndarray, threads: int = 1) -> numpy.ndarray:
+    r"""
+    Applies a Hadamard gate to every qubit, as `utils.kernels.walshHadamard` does,
+    transforming each chunk on its own and then pairing chunks for the qubits
+    above them.
+
+    Args:
+        amplitudes (numpy.ndarray): The flat, contiguous array of :math:`2^n`
+            amplitudes, updated in place. It must have a floating or complex dtype.
+        threads (int): The number of threads.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+    """
+
+    size = amplitudes.shape[0]
+    length = chunkLength(amplitudes.itemsize)
+    if threads <= 1 or size <= length:
+        return kernels.walshHadamard(amplitudes)
+
+    run(
+        [
+            lambda start=s: kernels.walshHadamard(amplitudes[start : start + length])
+            for s in range(0, size, length)
+        ],
+        threads,
+    )
+    h = numpy.array([[1, 1], [1, -1]]) / sqrt(2)
+    for q in range(length.bit_length() - 1, size.bit_length() - 1):
+        applySingle(amplitudes, h, q, threads)
+    return amplitudes
+
+
+def applyGate(amplitudes: numpy.ndarray, gate, threads: int = 1) -> numpy.ndarray:
+    r"""
+    Applies a `utils.gate.Gate` in place, with the threaded kernel for a gate on
+    one qubit or a diagonal gate, and with `Gate.apply` for any other gate.
+
+    Returns:
+        numpy.ndarray: The updated amplitudes.
+    """
+
+    matrix = gate.matrix
+    if not numpy.count_nonzero(matrix - numpy.diag(numpy.diagonal(matrix))):
+        return applyDiagonal(amplitudes, numpy.diagonal(matrix), gate.qubitPosition, threads)
+    if len(gate.qubitPosition) == 1:
+        return applySingle(amplitudes, matrix, gate.qubitPosition[0], threads)
+    amplitudes[:] = gate.apply(amplitudes)
+    return amplitudes
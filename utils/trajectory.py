@@ -0,0 +1,203 @@
+r"""
+Trajectory Module
+=================
+This module provides the `Trajectory` class, which records the projection of a register
+onto its initial and target states after each Grover iteration, so that the path of the
+search can be saved and drawn once the search is over.
+
+The projections are written into one preallocated :math:`m \times 2` array as the
+search runs, which is all a search costs to record. They can be saved as a compressed
+``.npz`` archive or as CSV and loaded back.
+
+Drawing is kept out of the search altogether. A figure is drawn with the
+object-oriented `matplotlib.figure.Figure` interface, which never touches `pyplot` or an
+interactive backend, and with a single `quiver` call for every iteration at once. This
+makes it safe to draw on a background thread while the next search runs
+(`Trajectory.renderInBackground`), or in a worker process as `sweep` does.
+"""
+
+from __future__ import annotations
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy
+from matplotlib.figure import Figure
+
+_renderer = None  # The thread which draws figures in the background, once needed.
+
+
+class Trajectory:
+    r"""
+    This class records the (initial, target) projections of a Grover search.
+    """
+
+    def __init__(self, register_size: int, targets, iterations: int):
+        r"""
+        Args:
+            register_size (int): The number of qubits in the register.
+            targets (Union[int, list[int]]): The target state or states.
+            iterations (int): The number of iterations to make room for.
+
+        Attributes:
+            register_size (int): The number of qubits in the register.
+            targets (numpy.ndarray): The target states.
+            count (int): The number of iterations recorded so far.
+        """
+
+        self.register_size = int(register_size)
+        self.targets = numpy.asarray(targets, dtype=numpy.int64).reshape(-1)
+        self.count = 0
+        self._projections = numpy.empty((int(iterations), 2))
+
+    @classmethod
+    def fromProjections(cls, register_size: int, targets, projections) -> Trajectory:
+        r"""
+        Returns a trajectory holding projections which were already recorded.
+        """
+
+        projections = numpy.real(numpy.asarray(projections)).reshape(-1, 2)
+        trajectory = cls(register_size, targets, projections.shape[0])
+        trajectory._projections[:] = projections
+        trajectory.count = projections.shape[0]
+        return trajectory
+
+    def record(self, initial, target):
+        r"""
+        Records the projections of one iteration. Grover's algorithm keeps every
+        amplitude real, whatever the precision, so only the real parts are kept.
+        """
+
+        if self.count == self._projections.shape[0]:
+            grown = numpy.empty((max(2 * self.count, 1), 2))
+            grown[: self.count] = self._projections
+            self._projections = grown
+        self._projections[self.count] = (numpy.real(initial), numpy.real(target))
+        self.count = self.count + 1
+
+    @property
+    def projections(self) -> numpy.ndarray:
+        r"""
+        The recorded projections, one (initial, target) row per iteration.
+        """
+
+        return self._projections[: self.count]
+
+    def save(self, path: str) -> str:
+        r"""
+        Saves the trajectory as a compressed ``.npz`` archive or as CSV, chosen by
+        the extension of `path`.
+
+        Returns:
+            str: The path the trajectory was saved under.
+        """
+
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".npz":
+            numpy.savez_compressed(
+                path,
+                projections=self.projections,
+                register_size=self.register_size,
+                targets=self.targets,
+            )
+        elif extension == ".csv":
+            rows = numpy.column_stack(
+                [numpy.arange(1, self.count + 1), self.projections]
+            )
+            numpy.savetxt(
+                path,
+                rows,
+                fmt=["%d", "%.17g", "%.17g"],
+                delimiter=",",
+                header="register_size=%d targets=%s\niteration,initial,target"
+                % (self.register_size, " ".join(str(t) for t in self.targets)),
+            )
+        else:
+            raise ValueError(
+                "Unknown trajectory format '" + extension + "', expected '.npz' or '.csv'."
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> Trajectory:
+        r"""
+        Loads a trajectory saved by `save`.
+        """
+
+        if os.path.splitext(path)[1].lower() == ".npz":
+            with numpy.load(path) as archive:
+                return cls.fromProjections(
+                    int(archive["register_size"]), archive["targets"], archive["projections"]
+                )
+
+        with open(path) as file:
+            fields = dict(item.split("=") for item in file.readline()[2:].split(" ", 1))
+        rows = numpy.loadtxt(path, delimiter=",", ndmin=2)
+        return cls.fromProjections(
+            int(fields["register_size"]), fields["targets"].split(), rows[:, 1:]
+        )
+
+    def render(self, name: str = None, dpi: int = 400) -> str:
+        r"""
+        Draws the projection of the register onto the initial and oracle states
+        after each iteration, each iteration more opaque the closer it is to the
+        target, and saves the figure, by default as
+        ``<register_size>qubits_<iterations>iterations.png``.
+
+        Params:
+            name (str): The path to save the figure under, without the extension.
+            dpi (int): The resolution of the figure.
+
+        Returns:
+            str: The name the figure was saved under, without the extension.
+        """
+
+        figure = Figure(figsize=(12, 12))
+        axes = figure.subplots()
+        axes.set_title(
+            "Projection of "
+            + str(self.register_size)
+            + " qubit Quantum Register State with Initial and Oracle State Over "
+            + str(self.count)
+            + " iterations"
+        )
+        # Manually adjust these to find the best axis
+        axes.set_ylim((-0.1, 1))
+        axes.axis("off")
+
+        arrows = {"angles": "xy", "scale_units": "xy", "scale": 1}
+        axes.quiver(0, 0, 1, 0, label="Initial State", color="b", alpha=0.1, **arrows)
+        axes.quiver(0, 0, 0, 1, label="Oracle State", color="g", alpha=0.1, **arrows)
+
+        initial, target = self.projections.T
+        colours = numpy.zeros((self.count, 4))
+        colours[:, 3] = numpy.clip(target, 0, 1)
+        origin = numpy.zeros(self.count)
+        axes.quiver(
+            origin, origin, initial, target, color=colours,
+            label="Iterations 1 to " + str(self.count), **arrows
+        )
+
+        axes.legend()
+        if self.count:
+            axes.set_xlim(initial.min() - 0.01, 1.2 * initial.max())
+            axes.set_xticks(initial)
+
+        if name is None:
+            name = str(self.register_size) + "qubits_" + str(self.count) + "iterations"
+        figure.savefig(name, dpi=dpi)
+        return name
+
+    def renderInBackground(self, name: str = None, dpi: int = 400) -> Future:
+        r"""
+        Draws the figure as `render` does on a background thread, and returns at
+        once. Figures are drawn one at a time, in the order they were asked for.
+
+        Returns:
+            concurrent.futures.Future: The name the figure was saved under, once
+            it has been drawn.
+        """
+
+        global _renderer
+        if _renderer is None:
+            _renderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+        return _renderer.submit(self.render, name, dpi)